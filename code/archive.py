@@ -0,0 +1,285 @@
+"""run archive -- every recorded run (seed + inputs) in one indexed file, read through mmap
+
+    python code/archive.py info                         # data/runs.archive
+    python code/archive.py top 20 --since 2026-10-01
+    python code/archive.py get 123456 > run.json        # replay as stored with leaderboard submissions
+    python code/archive.py import data/leaderboard.json # replays of a leaderboard or submissions file
+    python code/archive.py compact --keep-top 100000    # rewrite without deleted / old / low runs
+
+file is a header (MAGIC, runs, entries per index page) then index pages & run data as they were appended. a page
+holds PAGE_ENTRIES fixed-width entries -- run id, score, timestamp, data offset & length, flags -- & the offset
+of the next page, so run n is entry n % PAGE_ENTRIES of page n // PAGE_ENTRIES: O(1). pages are preallocated
+sparse at the end of the file when the last one fills, run data goes after them -- nothing is ever rewritten.
+an append writes data, then the entry, then bumps the run count in the header; a crash mid append leaves the
+run out. score & timestamp columns are read as strided views over the mapped pages, so top runs come from the
+index alone. compact writes a fresh archive & swaps it in
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import heapq
+import struct
+import argparse
+import datetime
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress, count, repeat
+from operator import ge
+from collections import Counter
+
+MAGIC = b"FLPARCH1"
+HEADER = struct.Struct("<8sQI4x")  # magic, runs, entries per page
+PAGE_HEAD = struct.Struct("<Q8x")  # next page offset, 0 for the last
+ENTRY = struct.Struct("<QIIQII")  # run id, score, timestamp, data offset, data length, flags
+ENTRY_WORDS = ENTRY.size // 4  # entry in 4 byte words -- score is word 2, timestamp word 3, flags word 7
+PAGE_ENTRIES = 65536  # 2 MB of index a page
+DELETED = 1
+RUN = struct.Struct("<IHHHIIIB")  # seed, width, height, medium height, frames, score, jumps, wide -- spawns follow
+
+
+def pack_run(replay):
+    """replay dict -> bytes. jumps & spawns stored as frame deltas, 2 bytes each unless one doesn't fit"""
+    jumps, spawns = replay["jumps"], replay["spawns"]
+    deltas = array('I', [b - a for a, b in zip([0] + jumps, jumps)] + [b - a for a, b in zip([0] + spawns, spawns)])
+    wide = bool(deltas) and max(deltas) > 0xFFFF
+    if not wide: deltas = array('H', deltas)
+    width, height, medium = replay["screen"]
+    head = RUN.pack(replay["seed"], width, height, medium, replay["frames"], replay["score"], len(jumps), wide)
+    return head + deltas.tobytes()
+
+
+def unpack_run(data):
+    seed, width, height, medium, frames, score, jumps, wide = RUN.unpack_from(data)
+    deltas = array('I' if wide else 'H')
+    deltas.frombytes(data[RUN.size:])
+    return {
+        "seed": seed, "screen": [width, height, medium], "frames": frames, "score": score,
+        "jumps": list(accumulate(deltas[:jumps])), "spawns": list(accumulate(deltas[jumps:])),
+    }
+
+
+def page_bytes(entries):
+    return PAGE_HEAD.size + entries * ENTRY.size
+
+
+class Archive:
+    """appends runs & reads them back -- one writer, any number of readers (see reopen)"""
+    def __init__(self, path, page_entries=PAGE_ENTRIES):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self.fd).st_size == 0:
+            os.ftruncate(self.fd, HEADER.size + page_bytes(page_entries))
+            os.pwrite(self.fd, HEADER.pack(MAGIC, 0, page_entries), 0)
+        magic, self.runs, self.page_entries = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+        if magic != MAGIC: raise ValueError(f"{path} is not a run archive")
+        self.map = None
+        self.reopen()
+
+    def reopen(self):
+        """map the file as it is now -- page offsets found by walking the chain"""
+        if self.map is not None: self.map.close()
+        self.runs = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))[1]
+        self.map = mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ)
+        self.pages = [HEADER.size]
+        while True:
+            following = PAGE_HEAD.unpack_from(self.map, self.pages[-1])[0]
+            if not following: break
+            self.pages.append(following)
+
+    def __len__(self):
+        return self.runs
+
+    def close(self):
+        if self.map is not None: self.map.close()
+        if self.fd is not None: os.close(self.fd)
+        self.map = self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------- writing -------- #
+
+    def append(self, replay, run_id=None, timestamp=None):
+        """add a run -- returns its id. run ids go up; by default a run's id is its position"""
+        return self.append_packed(pack_run(replay), replay["score"], run_id, timestamp)
+
+    def append_packed(self, data, score, run_id=None, timestamp=None, flags=0):
+        index = self.runs
+        if run_id is None: run_id = index if not index else max(index, self.entry(index - 1)[0] + 1)
+        if timestamp is None: timestamp = int(time.time())
+        page, slot = divmod(index, self.page_entries)
+        if page == len(self.pages): self.add_page()
+
+        offset = os.fstat(self.fd).st_size
+        os.pwrite(self.fd, data, offset)
+        os.pwrite(self.fd, ENTRY.pack(run_id, score, timestamp, offset, len(data), flags),
+                  self.pages[page] + PAGE_HEAD.size + slot * ENTRY.size)
+        self.runs += 1
+        os.pwrite(self.fd, struct.pack("<Q", self.runs), 8) # in once counted
+        return run_id
+
+    def add_page(self):
+        """new index page at the end of the file -- linked from the last one"""
+        offset = os.fstat(self.fd).st_size
+        os.ftruncate(self.fd, offset + page_bytes(self.page_entries)) # sparse until entries land in it
+        os.pwrite(self.fd, PAGE_HEAD.pack(offset), self.pages[-1])
+        self.pages.append(offset)
+
+    def delete(self, index):
+        """flag a run deleted -- its data goes at the next compact"""
+        flags = self.entry(index)[5] | DELETED
+        os.pwrite(self.fd, struct.pack("<I", flags), self.entry_offset(index) + ENTRY.size - 4)
+
+    # -------- reading -------- #
+
+    def entry_offset(self, index):
+        if not 0 <= index < self.runs: raise IndexError(index)
+        page, slot = divmod(index, self.page_entries)
+        return self.pages[page] + PAGE_HEAD.size + slot * ENTRY.size
+
+    def entry(self, index):
+        """(run id, score, timestamp, offset, length, flags) -- straight from the index"""
+        offset = self.entry_offset(index)
+        if offset + ENTRY.size > len(self.map): self.reopen() # appended since the file was mapped
+        return ENTRY.unpack_from(self.map, offset)
+
+    def packed(self, index):
+        _, _, _, offset, length, _ = self.entry(index)
+        if offset + length > len(self.map): self.reopen()
+        return self.map[offset:offset + length]
+
+    def __getitem__(self, index):
+        """replay of the run at position index"""
+        return unpack_run(self.packed(index))
+
+    def find(self, run_id):
+        """position of a run id -- where it was appended unless a compact dropped runs before it"""
+        if run_id < self.runs and self.entry(run_id)[0] == run_id: return run_id
+        position = bisect_left(range(self.runs), run_id, key=lambda index: self.entry(index)[0])
+        if position < self.runs and self.entry(position)[0] == run_id: return position
+        raise KeyError(run_id)
+
+    def columns(self, word):
+        """one entry field of every run -- strided views over the mapped pages, no copies"""
+        if len(self.map) < os.fstat(self.fd).st_size: self.reopen()
+        views = []
+        for page, offset in enumerate(self.pages):
+            entries = min(self.page_entries, self.runs - page * self.page_entries)
+            if entries <= 0: break
+            start = offset + PAGE_HEAD.size
+            views.append(memoryview(self.map)[start:start + entries * ENTRY.size].cast('I')[word::ENTRY_WORDS])
+        return views
+
+    def top(self, n, since=None):
+        """positions of the n best runs, best first -- equal scores earliest first. since is a unix time"""
+        if n <= 0 or not self.runs: return []
+        scores = self.columns(2)
+        keep = None
+        if since is not None: # runs new enough -- mask built in C
+            keep = [flag for view in self.columns(3) for flag in map(ge, view, repeat(since))]
+        candidates = Counter()
+        if keep is None:
+            for view in scores: candidates.update(view)
+        else: candidates.update(compress((score for view in scores for score in view), keep))
+
+        # lowest score that still makes the top n -- then only runs at or above it are looked at
+        threshold, seen = 0, 0
+        for score in sorted(candidates, reverse=True):
+            seen += candidates[score]
+            threshold = score
+            if seen >= n: break
+        while True:
+            above = (score >= threshold for view in scores for score in view)
+            if keep is not None: above = map(min, above, keep)
+            positions = [index for index in compress(count(), above) if not self.entry(index)[5] & DELETED]
+            lower = [score for score in candidates if score < threshold]
+            if len(positions) >= n or not lower: break
+            threshold = max(lower) # deleted runs made room
+        ranked = heapq.nsmallest(n, positions, key=lambda index: (-self.entry(index)[1], index))
+        return ranked
+
+
+# ---------------- Tools ---------------- #
+
+def compact(path, out=None, keep_top=None, since=None):
+    """rewrite without deleted runs -- & only the best keep_top / runs since a unix time if given. run ids, scores
+    & timestamps are kept. written beside the archive & renamed over it unless out is given"""
+    target = out or path + ".compact"
+    if os.path.exists(target): os.remove(target)
+    with Archive(path) as source, Archive(target, source.page_entries) as fresh:
+        if keep_top is not None: chosen = sorted(source.top(keep_top, since))
+        else:
+            chosen = [index for index in range(len(source))
+                      if not source.entry(index)[5] & DELETED and (since is None or source.entry(index)[2] >= since)]
+        for index in chosen:
+            run_id, score, timestamp, _, _, _ = source.entry(index)
+            fresh.append_packed(source.packed(index), score, run_id, timestamp)
+        kept = len(fresh)
+    if out is None: os.replace(target, path)
+    return kept
+
+
+def import_replays(archive, path):
+    """replays of a leaderboard or submissions file -- see ghosts.read_replays"""
+    from ghosts import read_replays # lazy -- ghosts pulls in pygame
+    replays = read_replays(path)
+    for replay in replays: archive.append(replay)
+    return len(replays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run archive tools")
+    parser.add_argument("--archive", default=None, help="archive file (default data/runs.archive)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("info")
+    top = commands.add_parser("top")
+    top.add_argument("n", type=int, nargs="?", default=10)
+    top.add_argument("--since", default=None, help="YYYY-MM-DD")
+    get = commands.add_parser("get")
+    get.add_argument("run_id", type=int)
+    imported = commands.add_parser("import")
+    imported.add_argument("file", help="leaderboard.json or a submissions file")
+    compacting = commands.add_parser("compact")
+    compacting.add_argument("--keep-top", type=int, default=None)
+    compacting.add_argument("--since", default=None, help="YYYY-MM-DD -- older runs dropped")
+    args = parser.parse_args()
+    if args.archive is None: # data/ next to code/ -- not via resources, that pulls in pygame
+        args.archive = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "runs.archive")
+    since = getattr(args, "since", None)
+    if since: since = int(datetime.datetime.strptime(since, "%Y-%m-%d").timestamp())
+
+    if args.command == "compact":
+        before = os.path.getsize(args.archive)
+        start = time.perf_counter()
+        kept = compact(args.archive, keep_top=args.keep_top, since=since)
+        print(f"{kept:,} runs kept -- {before:,} -> {os.path.getsize(args.archive):,} bytes in {time.perf_counter() - start:.2f}s")
+        return
+
+    with Archive(args.archive) as archive:
+        if args.command == "info":
+            size = os.path.getsize(args.archive)
+            print(f"{len(archive):,} runs, {len(archive.pages)} index pages, {size:,} bytes")
+        elif args.command == "top":
+            start = time.perf_counter()
+            ranked = archive.top(args.n, since)
+            elapsed = time.perf_counter() - start
+            for rank, index in enumerate(ranked, 1):
+                run_id, score, timestamp, _, length, _ = archive.entry(index)
+                when = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+                print(f"{rank:4d}. run {run_id:<10d} score {score:<6d} {when}  {length} bytes")
+            print(f"top {args.n} of {len(archive):,} runs in {elapsed * 1000:.1f} ms")
+        elif args.command == "get":
+            json.dump(archive[archive.find(args.run_id)], sys.stdout)
+            print()
+        elif args.command == "import":
+            print(f"{import_replays(archive, args.file)} replays imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import pygame as pg
+import math
+import random
+from array import array
+import resources
+
+# sound ids -- plain ints so triggering a sound is just an index
+FLAP, SCORE, HIT, COUNTDOWN = range(4)
+SOUND_NAMES = ("flap", "score", "hit", "countdown")
+
+# per sound: priority (higher steals lower) & cooldown in ms (space held = jump every frame)
+PRIORITY = (0, 1, 2, 1)
+COOLDOWN = (120, 0, 0, 0)
+
+FREQUENCY = 44100
+BUFFER = 512  # samples -- ~12ms at 44.1kHz, default 4096 is ~90ms of lag
+
+
+def pre_init(buffer=BUFFER):
+    """small mixer buffer for low latency -- must run before pg.init()"""
+    pg.mixer.pre_init(FREQUENCY, -16, 2, buffer)
+
+
+def synth(freq_start, freq_end, duration, volume=0.5, noise=False, seed=0):
+    """synthesize mono 16-bit samples -- sweep from freq_start to freq_end with linear decay"""
+    n = int(FREQUENCY * duration)
+    rng = random.Random(seed)
+    samples = array('h', bytes(2 * n))
+    phase = 0.0
+    for i in range(n):
+        t = i / n
+        envelope = volume * (1 - t)
+        if noise: value = rng.uniform(-1, 1)
+        else:
+            phase += 2 * math.pi * (freq_start + (freq_end - freq_start) * t) / FREQUENCY
+            value = math.sin(phase)
+        samples[i] = int(32767 * envelope * value)
+    return samples
+
+
+def default_samples():
+    """built-in sounds -- used when assets/sounds/<name>.wav is not there. a build packs them already synthesized"""
+    score = synth(880, 880, 0.08)
+    score.extend(synth(1320, 1320, 0.12))
+    return {
+        "flap": synth(400, 800, 0.08, 0.35),
+        "score": score,
+        "hit": synth(0, 0, 0.25, 0.6, noise=True),
+        "countdown": synth(660, 660, 0.12, 0.4),
+    }
+
+
+class AudioManager:
+    """pre-decoded sounds played on a fixed pool of reserved channels
+
+    everything is decoded & every Channel object is created at startup -- play() only picks a channel.
+    when the pool is busy the lowest priority / oldest voice is stolen
+    """
+    def __init__(self, settings, sound_dir="sounds"):
+        self.settings = settings
+        self.enabled = False
+        self.sounds = []
+        self.channels = []
+
+        if not settings.sound_enabled: return
+        try:
+            if not pg.mixer.get_init(): pg.mixer.init(FREQUENCY, -16, 2, BUFFER)
+        except pg.error as e:
+            print(f"audio disabled: {e}")
+            return
+
+        self.load_sounds(sound_dir)
+
+        # fixed pool of reserved channels -- pygame's own channel picking never touches them
+        pool = settings.audio_channels
+        pg.mixer.set_num_channels(max(pg.mixer.get_num_channels(), pool))
+        pg.mixer.set_reserved(pool)
+        self.channels = [pg.mixer.Channel(i) for i in range(pool)]
+
+        # per voice bookkeeping -- preallocated, updated in place
+        self.voice_priority = array('b', [-1] * pool)
+        self.voice_started = array('q', [0] * pool)
+        self.last_played = array('q', [-10 ** 9] * len(SOUND_NAMES))
+        self.enabled = True
+
+    def load_sounds(self, sound_dir):
+        """decode all sounds up front -- files in assets/<sound_dir> win over built-in ones"""
+        freq, size, channels = pg.mixer.get_init()
+        samples = None  # synthesized only if some sound has no file & isn't packed
+
+        for name in SOUND_NAMES:
+            sound = None
+            for ext in (".wav", ".ogg"):
+                file = resources.asset_file(f"{sound_dir}/{name}{ext}")
+                if file is not None:
+                    sound = pg.mixer.Sound(file)
+                    break
+
+            if sound is None:
+                mono = resources.samples(name)
+                if mono is None:
+                    if samples is None: samples = default_samples()
+                    mono = samples[name]
+                if channels > 1: # interleave same sample into every channel
+                    frames = array('h', bytes(2 * len(mono) * channels))
+                    for c in range(channels): frames[c::channels] = mono
+                    mono = frames
+                sound = pg.mixer.Sound(buffer=mono.tobytes())
+
+            sound.set_volume(self.settings.sound_volume)
+            self.sounds.append(sound)
+
+    def play(self, sound_id):
+        """play sound on a pooled channel -- returns channel index or -1 if dropped"""
+        if not self.enabled: return -1
+
+        now = pg.time.get_ticks()
+        if now - self.last_played[sound_id] < COOLDOWN[sound_id]: return -1
+
+        # free voice first, otherwise steal lowest priority & oldest one
+        voice = -1
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                voice = i
+                break
+            if voice < 0: voice = i
+            elif self.voice_priority[i] < self.voice_priority[voice]: voice = i
+            elif self.voice_priority[i] == self.voice_priority[voice] and self.voice_started[i] < self.voice_started[voice]: voice = i
+        else:
+            if self.voice_priority[voice] > PRIORITY[sound_id]: return -1 # everything playing is more important
+
+        self.channels[voice].play(self.sounds[sound_id])
+        self.voice_priority[voice] = PRIORITY[sound_id]
+        self.voice_started[voice] = now
+        self.last_played[sound_id] = now
+        return voice
+
+    def stop(self):
+        for channel in self.channels: channel.stop()
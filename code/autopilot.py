@@ -0,0 +1,188 @@
+"""search based autopilot -- plays live for attract mode, planning jumps over the pipes on screen
+
+the plan is jump / don't for each of the next HORIZON frames, checked on a cheap copy of bird & pipes: ints &
+floats stepped like Bird.jump, Bird.update & PipeManager.move_pipes (Rect rounding included) against the same
+bounds as check_collisions. each frame a plan that still matches the bird is shifted by one frame & extended at
+its far end -- pipes spawn so far right they can't reach the bird inside the horizon, so the rest of it stays
+good. only when it doesn't match (first frame, new run) or can't be extended does the planner search again:
+depth first, old plan's choices tried first, states known to die skipped -- those are kept across frames too.
+search stops at the per frame time budget & the longest surviving plan found so far is flown. an extension cut
+short by the budget isn't a dead end -- the plan keeps what it found & goes on extending next frame
+"""
+import time
+from array import array
+from trajectory import alive_bounds, jump_velocity
+
+HORIZON = 60  # frames planned ahead -- a bit more than the bird needs to get through one pipe
+
+
+class OutOfTime(Exception):
+    pass
+
+
+def rect_round(value):
+    """what a Rect does with a float coordinate -- half away from zero"""
+    return int(value + 0.5) if value >= 0 else -int(0.5 - value)
+
+
+class Autopilot:
+    """game controller -- game.controller = Autopilot(settings). plans at most budget seconds a frame"""
+    def __init__(self, settings, budget=0.002, horizon=HORIZON):
+        self.settings = settings
+        self.budget = budget
+        self.horizon = horizon
+        self.plan = []  # jump per frame from run frame self.start on
+        self.states = []  # (centery, velocity) before each planned frame
+        self.start = 0
+        self.dead = set()  # (run frame, centery, velocity) no plan gets through -- valid for the whole run
+        self.pipe_tables = []  # per pipe in reach: (lefts by frame offset, width, top, bottom)
+        self.frame0 = 0  # run frame pipe tables start at
+        self.out_of_time = False  # last search stopped by the budget, not by running out of ways through
+
+        # planning stats -- per frame time is in the game loop, it must stay under budget
+        self.times = array('d')
+        self.searches = 0
+        self.timeouts = 0
+
+    # -------- model -------- #
+
+    def sync(self, game):
+        """bird constants & pipes in reach for this frame"""
+        bird, pipes = game.bird, game.pipe_manager
+        self.gravity = self.settings.gravity
+        self.jump_v = jump_velocity(bird)
+        self.left, self.right = bird.rect.left, bird.rect.right
+        self.half_height, self.height = bird.rect.height // 2, bird.rect.height
+        self.lo, self.hi = alive_bounds(self.settings, bird)
+
+        shift = pipes.pipe_shift()
+        reach = self.right + int(shift * (self.horizon + 2)) + 1
+        self.frame0 = game.run_frame
+        self.pipe_tables = []
+        for pipe in pipes.pipes:
+            if pipe.right <= self.left or pipe.left > reach: continue # passed, or too far to matter
+            half = pipe.width // 2
+            center, lefts = pipe.centerx, array('i', [pipe.left])
+            for _ in range(self.horizon + 1):
+                center = rect_round(center - shift)
+                lefts.append(center - half)
+            self.pipe_tables.append((lefts, pipe.width, pipe.top, pipe.bottom))
+
+    def step(self, frame, y, v, jump):
+        """state after run frame `frame` -- None if the bird dies in it"""
+        if jump: v = self.jump_v
+        v += self.gravity
+        y = rect_round(y + v)
+        if not self.lo < y < self.hi: return None
+
+        top = y - self.half_height
+        bottom = top + self.height
+        k = frame + 1 - self.frame0
+        for lefts, width, pipe_top, pipe_bottom in self.pipe_tables:
+            left = lefts[k]
+            if self.left < left + width and self.right > left and top < pipe_bottom and bottom > pipe_top: return None
+        return y, v
+
+    def target(self, frame, y):
+        """centery to aim for -- middle of the next gap, like flap_through_gaps"""
+        k = frame - self.frame0
+        for lefts, width, pipe_top, pipe_bottom in self.pipe_tables:
+            if pipe_bottom >= self.settings.height and lefts[k] + width > self.left: return pipe_top - self.settings.height // 6
+        return self.settings.height // 2
+
+    # -------- search -------- #
+
+    def search(self, frame, state, end, hint):
+        """plan from state at run frame `frame` up to `end` -- (plan, states), longest found if out of time.
+        hint is a plan to try first"""
+        self.path, self.path_states = [], []
+        self.best = ([], [])
+        self.nodes = 0
+        self.end = end
+        self.out_of_time = False
+        try: self.dfs(frame, state, hint, 0)
+        except OutOfTime:
+            self.timeouts += 1
+            self.out_of_time = True
+        return self.best
+
+    def dfs(self, frame, state, hint, depth):
+        if frame >= self.end:
+            self.best = (list(self.path), list(self.path_states))
+            return True
+        key = (frame, *state)
+        if key in self.dead: return False
+
+        self.nodes += 1
+        if self.nodes & 15 == 0 and time.perf_counter() > self.deadline: raise OutOfTime
+
+        y, v = state
+        if depth < len(hint): first = hint[depth]
+        else: first = y > self.target(frame, y) and v >= 0
+        for jump in (first, not first):
+            after = self.step(frame, y, v, jump)
+            if after is None: continue
+            self.path.append(jump)
+            self.path_states.append(state)
+            if len(self.path) > len(self.best[0]): self.best = (list(self.path), list(self.path_states))
+            if self.dfs(frame + 1, after, hint, depth + 1): return True
+            self.path.pop()
+            self.path_states.pop()
+        self.dead.add(key)
+        return False
+
+    def __call__(self, game):
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        frame = game.run_frame
+        state = (game.bird.rect.centery, game.bird.velocity)
+        if frame < self.start or frame == 0: self.forget() # new run
+
+        # drop frames already flown
+        skip = frame - self.start
+        if skip > 0:
+            del self.plan[:skip], self.states[:skip]
+            self.start = frame
+
+        self.sync(game)
+        if self.plan and self.states[0] == state:
+            # still on course -- extend far end by what was flown since
+            end_frame = frame + len(self.plan)
+            end_state = self.simulate_end()
+            if end_state is None: self.replan(frame, state)
+            elif end_frame < frame + self.horizon:
+                more, more_states = self.search(end_frame, end_state, frame + self.horizon, [])
+                if len(more) < frame + self.horizon - end_frame and not self.out_of_time:
+                    self.replan(frame, state) # dead end ahead -- back up
+                else: # whole way, or as far as the budget got -- alive all along, rest next frame
+                    self.plan += more
+                    self.states += more_states
+        else: self.replan(frame, state)
+
+        if len(self.dead) > 50000: self.dead = {key for key in self.dead if key[0] >= frame}
+        self.times.append((time.perf_counter() - start) * 1000)
+        return bool(self.plan) and self.plan[0]
+
+    def simulate_end(self):
+        """state after the last planned frame"""
+        y, v = self.states[-1]
+        return self.step(self.start + len(self.plan) - 1, y, v, self.plan[-1])
+
+    def replan(self, frame, state):
+        self.searches += 1
+        hint = self.plan if self.states and self.states[0] == state else []
+        self.plan, self.states = self.search(frame, state, frame + self.horizon, hint)
+        self.start = frame
+
+    def forget(self):
+        self.plan, self.states = [], []
+        self.start = 0
+        self.dead.clear()
+
+    def report(self):
+        """one line of planning stats"""
+        if not self.times: return "autopilot: no frames planned"
+        times = sorted(self.times)
+        return (f"autopilot: {len(times)} frames, plan ms mean {sum(times) / len(times):.3f}  "
+                f"p99 {times[min(len(times) - 1, int(len(times) * 0.99))]:.3f}  max {times[-1]:.3f} "
+                f"(budget {self.budget * 1000:.1f}), {self.searches} searches, {self.timeouts} out of time")
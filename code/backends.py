@@ -0,0 +1,182 @@
+"""drawing backends -- Game.draw describes a frame as a Scene, the backend picked at startup puts it on screen
+
+    SurfaceBackend   software blits onto the display Surface -- what the game always did
+    TextureBackend   pygame._sdl2 Renderer -- images uploaded once as Textures, bird rotation & pipe flips done by
+                     the renderer at draw time. SDL's software renderer works too (settings.render_driver = "software")
+
+menus, text & overlays stay plain Surface code -- they come last in a scene & the texture backend draws them onto
+one see-through layer that goes up as a single streaming texture per frame
+"""
+import math
+import pygame as pg
+from governor import rotate
+
+IMAGE, SPRITE, BATCH, UI = range(4)
+
+
+class Scene:
+    """one frame in draw order -- ops are tuples in a list that's reused every frame"""
+    def __init__(self):
+        self.ops = []
+
+    def clear(self):
+        self.ops.clear()
+
+    def image(self, surface, pos, area=None):
+        """surface as is -- or just the area Rect of it, like Surface.blit's area"""
+        self.ops.append((IMAGE, surface, pos, area))
+
+    def sprite(self, surface, rect, angle=None, flip_y=False):
+        """surface stretched to rect, flipped, then rotated counter clockwise (pg.transform's way) --
+        top left of the rotated box lands on rect's top left, like blitting a rotozoom result at rect.
+        None is no rotation at all, 0 still goes through rotozoom on the surface backend like Bird always did"""
+        self.ops.append((SPRITE, surface, rect, angle, flip_y))
+
+    def batch(self, batch):
+        """(surface, position) list as Surface.blits takes it"""
+        self.ops.append((BATCH, batch))
+
+    def ui(self, draw):
+        """draw(screen) -- surface drawing code for menus & text, after all sprites"""
+        self.ops.append((UI, draw))
+
+
+class SurfaceBackend:
+    def __init__(self, settings):
+        self.resize(settings)
+
+    def resize(self, settings):
+        self.settings = settings
+        size = (settings.width, settings.height)
+        self.vsync = False  # present waits for the display refresh -- see pacing.py
+        if settings.pacing == "vsync":
+            try:
+                self.screen = pg.display.set_mode(size, pg.SCALED, vsync=1)
+                self.vsync = True
+            except pg.error as e: print(f"no vsync display, pacing falls back to hybrid: {e}")
+        if not self.vsync: self.screen = pg.display.set_mode(size)
+        pg.display.set_caption('Flappy Bird')
+        self.scaled = {}  # (surface, size, flip) -> transformed copy
+        self.rotations = {}  # quantized rotations -- see governor.rotate
+
+    def transformed(self, surface, size, flip_y):
+        """surface scaled & flipped once, not every frame"""
+        if not flip_y and surface.get_size() == size: return surface
+        key = (surface, size, flip_y)
+        result = self.scaled.get(key)
+        if result is None:
+            result = surface if surface.get_size() == size else pg.transform.scale(surface, size)
+            if flip_y: result = pg.transform.flip(result, False, True)
+            self.scaled[key] = result
+        return result
+
+    def draw(self, scene):
+        screen = self.screen
+        for op in scene.ops:
+            kind = op[0]
+            if kind == IMAGE: screen.blit(op[1], op[2], op[3])
+            elif kind == SPRITE:
+                _, surface, rect, angle, flip_y = op
+                surface = self.transformed(surface, rect.size, flip_y)
+                if angle is not None: surface = rotate(surface, angle, self.settings.quality, self.rotations)
+                screen.blit(surface, rect)
+            elif kind == BATCH:
+                if op[1]: screen.blits(op[1], False)
+            else: op[1](screen)
+
+    def present(self):
+        pg.display.flip()
+
+    def frame(self):
+        """presented frame as a Surface"""
+        return self.screen
+
+
+class TextureBackend:
+    def __init__(self, settings):
+        from pygame._sdl2.video import Window, Renderer, get_drivers
+
+        # convert_alpha needs a display format -- that window stays hidden, the game draws into its own
+        if pg.display.get_surface() is None: pg.display.set_mode((1, 1), pg.HIDDEN)
+
+        drivers = [driver.name for driver in get_drivers()]
+        index = drivers.index(settings.render_driver) if settings.render_driver in drivers else -1
+        self.window = Window('Flappy Bird', (settings.width, settings.height))
+        self.vsync = settings.pacing == "vsync"  # present waits for the display refresh -- see pacing.py
+        try: self.renderer = Renderer(self.window, index=index, vsync=self.vsync)
+        except pg.error as e:
+            if not self.vsync: raise
+            print(f"no vsync renderer, pacing falls back to hybrid: {e}")
+            self.vsync = False
+            self.renderer = Renderer(self.window, index=index)
+        self.resize(settings)
+
+    def resize(self, settings):
+        from pygame._sdl2.video import Texture
+
+        self.settings = settings
+        self.window.size = (settings.width, settings.height)
+        self.textures = {}  # surface -> Texture -- uploaded on first use, old sizes' images dropped here
+
+        # ui layer -- Surface code draws onto it, uploaded once per frame
+        self.screen = pg.Surface((settings.width, settings.height), pg.SRCALPHA)
+        self.ui = Texture(self.renderer, self.screen.get_size(), streaming=True)
+        self.ui.blend_mode = pg.BLENDMODE_BLEND
+
+    def texture(self, surface):
+        from pygame._sdl2.video import Texture
+
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def draw(self, scene):
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        ui = False
+        for op in scene.ops:
+            kind = op[0]
+            if kind == IMAGE:
+                _, surface, pos, area = op
+                if area is None: self.texture(surface).draw(dstrect=pos)
+                else: self.texture(surface).draw(srcrect=area, dstrect=(pos[0], pos[1], area.width, area.height))
+            elif kind == SPRITE:
+                _, surface, rect, angle, flip_y = op
+                texture = self.texture(surface)
+                if not angle:
+                    texture.draw(dstrect=rect, flip_y=flip_y)
+                    continue
+                # rotated box like rotozoom's, its top left at rect -- renderer turns clockwise around centre
+                radians = math.radians(angle)
+                cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+                box_w, box_h = rect.width * cos + rect.height * sin, rect.width * sin + rect.height * cos
+                dst = pg.Rect((0, 0), rect.size)
+                dst.center = (round(rect.left + box_w / 2), round(rect.top + box_h / 2))
+                texture.draw(dstrect=dst, angle=-angle, flip_y=flip_y)
+            elif kind == BATCH:
+                for surface, pos in op[1]: self.texture(surface).draw(dstrect=pos)
+            else:
+                if not ui:
+                    self.screen.fill((0, 0, 0, 0))
+                    ui = True
+                op[1](self.screen)
+
+        if ui:
+            self.ui.update(self.screen)
+            self.ui.draw()
+
+    def present(self):
+        self.renderer.present()
+
+    def frame(self):
+        """presented frame as a Surface -- read back from the renderer"""
+        return self.renderer.to_surface()
+
+
+BACKENDS = {"surface": SurfaceBackend, "texture": TextureBackend}
+
+
+def make_backend(settings):
+    return BACKENDS[settings.renderer](settings)
@@ -1,4 +1,6 @@
 import pygame as pg
+from governor import rotate
+import resources
 
 class Bird:
     def __init__(self, settings):
@@ -20,9 +22,9 @@ class Bird:
     def load_frames(self):
         """load & scale bird animation frames"""
         # bird images -- sprites for 3 states -- UPFLAP | MIDFLAP | DOWNFLAP -- for animation
-        bird_downflap_original = pg.transform.scale2x(pg.image.load('assets/img/bird-sprites/bird-downflap.png').convert_alpha())
-        bird_midflap_original = pg.transform.scale2x(pg.image.load('assets/img/bird-sprites/bird-midflap.png').convert_alpha())
-        bird_upflap_original = pg.transform.scale2x(pg.image.load('assets/img/bird-sprites/bird-upflap.png').convert_alpha())
+        bird_downflap_original = pg.transform.scale2x(resources.image('img/bird-sprites/bird-downflap.png'))
+        bird_midflap_original = pg.transform.scale2x(resources.image('img/bird-sprites/bird-midflap.png'))
+        bird_upflap_original = pg.transform.scale2x(resources.image('img/bird-sprites/bird-upflap.png'))
 
         # scale based on screen size
         scale_factor = self.settings.width / self.original_width
@@ -41,6 +43,7 @@ class Bird:
             pg.transform.scale(bird_midflap_original, (new_width, new_height)),
             pg.transform.scale(bird_upflap_original, (new_width, new_height))
         ]
+        self.rotations = {}  # (frame image, angle) -> sprite -- filled when quality governor quantizes rotation
 
     def resize(self, settings):
         """update bird for new screen size"""
@@ -81,9 +84,12 @@ class Bird:
         self.rect = self.image.get_rect(center=center) # restore center position
 
     def rotate_bird(self):
-        """bird rotation depending on velocity"""
-        rotated_bird = pg.transform.rotozoom(self.image, -self.velocity * 3, 1)
-        return rotated_bird
+        """bird rotation depending on velocity -- snapped & cached at lower quality, see governor.py"""
+        return rotate(self.image, -self.velocity * 3, self.settings.quality, self.rotations)
+
+    def describe(self, scene):
+        """bird for a drawing backend -- rotation is left to the backend"""
+        scene.sprite(self.image, self.rect, -self.velocity * 3)
 
     def draw(self, screen):
         """draw bird on screen"""
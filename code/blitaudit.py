@@ -0,0 +1,205 @@
+"""blit audit -- debug mode that times every drawing op of a frame & flags surfaces on slow blit paths
+
+    python code/main.py --audit-blits                         # report printed at exit
+    python code/main.py --headless --bot --frames 3000 --uncapped --audit-blits
+
+Surface.blit is a C method & can't be wrapped, so the audit sits where the world is drawn already: the scene.
+each op goes to the backend on its own & is timed, credited to the code that put it in the scene (file:Class.function)
+with the pixels it pushed. menus & text are Surface code inside ui ops -- timed as a whole. pg.transform
+functions are wrapped module wide, so scaling & rotating on every frame shows up with its caller. each surface
+drawn is checked once against the display format:
+
+    not display format       converted pixel by pixel on every blit
+    opaque per-pixel alpha   blended though nothing shows through -- convert() makes it a plain copy
+    colorkey & alpha         both tested on every pixel
+    colorkey without RLE     set_colorkey(key, pg.RLEACCEL) skips transparent runs instead of testing each pixel
+
+surface backend only -- the texture backend blits nothing, its images go up to the GPU once
+"""
+import os
+import sys
+import time
+import weakref
+import pygame as pg
+from backends import Scene, SurfaceBackend, IMAGE, SPRITE, BATCH
+
+KINDS = ("image", "sprite", "batch", "ui")
+TRANSFORMS = ("scale", "smoothscale", "scale2x", "scale_by", "rotate", "rotozoom", "flip")
+RLE = pg.RLEACCEL | pg.RLEACCELOK
+
+
+def site(depth):
+    """file:function of the caller `depth` frames up -- methods with their class"""
+    code = sys._getframe(depth + 1).f_code
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def surface_issues(surface, display):
+    """what keeps surface off the fast blit paths -- [] if nothing"""
+    issues = []
+    flags = surface.get_flags()
+    alpha = bool(flags & pg.SRCALPHA)
+    if surface.get_bitsize() != display.get_bitsize() or surface.get_masks()[:3] != display.get_masks()[:3]:
+        issues.append("not display format")
+    if alpha and not flags & RLE:
+        opaque = surface.copy()
+        opaque.set_colorkey(None) # mask from alpha alone
+        if pg.mask.from_surface(opaque, 254).count() == surface.get_width() * surface.get_height():
+            issues.append("opaque per-pixel alpha")
+    if alpha and surface.get_colorkey() is not None: issues.append("colorkey & alpha")
+    if surface.get_colorkey() is not None and not flags & RLE: issues.append("colorkey without RLE")
+    return issues
+
+
+class AuditScene(Scene):
+    """scene that remembers which code added each op"""
+    def __init__(self):
+        super().__init__()
+        self.sites = []
+
+    def clear(self):
+        super().clear()
+        self.sites.clear()
+
+    def image(self, surface, pos, area=None):
+        super().image(surface, pos, area)
+        self.sites.append(site(1))
+
+    def sprite(self, surface, rect, angle=None, flip_y=False):
+        super().sprite(surface, rect, angle, flip_y)
+        self.sites.append(site(1))
+
+    def batch(self, batch):
+        super().batch(batch)
+        self.sites.append(site(1))
+
+    def ui(self, draw):
+        super().ui(draw)
+        self.sites.append(f"{draw.__module__}.py:{draw.__qualname__}")
+
+
+class BlitAudit:
+    """hooked into a game's scene, backend & pg.transform until close()"""
+    def __init__(self, game):
+        if not isinstance(game.backend, SurfaceBackend): raise ValueError("blit audit needs the surface backend")
+        self.game = game
+        self.frames = 0
+        self.ops = {}  # (site, kind) -> [ops, pixels, seconds]
+        self.transforms = {}  # (function, caller, op site) -> [calls, pixels, seconds, calls while drawing frames]
+        self.surfaces = weakref.WeakKeyDictionary()  # surface -> issues, checked once
+        self.flagged = {}  # (site, size, issues) -> times drawn
+        self.frame_seconds = []  # drawing time of every frame -- the audit's own work left out
+        self.frame_pixels = []
+        self.site = None  # op being drawn -- transforms inside it are credited to it
+
+        game.scene = AuditScene()
+        self.backend = game.backend
+        self.draw_op = self.backend.draw
+        self.backend.draw = self.draw
+        self.single = Scene()
+        self.originals = {name: getattr(pg.transform, name) for name in TRANSFORMS if hasattr(pg.transform, name)}
+        for name, function in self.originals.items(): setattr(pg.transform, name, self.wrap(name, function))
+
+    def close(self):
+        for name, function in self.originals.items(): setattr(pg.transform, name, function)
+        del self.backend.draw
+        self.originals = {}
+
+    # -------- hooks -------- #
+
+    def wrap(self, name, function):
+        def transform(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            key = (name, site(1), self.site)
+            entry = self.transforms.get(key)
+            if entry is None: entry = self.transforms[key] = [0, 0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += result.get_width() * result.get_height()
+            entry[2] += elapsed
+            if self.frames: entry[3] += 1
+            return result
+        transform.__wrapped__ = function
+        return transform
+
+    def draw(self, scene):
+        """scene drawn an op at a time -- each timed & credited to its site"""
+        if not isinstance(scene, AuditScene): return self.draw_op(scene) # scene made elsewhere, e.g. by render.py
+        screen = self.backend.screen
+        bounds = screen.get_rect()
+        drawn = pushed = 0
+        for op, where in zip(scene.ops, scene.sites):
+            kind = op[0]
+            self.single.ops[:] = (op,)
+            self.site = where
+            start = time.perf_counter()
+            self.draw_op(self.single)
+            elapsed = time.perf_counter() - start
+            self.site = None
+            drawn += elapsed
+
+            pixels = 0
+            if kind == IMAGE:
+                _, surface, pos, area = op
+                clipped = pg.Rect(pos, area.size if area else surface.get_size()).clip(bounds)
+                pixels = clipped.width * clipped.height
+                self.check(surface, where)
+            elif kind == SPRITE:
+                clipped = op[2].clip(bounds)
+                pixels = clipped.width * clipped.height
+                self.check(op[1], where)
+            elif kind == BATCH:
+                for surface, pos in op[1]:
+                    clipped = pg.Rect(pos, surface.get_size()).clip(bounds)
+                    pixels += clipped.width * clipped.height
+                    self.check(surface, where)
+
+            key = (where, KINDS[kind])
+            entry = self.ops.get(key)
+            if entry is None: entry = self.ops[key] = [0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += pixels
+            entry[2] += elapsed
+            pushed += pixels
+        self.single.ops.clear()
+        self.frame_seconds.append(drawn)
+        self.frame_pixels.append(pushed)
+        self.frames += 1
+
+    def check(self, surface, where):
+        issues = self.surfaces.get(surface)
+        if issues is None:
+            issues = self.surfaces[surface] = tuple(surface_issues(surface, self.backend.screen))
+        if issues:
+            key = (where, surface.get_size(), issues)
+            self.flagged[key] = self.flagged.get(key, 0) + 1
+
+    # -------- report -------- #
+
+    def report(self):
+        """ranked report -- list of lines"""
+        if not self.frames: return ["blit audit: no frames drawn"]
+        frames = self.frames
+        total = sum(self.frame_seconds)
+        lines = [f"blit audit: {frames} frames -- {total / frames * 1000:.3f} ms & {sum(self.frame_pixels) / frames / 1e6:.2f} Mpx "
+                 f"a frame drawing, worst {max(self.frame_seconds) * 1000:.3f} ms & {max(self.frame_pixels) / 1e6:.2f} Mpx"]
+
+        issues = {}
+        for (where, size, flagged), count in self.flagged.items(): issues.setdefault(where, set()).update(flagged)
+        lines.append(f"  {'op':<36} {'kind':<6} {'per frame':>9} {'kpx/frame':>10} {'ms/frame':>9} {'share':>6}  issues")
+        for (where, kind), (count, op_pixels, seconds) in sorted(self.ops.items(), key=lambda item: -item[1][2]):
+            pushed = f"{op_pixels / frames / 1000:10.1f}" if kind != "ui" else f"{'-':>10}"
+            lines.append(f"  {where:<36} {kind:<6} {count / frames:9.2f} {pushed} {seconds / frames * 1000:9.3f} "
+                         f"{seconds / total:6.1%}  {', '.join(sorted(issues.get(where, ()))) if kind != 'ui' else ''}")
+
+        if self.transforms:
+            lines.append(f"  {'transform':<10} {'called from':<40} {'for op':<36} {'in frames':>9} {'per frame':>9} {'kpx':>9} {'ms':>8}")
+            for (name, caller, op), (count, out, seconds, hot) in sorted(self.transforms.items(), key=lambda item: -item[1][2]):
+                lines.append(f"  {name:<10} {caller:<40} {op or '-':<36} {hot:9d} {hot / frames:9.2f} {out / 1000:9.1f} {seconds * 1000:8.2f}")
+
+        if self.flagged:
+            lines.append("  surfaces off the fast paths:")
+            for (where, size, flagged), count in sorted(self.flagged.items(), key=lambda item: -item[1]):
+                lines.append(f"    {size[0]}x{size[1]} from {where} -- {', '.join(flagged)} ({count / frames:.2f} blits a frame)")
+        return lines
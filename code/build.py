@@ -0,0 +1,112 @@
+"""zipapp build -- the whole game as one file to copy to a kiosk
+
+    python code/build.py                  # dist/flappy.pyz
+    python code/build.py --compare        # + cold start of source vs build
+    python dist/flappy.pyz --size large   # same options as code/main.py
+
+modules go in as bytecode only -- compiled for the python running the build, kiosks need the same version.
+images go in as raw pixels in the display's format & built-in sounds already synthesized (see resources.py),
+so launch decodes nothing. the leaderboard is kept in data/ next to the .pyz
+"""
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+import py_compile
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+import resources
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+SKIP = ("build.py", "server.py", "loadgen.py")  # build tooling & the leaderboard server stay out of the app
+IMAGE_TYPES = (".png", ".jpg", ".jpeg", ".bmp")
+# pygame.pkgdata falls back to plain file paths without pkg_resources -- importing that from setuptools is over
+# a third of a cold start
+MAIN = "import sys\nsys.modules.setdefault('pkg_resources', None)\nimport main\nmain.main()\n"
+
+
+def asset_names(folder, types=None):
+    """files under assets/<folder> as names resources takes -- '/' separated"""
+    names = []
+    for dirpath, _, filenames in os.walk(resources.asset_path(folder)):
+        for filename in sorted(filenames):
+            if types and not filename.lower().endswith(types): continue
+            names.append(os.path.relpath(os.path.join(dirpath, filename), resources.ASSET_DIR).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def build(target, interpreter="/usr/bin/env python3"):
+    """write the zipapp -- returns {entry name: size}"""
+    import audio
+
+    pg.init()
+    pg.display.set_mode((1, 1), pg.HIDDEN) # convert_alpha needs the display's format
+
+    with tempfile.TemporaryDirectory() as staging:
+        entries = []
+        modules = [name for name in sorted(os.listdir(CODE_DIR)) if name.endswith(".py") and name not in SKIP]
+        for name in modules:
+            cfile = os.path.join(staging, name + "c")
+            py_compile.compile(os.path.join(CODE_DIR, name), cfile, dfile=name, doraise=True)
+            entries.append(cfile)
+
+        main = os.path.join(staging, "__main__.py")
+        with open(main, 'w') as file: file.write(MAIN)
+        entries.append(py_compile.compile(main, main + "c", dfile="__main__.py", doraise=True))
+
+        pack = os.path.join(staging, resources.PACK)
+        files = asset_names("sounds") + asset_names("ai")
+        resources.write_pack(pack, asset_names("img", IMAGE_TYPES), files, audio.default_samples())
+        entries.append(pack)
+
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        sizes = {}
+        with open(target, 'wb') as file:
+            file.write(f"#!{interpreter}\n".encode())
+            # stored, not deflated -- nothing to inflate at import, pixels are read straight out of the archive
+            with zipfile.ZipFile(file, 'w', zipfile.ZIP_STORED) as archive:
+                for path in entries:
+                    archive.write(path, os.path.basename(path))
+                    sizes[os.path.basename(path)] = os.path.getsize(path)
+    os.chmod(target, 0o755)
+    return sizes
+
+
+def cold_start(command, runs):
+    """best wall time of a headless one frame launch, in seconds"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command + ["--headless", "--frames", "1", "--size", "small"], check=True, capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build a single file zipapp of the game")
+    parser.add_argument("--out", default=os.path.join(resources.ROOT, "dist", "flappy.pyz"))
+    parser.add_argument("--python", default="/usr/bin/env python3", help="interpreter line of the archive")
+    parser.add_argument("--compare", action="store_true", help="time cold starts of source & build")
+    parser.add_argument("--runs", type=int, default=5, help="launches per timing, best one counts")
+    args = parser.parse_args()
+
+    sizes = build(args.out, args.python)
+    pack = sizes[resources.PACK]
+    print(f"{args.out}: {len(sizes) - 1} entries, pack {pack / 1024:.0f} KiB, {os.path.getsize(args.out) / 1024:.0f} KiB total")
+    pg.quit()
+
+    if args.compare:
+        source = cold_start([sys.executable, os.path.join(CODE_DIR, "main.py")], args.runs)
+        built = cold_start([sys.executable, args.out], args.runs)
+        print(f"cold start  source {source * 1000:.0f} ms  build {built * 1000:.0f} ms  ({(source - built) / source:.0%} faster)")
+
+
+if __name__ == "__main__":
+    main()
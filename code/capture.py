@@ -0,0 +1,167 @@
+"""live frame capture -- presented frames go into a preallocated ring buffer, a background thread writes them out
+
+Game.step only copies the screen's pixels into a free slot of an anonymous mmap & returns. if the writer falls
+behind (slow disk) the ring fills up and new frames are dropped & counted -- the game loop never waits on disk.
+
+ring has one producer (game loop) and one consumer (writer thread) -- head is only written by the first, tail only
+by the second, so neither side takes a lock.
+
+file: FILE_HEADER once, then FRAME_HEADER + pixel data per written frame. frame indexes count every presented
+frame, so dropped ones show up as gaps. read back with read_frames(). a frame bigger than a slot is a setup error &
+raises -- drops are only for a writer that's behind. counts are in report() & the capture_dropped gauge
+"""
+import mmap
+import time
+import zlib
+import struct
+import atexit
+import threading
+from array import array
+import pygame as pg
+from metrics import game_metrics
+
+MAGIC = b"FLPCAP1\n"
+FILE_HEADER = struct.Struct("<8sBB4I")  # magic, bytes per pixel, zlib level (0 = raw), rgba masks
+FRAME_HEADER = struct.Struct("<QdHHII")  # frame index, time, width, height, pitch, data length
+
+
+def slot_bytes(sizes, surface):
+    """bytes one ring slot needs to hold the largest frame in surface's pixel format -- pitch asked from SDL,
+    its row padding differs between builds"""
+    return max(pg.Surface((w, h), 0, surface).get_pitch() * h for w, h in sizes)
+
+
+class FrameCapture:
+    def __init__(self, file, slot_size, slots=16, compress=0, poll=0.002):
+        self.file = file  # path or binary file object
+        self.slots = slots
+        self.slot_size = slot_size
+        self.compress = compress
+        self.poll = poll  # writer sleep when ring is empty
+
+        self.ring = mmap.mmap(-1, slot_size * slots)
+        self.view = memoryview(self.ring)
+
+        # per slot frame info -- preallocated, filled in place
+        self.slot_frame = array('Q', [0] * slots)
+        self.slot_time = array('d', [0.0] * slots)
+        self.slot_width = array('I', [0] * slots)
+        self.slot_height = array('I', [0] * slots)
+        self.slot_pitch = array('I', [0] * slots)
+        self.slot_length = array('I', [0] * slots)
+
+        self.format = None  # (bytes per pixel, masks) -- taken from first frame
+        self.head = 0  # frames put in ring -- game loop only
+        self.tail = 0  # frames written out -- writer only
+        self.frames = 0  # frames presented
+        self.dropped = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.drain, name="capture", daemon=True)
+        self.thread.start()
+        atexit.register(self.close) # game quits with sys.exit -- frames still in ring get written
+        return self
+
+    def capture(self, surface, timestamp=0.0):
+        """copy presented frame into ring -- False if it was dropped"""
+        index = self.frames
+        self.frames += 1
+
+        length = surface.get_pitch() * surface.get_height()
+        if length > self.slot_size:
+            raise ValueError(f"{surface.get_size()} frame needs {length} bytes, capture slots hold {self.slot_size}")
+        if self.head - self.tail >= self.slots: # writer behind -- drop, don't wait
+            self.dropped += 1
+            game_metrics.capture_dropped.inc()
+            return False
+
+        slot = self.head % self.slots
+        offset = slot * self.slot_size
+        pixels = surface.get_view('0')
+        self.view[offset:offset + length] = pixels
+        del pixels  # unlocks surface
+
+        if self.format is None: self.format = (surface.get_bytesize(), surface.get_masks())
+        self.slot_frame[slot] = index
+        self.slot_time[slot] = timestamp
+        self.slot_width[slot], self.slot_height[slot] = surface.get_size()
+        self.slot_pitch[slot] = surface.get_pitch()
+        self.slot_length[slot] = length
+
+        self.head += 1  # publish -- writer may take slot from here on
+        return True
+
+    def drain(self):
+        """writer thread -- writes frames out in order until closed & ring is empty"""
+        file = open(self.file, 'wb') if isinstance(self.file, str) else self.file
+        try:
+            header_written = False
+            while True:
+                if self.tail == self.head:
+                    if not self.running: break
+                    time.sleep(self.poll)
+                    continue
+
+                slot = self.tail % self.slots
+                if not header_written:
+                    bytesize, masks = self.format
+                    file.write(FILE_HEADER.pack(MAGIC, bytesize, self.compress, *masks))
+                    header_written = True
+
+                offset = slot * self.slot_size
+                data = self.view[offset:offset + self.slot_length[slot]]
+                if self.compress: data = zlib.compress(data, self.compress) # releases the GIL
+                file.write(FRAME_HEADER.pack(
+                    self.slot_frame[slot], self.slot_time[slot],
+                    self.slot_width[slot], self.slot_height[slot], self.slot_pitch[slot], len(data)
+                ))
+                file.write(data)
+                if isinstance(data, memoryview): data.release()
+
+                self.tail += 1  # slot free again
+        finally:
+            if isinstance(self.file, str): file.close()
+            else: file.flush()
+
+    @property
+    def written(self):
+        return self.tail
+
+    def close(self):
+        """stop after ring is drained -- safe to call twice"""
+        if self.thread is None: return
+        self.running = False
+        self.thread.join()
+        self.thread = None
+        atexit.unregister(self.close)
+
+    def report(self):
+        return f"capture: {self.written} frames written, {self.dropped} dropped of {self.frames}"
+
+
+def read_frames(path):
+    """yield (frame index, time, surface) from a capture file"""
+    with open(path, 'rb') as file:
+        header = file.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size: return
+        magic, bytesize, compress, *masks = FILE_HEADER.unpack(header)
+        if magic != MAGIC: raise ValueError(f"{path} is not a capture file")
+
+        while True:
+            frame_header = file.read(FRAME_HEADER.size)
+            if len(frame_header) < FRAME_HEADER.size: return
+            index, timestamp, width, height, pitch, length = FRAME_HEADER.unpack(frame_header)
+            data = file.read(length)
+            if compress: data = zlib.decompress(data)
+
+            surface = pg.Surface((width, height), 0, bytesize * 8, masks)
+            if surface.get_pitch() == pitch:
+                surface.get_buffer().write(data)
+            else: # row by row -- pitch differs between SDL builds
+                buffer, row = surface.get_buffer(), width * bytesize
+                for y in range(height): buffer.write(data[y * pitch:y * pitch + row], y * surface.get_pitch())
+                del buffer
+            yield index, timestamp, surface
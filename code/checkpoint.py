@@ -0,0 +1,205 @@
+"""crash-safe checkpoints of the run in progress -- a kiosk losing power mid run can pick it up again
+
+Game hands a snapshot to Checkpointer every few hundred ms of play; encoding it is a couple of struct packs &
+the file write + fsync happen on a background thread, so the game loop never waits on the disk.
+
+file: MAGIC once, then records -- RECORD header (payload length, crc32) + payload. a payload is the whole small
+state (bird, pipes, score, flags) but only the jumps & pipe spawns logged since the previous record, so records
+stay the same size however long the run gets. a new run starts the file over, a finished one empties it.
+reading stops at the first short or corrupt record -- a torn last write just loses that one checkpoint
+"""
+import os
+import zlib
+import queue
+import struct
+import atexit
+import threading
+from array import array
+import pygame as pg
+from replay import screen_of
+
+MAGIC = b"FLPCKPT2"  # 2 -- floor position in subpixels
+RECORD = struct.Struct("<II")  # payload length, crc32 of payload
+# seed, screen (width, height, medium height), run frame, flags, score, bird x, bird centery, velocity, flap frame,
+# floor position (subpixels, see parallax.py), index of first jump here, jumps here, index of first spawn here, spawns here, pipes
+STATE = struct.Struct("<Q3HIBIiidBiIIIIH")
+PIPE = struct.Struct("<iiHHB")  # x, y, width, height, passed
+
+PAUSED, VALID = 1, 2  # flags
+
+
+class Snapshot:
+    """one decoded checkpoint -- jumps & spawns are the whole log up to it"""
+    def __init__(self, fields, pipes, jumps, spawns):
+        (self.seed, width, height, medium, self.run_frame, flags, self.score, self.bird_x, self.bird_y,
+         self.velocity, self.flap, self.floor_position, *_) = fields
+        self.screen = (width, height, medium)
+        self.paused = bool(flags & PAUSED)
+        self.valid = bool(flags & VALID)
+        self.pipes = pipes  # [(x, y, width, height, passed)]
+        self.jumps = jumps
+        self.spawns = spawns
+
+
+def encode(game, jumps_from, spawns_from):
+    """checkpoint payload of game's run -- log entries from the given indexes on"""
+    recorder, bird, pipes = game.recorder, game.bird, game.pipe_manager
+    jumps, spawns = array('I', recorder.jumps[jumps_from:]), array('I', recorder.spawns[spawns_from:])
+    flags = (PAUSED if game.game_paused else 0) | (VALID if recorder.valid else 0)
+    parts = [STATE.pack(
+        recorder.seed, *recorder.screen, game.run_frame, flags, game.score_system.score,
+        bird.rect.x, bird.rect.centery, bird.velocity, bird.bird_index, game.floor_layer.position,
+        jumps_from, len(jumps), spawns_from, len(spawns), len(pipes.pipes)
+    )]
+    passed = pipes.passed_pipes
+    for pipe in pipes.pipes: parts.append(PIPE.pack(pipe.x, pipe.y, pipe.width, pipe.height, pipe in passed))
+    parts.append(jumps.tobytes())
+    parts.append(spawns.tobytes())
+    return b"".join(parts)
+
+
+def decode(payload, jumps, spawns):
+    """payload -> Snapshot, continuing the jump & spawn logs of the records before it. None if it doesn't follow on"""
+    fields = STATE.unpack_from(payload)
+    jumps_from, n_jumps, spawns_from, n_spawns, n_pipes = fields[-5:]
+    if jumps_from > len(jumps) or spawns_from > len(spawns): return None
+
+    offset = STATE.size
+    pipes = []
+    for _ in range(n_pipes):
+        pipes.append(PIPE.unpack_from(payload, offset))
+        offset += PIPE.size
+    new_jumps, new_spawns = array('I'), array('I')
+    new_jumps.frombytes(payload[offset:offset + 4 * n_jumps])
+    offset += 4 * n_jumps
+    new_spawns.frombytes(payload[offset:offset + 4 * n_spawns])
+    return Snapshot(fields, pipes, jumps[:jumps_from] + list(new_jumps), spawns[:spawns_from] + list(new_spawns))
+
+
+def read_checkpoint(path):
+    """last valid checkpoint in the file -- None if there's none (no file, no run in progress, all corrupt)"""
+    try:
+        with open(path, 'rb') as file: data = file.read()
+    except OSError: return None
+    if not data.startswith(MAGIC): return None
+
+    snapshot, jumps, spawns = None, [], []
+    offset = len(MAGIC)
+    while offset + RECORD.size <= len(data):
+        length, crc = RECORD.unpack_from(data, offset)
+        payload = data[offset + RECORD.size:offset + RECORD.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc: break # torn or damaged -- stop at last good one
+        try: decoded = decode(payload, jumps, spawns)
+        except struct.error: break
+        if decoded is None: break
+        snapshot, jumps, spawns = decoded, decoded.jumps, decoded.spawns
+        offset += RECORD.size + length
+    return snapshot
+
+
+def restore(game, snapshot):
+    """put a checkpointed run back into game -- paused, so the player picks Resume or Main Menu"""
+    settings = game.settings
+    if screen_of(settings)[:2] != snapshot.screen[:2]:
+        for name, size in settings.SCREEN_SIZES.items():
+            if size == snapshot.screen[:2]: game.resize_game(name)
+
+    game.in_start_menu = False
+    game.countdown_active = False
+    game.show_leaderboard = False
+    game.game_active = True
+    game.game_paused = True
+    game.pipe_manager.reset()
+    game.bird.reset()
+    game.score_system.reset_score()
+    game.start_run() # ghosts & metrics like any run, next checkpoint starts the file over -- seed & log replaced below
+
+    recorder = game.recorder
+    recorder.start(snapshot.seed, snapshot.screen)
+    recorder.jumps, recorder.spawns = list(snapshot.jumps), list(snapshot.spawns)
+    if not snapshot.valid or screen_of(settings) != snapshot.screen: recorder.invalidate()
+    game.run_frame = snapshot.run_frame
+
+    # pipe heights come from the run's rng -- one draw per spawn so far gets it to where it was
+    manager = game.pipe_manager
+    manager.rng.seed(snapshot.seed)
+    for _ in snapshot.spawns: manager.rng.choice(manager.pipe_heights)
+    for x, y, width, height, passed in snapshot.pipes:
+        pipe = pg.Rect(x, y, width, height)
+        manager.pipes.append(pipe)
+        if passed: manager.passed_pipes.append(pipe)
+
+    bird = game.bird
+    bird.velocity = snapshot.velocity
+    bird.bird_index = snapshot.flap
+    bird.image = bird.bird_frames[bird.bird_index]
+    bird.rect.x, bird.rect.centery = snapshot.bird_x, snapshot.bird_y
+    game.score_system.score = snapshot.score
+    game.floor_layer.position = snapshot.floor_position % game.floor_layer.period
+
+
+class Checkpointer:
+    """appends checkpoints to a file from a background thread -- save() & clear() only queue work"""
+    def __init__(self, path, interval=40):
+        self.path = path
+        self.interval = interval  # gameplay updates between checkpoints
+        self.jumps = 0  # log lengths already written for current run
+        self.spawns = 0
+        self.fresh = True  # next record starts the file over
+        self.pending = queue.SimpleQueue()  # (start over, payload or None)
+        self.saved = 0  # records fsynced -- writer only
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.drain, name="checkpoint", daemon=True)
+        self.thread.start()
+        atexit.register(self.close) # quitting mid run still gets last checkpoint to disk
+        return self
+
+    def due(self, game):
+        return game.run_frame % self.interval == 0
+
+    def begin(self):
+        """new run -- its first checkpoint replaces the file & carries the whole log"""
+        self.fresh = True
+        self.jumps = self.spawns = 0
+
+    def save(self, game):
+        """queue a checkpoint of game's run"""
+        recorder = game.recorder
+        self.pending.put((self.fresh, encode(game, self.jumps, self.spawns)))
+        self.fresh = False
+        self.jumps, self.spawns = len(recorder.jumps), len(recorder.spawns)
+
+    def clear(self):
+        """run over -- nothing left to resume"""
+        self.begin()
+        self.pending.put((True, None))
+
+    def drain(self):
+        """writer thread -- append, flush & fsync each record; start over truncates first"""
+        file = open(self.path, 'ab')
+        try:
+            while True:
+                item = self.pending.get()
+                if item is None: break
+                fresh, payload = item
+                if fresh:
+                    file.truncate(0) # append mode -- writes go to the new end
+                    if payload is not None: file.write(MAGIC)
+                if payload is not None:
+                    file.write(RECORD.pack(len(payload), zlib.crc32(payload)))
+                    file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+                self.saved += payload is not None
+        finally:
+            file.close()
+
+    def close(self):
+        """write out what's queued & stop -- safe to call twice"""
+        if self.thread is None: return
+        self.pending.put(None)
+        self.thread.join()
+        self.thread = None
+        atexit.unregister(self.close)
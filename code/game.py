@@ -3,18 +3,37 @@ import time
 import sys
 import os
 import json
+import random
 from bird import Bird
 from pipes import PipeManager
-from interface import UI, Button
+from interface import UI, Widget, get_font
 from score_system import ScoreSystem
-from leaderboard import LeaderboardButton
+from leaderboard import LeaderboardButton, LeaderboardPanel
+from metrics import game_metrics
+from audio import AudioManager, FLAP, SCORE, HIT, COUNTDOWN
+from replay import RunRecorder, screen_of
+from simulation import death_cause
+from ghosts import GhostLayer
+from capture import FrameCapture, slot_bytes
+from governor import QualityGovernor, OPAQUE_OVERLAYS
+from backends import Scene, make_backend
+from checkpoint import Checkpointer
+from sync import LeaderboardSync
+from runlog import RunLog
+from parallax import Parallax, SUBPIXELS
+from pacing import Pacer
+from archive import Archive
+import resources
             
 class Game:
     def __init__(self, settings):
         self.settings = settings
-        self.screen = pg.display.set_mode((settings.width, settings.height))
-        self.clock = pg.time.Clock()
-        pg.display.set_caption('Flappy Bird')
+        # drawing backend picked once -- every frame is described as a Scene & handed to it
+        self.backend = make_backend(settings)
+        self.screen = self.backend.screen  # surface code (menus, text) draws here
+        self.scene = Scene()
+        self.pacer = Pacer(settings)  # waits out each frame's budget -- see pacing.py
+        self.pacer.vsync = self.backend.vsync
 
         # game state variables
         self.game_active = False  # changed to false as default for start menu
@@ -23,17 +42,21 @@ class Game:
         self.clicked = False
         self.last_click_time = 0
 
+        self.now = time.time # game clock -- headless runs (see soak.py) swap in simulated time
+        self.controller = None # scripted player -- called every frame with game, returns True to jump
+        self.on_frame = None # called with game before every frame -- frame counted timers, bots (see main.py)
+        self.frame_log = None # list of (work ms, frame ms) per frame when benchmarking
+
         # start menu variables
         self.in_start_menu = True
         self.countdown_active = False
         self.countdown_start_time = 0
         self.countdown_duration = 3  # seconds
+        self.countdown_number = 0
 
         # leaderboard display state
         self.show_leaderboard = False
 
-        self.floor_pos = 0
-
         self.load_background_floor()
 
         # game components - Bird | Pipes | Interface (UI,Button) | ScoreSystem | LeaderboardButton
@@ -42,36 +65,89 @@ class Game:
         self.ui = UI(settings)
         self.score_system = ScoreSystem(settings)
         self.leaderboard_button = LeaderboardButton(settings)
-
-        os.makedirs("data", exist_ok=True) # ensure data dir exists for leaderboard
+        self.leaderboard_panel = LeaderboardPanel(settings)
+        self.audio = AudioManager(settings)
+        self.build_widget_tree()
+
+        # run recording -- seed + input log, submitted with the score & verified by re-playing it
+        self.seeds = random.Random(settings.seed)
+        self.recorder = RunRecorder()
+        self.run_frame = 0  # gameplay updates since run start
+        self.death = None  # what ended the run -- simulation.PIPE / FLOOR / CEILING, None while alive
+        self.ghosts = GhostLayer(settings, self.bird)
+
+        os.makedirs(resources.DATA_DIR, exist_ok=True) # ensure data dir exists for leaderboard
+
+        # highlight capture -- slots fit largest screen size so resizing keeps capturing
+        self.capture = None
+        if settings.capture_file:
+            slot_size = slot_bytes(settings.SCREEN_SIZES.values(), self.screen)
+            self.capture = FrameCapture(settings.capture_file, slot_size, settings.capture_slots, settings.capture_compress).start()
+
+        # run checkpoints -- written by a background thread, see checkpoint.py
+        self.checkpoints = None
+        if settings.checkpoint_file: self.checkpoints = Checkpointer(settings.checkpoint_file, settings.checkpoint_interval).start()
+
+        # every finished run appended to the analytics log -- a few small writes at game over
+        self.run_log = RunLog(settings.run_log_file) if settings.run_log_file else None
+        # every re-playable run kept (seed & inputs) in the run archive -- see archive.py
+        self.archive = Archive(settings.archive_file) if settings.archive_file else None
+
+        # global leaderboard -- network work on its own thread, scores submitted & top scores polled without waiting
+        self.leaderboard_sync = None
+        self.global_scores = None  # newest top scores from the server, None until the first fetch
+        if settings.leaderboard_url:
+            self.leaderboard_sync = LeaderboardSync(settings.leaderboard_url, resources.data_path("outbox.json"),
+                                                    top=settings.leaderboard_size).start()
+            self.score_system.sync = self.leaderboard_sync
+
+        # drawing quality follows frame times -- see governor.py
+        self.governor = QualityGovernor(settings) if settings.adaptive_quality else None
 
         # set up timers
         pg.time.set_timer(settings.SPAWNPIPE, settings.pipe_spawn_time)
         pg.time.set_timer(settings.BIRDFLAP, settings.bird_flap_time)
 
     def load_background_floor(self):
-        """load & scale background and floor images"""
+        """load & scale background and floor images -- parallax layers of the current size"""
         # --------------- Background Image --------------- #
-        self.bg = pg.image.load("assets/img/background.jpg").convert_alpha()
+        self.bg = resources.image("img/background.jpg")
         self.bg.set_colorkey(self.settings.WHITE)
         self.bg = pg.transform.scale(self.bg, (self.settings.width, self.settings.height))
 
         # --------------- Floor Image --------------- #
-        self.floor = pg.image.load("assets/img/floor.jpg").convert_alpha()
+        self.floor = resources.image("img/floor.jpg")
         self.floor.set_colorkey(self.settings.WHITE)
         self.floor = pg.transform.scale(self.floor, (self.settings.width, self.settings.height // 8))
 
-    def draw_floor(self):
-        """draw the scrolling floor"""
-        floor_height = self.settings.height - self.settings.height // 10
-        self.screen.blit(self.floor, (self.floor_pos, floor_height))
-        self.screen.blit(self.floor, (self.floor_pos + self.settings.width, floor_height))
+        # --------------- Parallax Layers --------------- #
+        # speeds are per frame at medium size -- scaled, sub-pixel offsets keep small sizes scrolling
+        speedf = self.settings.scale_factor # speed factor
+        self.parallax = Parallax((self.settings.width, self.settings.height))
+        self.parallax.add(self.bg, 0, self.settings.background_speed * speedf)
+        self.floor_layer = self.parallax.add(self.floor, self.settings.height - self.settings.height // 10, speedf)
+
+        # --------------- Countdown Overlay --------------- #
+        self.countdown_overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
+        self.countdown_overlay.fill((0, 0, 0, 128))
+
+    @property
+    def floor_pos(self):
+        """floor's x on screen, whole pixels"""
+        return -(self.floor_layer.position // SUBPIXELS)
+
+    @floor_pos.setter
+    def floor_pos(self, x):
+        self.floor_layer.offset = -x
 
     def resize_game(self, size):
         """resize all game elements for a new screen size"""
         if self.settings.update_screen_size(size):
+            if not self.in_start_menu: self.recorder.invalidate() # run can't be re-played at one size
             # update screen
-            self.screen = pg.display.set_mode((self.settings.width, self.settings.height))
+            self.backend.resize(self.settings)
+            self.screen = self.backend.screen
+            self.pacer.vsync = self.backend.vsync
 
             # reload background and floor
             self.load_background_floor()
@@ -79,57 +155,110 @@ class Game:
             # update all game components
             self.bird.resize(self.settings)
             self.pipe_manager.resize(self.settings)
+            self.ghosts.resize(self.settings, self.bird)
             self.ui.resize(self.settings)
             self.score_system.resize(self.settings)
             self.leaderboard_button.resize(self.settings)
-        
+            self.leaderboard_panel.layout(self.settings)
+            self.build_widget_tree()
+
+    def build_widget_tree(self):
+        """(re)build UI widget tree -- done once per screen size"""
+        # children order == z order -- topmost widget gets the click first
+        self.widgets = Widget()
+        self.widgets.add(
+            self.leaderboard_button, self.ui.start_menu, self.leaderboard_panel,
+            self.ui.pause_menu, self.ui.game_over_menu,
+            self.ui.size_button, self.ui.size_options
+        )
+        self.sync_widgets()
+
+    def sync_widgets(self):
+        """show / hide widget groups to match current game state"""
+        in_menu = self.in_start_menu and not self.countdown_active
+        in_game = not self.in_start_menu and not self.countdown_active # game in progress or over
+
+        self.leaderboard_button.visible = in_menu
+        self.leaderboard_panel.visible = in_menu and self.show_leaderboard
+        self.ui.start_menu.visible = in_menu and not self.show_leaderboard
+        self.ui.pause_menu.visible = in_game and self.game_active and self.game_paused
+        self.ui.game_over_menu.visible = in_game and not self.game_active
+        self.ui.size_button.visible = not self.countdown_active
+        self.ui.size_options.visible = not self.countdown_active and self.show_size_menu
+
+    def on_widget_click(self, widget):
+        """run action of clicked widget"""
+        if widget is self.leaderboard_button: self.toggle_leaderboard()
+        elif widget is self.leaderboard_panel.close_button: self.show_leaderboard = False
+        elif widget is self.ui.start_button: self.start_countdown()
+        elif widget is self.ui.resume_button: self.game_paused = False
+        elif widget is self.ui.again_button: self.restart_game()
+        elif widget is self.ui.quit_button: pg.quit(); sys.exit()
+        elif widget is self.ui.menu_button: self.return_to_menu()
+        elif widget is self.ui.size_button: self.show_size_menu = not self.show_size_menu
+        elif widget is self.ui.small_button: self.resize_game("small"); self.show_size_menu = False
+        elif widget is self.ui.medium_button: self.resize_game("medium"); self.show_size_menu = False
+        elif widget is self.ui.large_button: self.resize_game("large"); self.show_size_menu = False
+
     def start_countdown(self):
         """start the 3-second countdown before game begins"""
         self.countdown_active = True
-        self.countdown_start_time = time.time()
+        self.countdown_start_time = self.now()
+        self.countdown_number = 0 # last number beeped
 
     def update_countdown(self):
         """update countdown timer and start game when finished"""
         if self.countdown_active:
-            elapsed = time.time() - self.countdown_start_time
+            elapsed = self.now() - self.countdown_start_time
             remaining = self.countdown_duration - elapsed
 
+            # beep on every new number -- 3..2..1
+            number = max(1, int(remaining) + 1)
+            if remaining > 0 and number != self.countdown_number:
+                self.countdown_number = number
+                self.audio.play(COUNTDOWN)
+
             if remaining <= 0:
                 # countdown finished -> start game
                 self.countdown_active = False
                 self.in_start_menu = False
                 self.game_active = True
                 self.bird.reset()
+                self.start_run()
 
-    def draw_countdown(self):
+    def draw_countdown(self, screen):
         """draw countdown timer"""
         if self.countdown_active:
-            elapsed = time.time() - self.countdown_start_time
+            elapsed = self.now() - self.countdown_start_time
             remaining = self.countdown_duration - elapsed
 
             if remaining > 0:
-                overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
-                overlay.fill((0, 0, 0, 128))
-                self.screen.blit(overlay, (0, 0))
+                if self.settings.quality < OPAQUE_OVERLAYS: screen.blit(self.countdown_overlay, (0, 0))
 
-                countdown_font = pg.font.SysFont('Arial', 120)
+                countdown_font = get_font('Arial', 120)
                 number = str(max(1, int(remaining) + 1))
                 text_surface = countdown_font.render(number, True, (255, 255, 255))
                 text_rect = text_surface.get_rect(center=(self.settings.width // 2, self.settings.height // 2))
-                self.screen.blit(text_surface, text_rect)
+                screen.blit(text_surface, text_rect)
 
                 # get ready text
-                ready_font = pg.font.SysFont('Arial', 60)
+                ready_font = get_font('Arial', 60)
                 ready_text = ready_font.render("Get Ready!", True, (255, 255, 255))
                 ready_rect = ready_text.get_rect(center=(self.settings.width // 2, self.settings.height // 3))
-                self.screen.blit(ready_text, ready_rect)
+                screen.blit(ready_text, ready_rect)
 
     def handle_events(self):
-        cur_time = time.time()
+        cur_time = self.now()
 
         for event in pg.event.get():
             if event.type == pg.QUIT: pg.quit(); sys.exit()
 
+            # ui widgets -- state may have changed by previous event so visibility is synced first
+            if event.type in (pg.MOUSEMOTION, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEWHEEL, pg.KEYDOWN):
+                self.sync_widgets()
+                clicked = self.widgets.handle_event(event)
+                if clicked is not None: self.on_widget_click(clicked)
+
             # pause with P key -- only when game is active
             if event.type == pg.KEYDOWN and event.key == pg.K_p and self.game_active and not self.countdown_active:
                 self.game_paused = not self.game_paused
@@ -137,6 +266,7 @@ class Game:
             # handle pipe spawning and bird animation
             if event.type == self.settings.SPAWNPIPE and self.game_active and not self.game_paused:
                 self.pipe_manager.spawn_pipe()
+                self.recorder.spawn(self.run_frame)
 
             if event.type == self.settings.BIRDFLAP and not self.game_paused:
                 self.bird.flap_animation()
@@ -157,9 +287,15 @@ class Game:
                     self.score_system.show_name_input = False # clean input box after submission
 
         # handle space key for bird jumping -- only when game is active
-        keys = pg.key.get_pressed()
-        if keys[pg.K_SPACE] and self.game_active and not self.game_paused and not self.countdown_active:
+        if self.game_active and not self.game_paused and not self.countdown_active and self.wants_jump():
             self.bird.jump()
+            self.recorder.jump(self.run_frame)
+            self.audio.play(FLAP)
+
+    def wants_jump(self):
+        """space key held -- or scripted player's decision if one is plugged in"""
+        if self.controller is not None: return self.controller(self)
+        return pg.key.get_pressed()[pg.K_SPACE]
 
     def update(self):
         """update game state -- including all of micro and meta processes"""
@@ -167,20 +303,20 @@ class Game:
             self.update_countdown()
             return
 
-        # move floor | always update even in menus for animation
-        speedf = self.settings.scale_factor # speed factor 
-        self.floor_pos -= int(1 * speedf)
-        if self.floor_pos <= -self.settings.width: self.floor_pos = 0
+        # scroll floor & other moving layers | always update even in menus for animation
+        self.parallax.update()
         # skip other updates if game IS NOT ACTIVE or IS PAUSED
         if not self.game_active or self.game_paused: return
 
         # update pipes
         self.pipe_manager.update()
+        game_metrics.pipes_alive.set(len(self.pipe_manager.pipes))
 
         # check score increases
         scored_pipe = self.pipe_manager.check_score(self.bird.rect.centerx)
         if scored_pipe:
             self.score_system.increase_score()
+            self.audio.play(SCORE)
             self.score_system.add_score_message(
                 self.bird.rect.centerx + 20,
                 self.bird.rect.centery - 30
@@ -193,169 +329,115 @@ class Game:
         self.score_system.update_score_messages()
 
         # collisions check
-        if not self.check_collisions():
+        alive = self.check_collisions()
+        self.run_frame += 1
+        if alive and self.checkpoints and self.checkpoints.due(self): self.checkpoints.save(self)
+        if not alive:
             self.game_active = False
+            if self.checkpoints: self.checkpoints.clear() # finished run -- nothing to resume
+            self.audio.play(HIT)
+            self.recorder.finish(self.run_frame)
+            if self.run_log: self.run_log.record_run(self)
+            if self.recorder.valid:
+                self.score_system.replay = self.recorder.to_dict(self.score_system.score)
+                if self.archive is not None: self.archive.append(self.score_system.replay)
             self.score_system.update_high_score()
+            game_metrics.runs_finished.inc()
+            game_metrics.score.observe(self.score_system.score)
 
     def check_collisions(self):
-        # check pipe collisions
-        if self.pipe_manager.check_collision(self.bird.rect): return False
-
-        # check boundary collisions
-        floor_height = self.settings.height - self.settings.height // 10
-        if self.bird.rect.top <= -100 or self.bird.rect.bottom >= floor_height: return False
-
-        return True
+        """False once bird hits a pipe, the floor or flies way off the top -- rule shared with Simulation.
+        what it hit is kept in self.death"""
+        self.death = death_cause(self.bird, self.pipe_manager, self.settings)
+        return self.death is None
 
     def draw(self):
         """ draw all game elements based on 3 states:
              • game not started
              • countdown state
              • game is active or over
+           world (background, floor, pipes, birds) goes into the scene as images & sprites, menus & text as
+           surface drawing code on top -- the backend puts it on screen
         """
-        self.screen.blit(self.bg, (0, 0)) # draw background
+        scene = self.scene
+        scene.clear()
+        self.parallax.describe(scene) # background & floor
 
-        self.draw_floor()
+        self.sync_widgets()
 
         # -------------- START MENU -------------- #
         if self.in_start_menu and not self.countdown_active:
-            self.ui.draw_start_menu(self.screen)
-            
-            # leaderboard button
-            if self.leaderboard_button.draw_button(self.screen):
-                self.show_leaderboard = not self.show_leaderboard
-
-            
-            if self.show_leaderboard:
-                self.draw_leaderboard(self.screen)
-            elif self.ui.start_button.draw_button(self.screen): # display only start button if leaderboard is not shown
-                self.start_countdown()
+            scene.ui(self.draw_start_menu)
 
         # -------------- COUNTDOWN -------------- #
         elif self.countdown_active: # 3..2..1
-            self.bird.draw(self.screen) # bird during countdown
-            self.draw_countdown() # countdown itself
+            self.bird.describe(scene) # bird during countdown
+            scene.ui(self.draw_countdown) # countdown itself
 
         # -------------- Game IN PROGRESS or OVER -------------- #
         else:
-            self.pipe_manager.draw(self.screen) # displaying pipes
-
-            if self.game_active: self.bird.draw(self.screen) # bird if game is active
-
-            self.score_system.draw_score_messages(self.screen) # score message
-
-            # score display
-            if not self.game_paused: self.score_system.draw_score(self.screen, 'a_game' if self.game_active else 'game_over')
-
-            # pause overlay
-            if self.game_paused and self.game_active:
-                self.ui.draw_pause_overlay(self.screen)
-                if self.ui.resume_button.draw_button(self.screen): self.game_paused = False
-
-            # draw UI elements depending on game state
-            if not self.game_active:
-                if self.ui.again_button.draw_button(self.screen):
-                    self.restart_game()
-                if self.ui.quit_button.draw_button(self.screen):
-                    pg.quit();
-                    sys.exit()
-                if self.ui.menu_button.draw_button(self.screen):
-                    self.return_to_menu()
-
-        # size button always available except COUNTDOWN SCREEN
-        if not self.countdown_active:
-            if self.ui.size_button.draw_button(self.screen):
-                self.show_size_menu = not self.show_size_menu
-
-            if self.show_size_menu:
-                if self.ui.small_button.draw_button(self.screen):
-                    self.resize_game("small")
-                    self.show_size_menu = False
-                if self.ui.medium_button.draw_button(self.screen):
-                    self.resize_game("medium")
-                    self.show_size_menu = False
-                if self.ui.large_button.draw_button(self.screen):
-                    self.resize_game("large")
-                    self.show_size_menu = False
+            self.pipe_manager.describe(scene) # displaying pipes
 
-    def draw_leaderboard(self, screen):
-        """draw the leaderboard screen with simplified layout - no dates"""
-        # create semi-transparent background overlay
-        overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
-
-        # create leaderboard panel
-        leaderboard_width = self.settings.width * 0.8
-        leaderboard_height = self.settings.height * 0.8
-        leaderboard_bg = pg.Surface((leaderboard_width, leaderboard_height), pg.SRCALPHA)
-        leaderboard_bg.fill((40, 40, 60, 230))
-
-        # position the leaderboard in the center
-        bg_rect = leaderboard_bg.get_rect(center=(self.settings.width // 2, self.settings.height // 2))
-        screen.blit(leaderboard_bg, bg_rect)
-
-        # display the title
-        title_font = pg.font.SysFont('Impact', int(50 * self.settings.scale_factor))
-        title_text = title_font.render("LEADERBOARD", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.settings.width // 2, bg_rect.top + 50))
-        screen.blit(title_text, title_rect)
-
-        top_scores = self.get_leaderboard_scores() # get top scores
-
-        # draw headers -- | RANK | NAME | SCORE |
-        header_y = title_rect.bottom + 30
-        column_width = (leaderboard_width - 60) / 3
-        header_font = pg.font.SysFont('Arial', int(30 * self.settings.scale_factor))
-
-        rank_text = header_font.render("RANK", True, (200, 200, 200))
-        name_text = header_font.render("NAME", True, (200, 200, 200))
-        score_text = header_font.render("SCORE", True, (200, 200, 200))
-
-        screen.blit(rank_text, (bg_rect.left + column_width / 2 - rank_text.get_width() / 2, header_y))
-        screen.blit(name_text, (bg_rect.left + column_width * 1.5 - name_text.get_width() / 2, header_y))
-        screen.blit(score_text, (bg_rect.left + column_width * 2.5 - score_text.get_width() / 2, header_y))
-
-        # draw horizontal line below headers
-        pg.draw.line(
-            screen,
-            (200, 200, 200),
-            (bg_rect.left + 30, header_y + 35),
-            (bg_rect.right - 30, header_y + 35),
-            2
-        )
+            if self.game_active:
+                self.ghosts.describe(scene, self.run_frame) # ghost birds under player's one
+                self.bird.describe(scene) # bird if game is active
 
-        # draw each score entry
-        start_y = header_y + 60
-        for i, entry in enumerate(top_scores):
-            row_color = (60, 60, 80) if i % 2 == 0 else (80, 80, 100)
-            row_rect = pg.Rect(bg_rect.left + 30, start_y, bg_rect.width - 60, 40)
-            pg.draw.rect(screen, row_color, row_rect, border_radius=5)
+            scene.ui(self.draw_game_ui)
 
-            rank_text = header_font.render(f"{i + 1}", True, (255, 255, 255))
-            screen.blit(rank_text, (bg_rect.left + column_width / 2 - rank_text.get_width() / 2, start_y + 5))
+        # size button always available except COUNTDOWN SCREEN -- visibility handled by sync_widgets
+        scene.ui(self.draw_size_menu)
 
-            name_text = header_font.render(entry["name"], True, (255, 255, 255))
-            screen.blit(name_text, (bg_rect.left + column_width * 1.5 - name_text.get_width() / 2, start_y + 5))
-            
-            score_text = header_font.render(str(entry["score"]), True, (255, 215, 0))
-            screen.blit(score_text, (bg_rect.left + column_width * 2.5 - score_text.get_width() / 2, start_y + 5))
+        self.backend.draw(scene)
+
+    def draw_start_menu(self, screen):
+        self.ui.draw_start_menu(screen)
+        self.leaderboard_button.draw(screen) # leaderboard button
+
+        if self.show_leaderboard: self.draw_leaderboard(screen)
+        else: self.ui.start_menu.draw(screen) # display only start button if leaderboard is not shown
+
+    def draw_game_ui(self, screen):
+        """score, pause & game over screens over a run"""
+        self.score_system.draw_score_messages(screen) # score message
 
-            start_y += 50
-        # -------- CLOSE BUTTON -------- #
-        close_rect = pg.Rect(bg_rect.centerx - 75, bg_rect.bottom - 60, 150, 40)
-        pg.draw.rect(screen, (180, 50, 50), close_rect, border_radius=10)
-        close_text = header_font.render("Close", True, (255, 255, 255))
-        close_text_rect = close_text.get_rect(center=close_rect.center)
-        screen.blit(close_text, close_text_rect)
+        # score display
+        if not self.game_paused: self.score_system.draw_score(screen, 'a_game' if self.game_active else 'game_over')
 
-        mouse_pos = pg.mouse.get_pos()
-        if close_rect.collidepoint(mouse_pos) and pg.mouse.get_pressed()[0]: # check for button click
-            self.show_leaderboard = False
+        # pause overlay
+        if self.game_paused and self.game_active:
+            self.ui.draw_pause_overlay(screen)
+            self.ui.pause_menu.draw(screen)
+
+        # draw UI elements depending on game state
+        if not self.game_active: self.ui.game_over_menu.draw(screen)
+
+    def draw_size_menu(self, screen):
+        self.ui.size_button.draw(screen)
+        self.ui.size_options.draw(screen)
+
+    def toggle_leaderboard(self):
+        """show / hide leaderboard -- scores are read from file only when it opens"""
+        self.show_leaderboard = not self.show_leaderboard
+        if self.show_leaderboard:
+            self.leaderboard_panel.set_scores(self.get_leaderboard_scores())
+            if self.leaderboard_sync: self.leaderboard_sync.refresh()
+
+    def draw_leaderboard(self, screen):
+        """draw the leaderboard screen -- panel & rows are pre-rendered, see LeaderboardPanel"""
+        self.leaderboard_panel.draw(screen)
+
+    def poll_leaderboard(self):
+        """take top scores the sync thread fetched -- open panel updates in place"""
+        scores = self.leaderboard_sync.poll()
+        if scores is None: return
+        self.global_scores = scores
+        if self.show_leaderboard: self.leaderboard_panel.set_scores(self.get_leaderboard_scores())
 
     def get_leaderboard_scores(self):
-        """get the leaderboard scores from file or create empty if does not exist"""
-        leaderboard_file = "data/leaderboard.json"
+        """get the leaderboard scores -- global ones once fetched, else from file or create empty if does not exist"""
+        limit = self.settings.leaderboard_size
+        if self.global_scores is not None: return self.global_scores[:limit]
+        leaderboard_file = self.score_system.leaderboard_file
         try:
             os.makedirs(os.path.dirname(leaderboard_file), exist_ok=True) # ensure directory exists | also done in main.py
 
@@ -363,9 +445,9 @@ class Game:
                 with open(leaderboard_file, 'r') as file:
                     data = json.load(file)
                     if "scores" in data:
-                        return data["scores"][:7] # limit to top 7 scores // fixed bug cuz even tho in score_system i limited score num to 7 i forgot to do so in display func here
+                        return data["scores"][:limit] # limit to top scores // fixed bug cuz even tho in score_system i limited score num i forgot to do so in display func here
                     elif "leaderboard" in data:
-                        return data["leaderboard"][:7] # limit to top 7 scores
+                        return data["leaderboard"][:limit] # limit to top scores
                     else:
                         return []
             else:
@@ -385,9 +467,25 @@ class Game:
         self.pipe_manager.reset()
         self.bird.reset()
         self.score_system.reset_score()
+        self.start_run()
+
+    def start_run(self):
+        """new run -- fresh seed for pipe layout & empty input log"""
+        seed = self.seeds.getrandbits(32)
+        self.pipe_manager.rng.seed(seed)
+        self.recorder.start(seed, screen_of(self.settings))
+        self.run_frame = 0
+        if self.checkpoints: self.checkpoints.begin()
+        game_metrics.runs_started.inc()
+
+        # ghosts of best runs on this screen size
+        if self.settings.ghost_count > 0:
+            self.ghosts.start(self.ghosts.load(self.settings.ghost_file or self.score_system.leaderboard_file), self.settings.ghost_count)
+        else: self.ghosts.clear()
 
     def return_to_menu(self):
         """return -> start menu"""
+        if self.game_active and self.checkpoints: self.checkpoints.clear() # run given up
         self.in_start_menu = True
         self.game_active = False
         self.game_paused = False
@@ -395,12 +493,33 @@ class Game:
         self.bird.reset()
         self.score_system.reset_score()
 
-    def run(self):
-        """main game loop"""
-        while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-
-            pg.display.flip()
-            self.clock.tick(self.settings.FPS)
+    def step(self):
+        """run one frame -- events, update, draw & present"""
+        if self.on_frame: self.on_frame(self)
+        if self.leaderboard_sync: self.poll_leaderboard()
+        self.score_system.check_submissions()
+        self.handle_events()
+        self.update()
+        self.draw()
+
+        if self.capture: self.capture.capture(self.backend.frame(), self.now()) # read before present -- texture backend's back buffer is undefined after
+        self.backend.present()
+
+    def run(self, frames=None, seconds=None):
+        """main game loop -- endless unless bounded by a frame count or wall clock seconds"""
+        end = None if seconds is None else time.perf_counter() + seconds
+        last = time.perf_counter()
+        frame = 0
+        while frames is None or frame < frames:
+            self.step()
+            work_ms = (time.perf_counter() - last) * 1000
+            self.pacer.wait()
+            now = time.perf_counter()
+            frame_ms = (now - last) * 1000
+            last = now
+
+            game_metrics.record_frame(frame_ms, self.settings.FPS)
+            if self.governor: self.governor.record(work_ms)
+            if self.frame_log is not None: self.frame_log.append((work_ms, frame_ms))
+            frame += 1
+            if end is not None and now >= end: break
@@ -0,0 +1,231 @@
+"""ghost racing -- leaderboard runs re-played as see-through birds flying next to the player
+
+positions are streamed from each replay's jump log with the closed form trajectory (trajectory.py) -- a ghost
+costs a few list lookups per frame. sprites are tinted & rotated once per (flap frame, angle step) and every
+visible ghost goes out in one Surface.blits call
+
+    python code/ghosts.py --ghosts 500 --frames 2000   # draw benchmark
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import pygame as pg
+from trajectory import Trajectory, Stretch, jump_velocity, alive_bounds
+from replay import screen_of
+
+TINT = (170, 210, 255, 110)  # rgba multiplier -- pale blue & see-through
+ANGLE_STEP = 0.5  # velocity per cached rotation -- 1.5 degrees
+MAX_VELOCITY = 20  # steeper dives share last sprite
+
+
+def read_replays(path):
+    """replays from a leaderboard file or a submissions file (one JSON object per line) -- best score first"""
+    try:
+        with open(path, 'r') as file: text = file.read()
+    except OSError:
+        return []
+
+    try:
+        data = json.loads(text)
+        entries = data.get("scores", [data]) if isinstance(data, dict) else data
+    except ValueError:
+        entries = []
+        for line in text.splitlines():
+            try: entries.append(json.loads(line))
+            except ValueError: continue
+
+    replays = [entry["replay"] for entry in entries if isinstance(entry, dict) and isinstance(entry.get("replay"), dict)]
+    return sorted(replays, key=lambda replay: replay.get("score", 0), reverse=True)
+
+
+class Ghost:
+    """one replay -- position after `frame` gameplay updates, streamed jump by jump"""
+    __slots__ = ("jumps", "frames", "phase", "next", "start", "trajectory", "stretch")
+
+    def __init__(self, replay, phase, layer):
+        self.jumps = sorted(set(replay["jumps"]))
+        self.frames = int(replay["frames"])
+        self.phase = phase  # flap frame offset -- ghosts don't all flap in step
+        self.next = 0
+        self.start = 0
+        self.trajectory = layer.fall
+        self.stretch = Stretch(layer.fall, layer.start_y, self.stretch_frames(0), *layer.bounds)
+
+    def stretch_frames(self, start):
+        """updates from start up to next jump or crash"""
+        end = self.jumps[self.next] if self.next < len(self.jumps) else self.frames
+        return max(1, end - start)
+
+    def rebase(self, layer):
+        """apply next jump -- new stretch starts where old one got to"""
+        jump = self.jumps[self.next]
+        self.next += 1
+        y = self.stretch.y(min(jump - self.start, self.stretch.length))
+        self.start = jump
+        self.trajectory = layer.rise
+        self.stretch = Stretch(layer.rise, y, self.stretch_frames(jump), *layer.bounds)
+
+
+class GhostLayer:
+    def __init__(self, settings, bird):
+        self.ghosts = []
+        self.batch = []  # (sprite, position) list handed to blits -- reused every frame
+        self.replays = []  # parsed replays of the file last loaded
+        self.source = None  # (path, mtime, size) they were read from
+        self.resize(settings, bird)
+
+    def resize(self, settings, bird):
+        """new screen size -- replays of other sizes don't fit, so ghosts are dropped until next run"""
+        self.settings = settings
+        self.ghosts = []
+
+        self.x = bird.rect.left
+        self.half_height = bird.rect.height // 2
+        self.start_y = settings.height // 2
+        self.bounds = alive_bounds(settings, bird)
+        self.flap_frames = max(1, round(settings.bird_flap_time * settings.FPS / 1000))
+
+        self.fall = Trajectory(0, settings.gravity)
+        self.rise = Trajectory(jump_velocity(bird), settings.gravity)
+        self.min_velocity = min(self.rise.v0, 0)
+
+        # tinted once per flap frame, rotations cached lazily
+        self.tinted = []
+        for frame in bird.bird_frames:
+            sprite = frame.copy()
+            sprite.fill(TINT, special_flags=pg.BLEND_RGBA_MULT)
+            self.tinted.append(sprite)
+        self.angles = int((MAX_VELOCITY - self.min_velocity) / ANGLE_STEP) + 1
+        self.sprites = [[None] * self.angles for _ in self.tinted]
+        self.cull_height = bird.rect.width + bird.rect.height  # rotated sprite never gets taller
+
+    def load(self, path):
+        """read_replays of path -- parsed again only when the file changed since last load, one stat otherwise"""
+        try:
+            stat = os.stat(path)
+            source = (path, stat.st_mtime_ns, stat.st_size)
+        except OSError: source = (path, None, None)
+        if source != self.source: self.replays, self.source = read_replays(path), source
+        return self.replays
+
+    def start(self, replays, limit=None):
+        """new run -- ghosts for replays played on this screen size"""
+        screen = screen_of(self.settings)
+        self.ghosts = []
+        for replay in replays:
+            if limit is not None and len(self.ghosts) >= limit: break
+            try:
+                if tuple(replay["screen"]) != screen: continue
+                self.ghosts.append(Ghost(replay, len(self.ghosts) % 3, self))
+            except (KeyError, TypeError, ValueError):
+                continue # broken replay -- no ghost
+
+    def clear(self):
+        self.ghosts = []
+
+    def sprite(self, flap, velocity):
+        """tinted & rotated sprite -- same angle as Bird.rotate_bird, quantized to ANGLE_STEP"""
+        index = int((velocity - self.min_velocity) / ANGLE_STEP + 0.5)
+        index = 0 if index < 0 else min(index, self.angles - 1)
+        sprite = self.sprites[flap][index]
+        if sprite is None:
+            velocity = self.min_velocity + index * ANGLE_STEP
+            sprite = pg.transform.rotozoom(self.tinted[flap], -velocity * 3, 1)
+            self.sprites[flap][index] = sprite
+        return sprite
+
+    def visible(self, frame):
+        """(sprite, position) of ghosts after `frame` gameplay updates -- crashed & off screen ones are culled"""
+        batch = self.batch
+        batch.clear()
+        if not self.ghosts: return batch
+
+        x, top, bottom = self.x, -self.cull_height, self.settings.height
+        flap = frame // self.flap_frames
+        crashed = False
+
+        for ghost in self.ghosts:
+            if frame > ghost.frames:
+                crashed = True
+                continue
+
+            while ghost.next < len(ghost.jumps) and ghost.jumps[ghost.next] < frame: ghost.rebase(self)
+            k = frame - ghost.start
+            if k > ghost.stretch.length: # replay says alive but bird already hit floor -- broken replay
+                ghost.frames = -1
+                crashed = True
+                continue
+
+            y = ghost.stretch.y(k) - self.half_height
+            if y <= top or y >= bottom: continue
+
+            batch.append((self.sprite((flap + ghost.phase) % 3, ghost.trajectory.velocities[k]), (x, y)))
+
+        if crashed: self.ghosts = [ghost for ghost in self.ghosts if ghost.frames >= frame]
+        return batch
+
+    def draw(self, screen, frame):
+        """visible ghosts in one blits call"""
+        batch = self.visible(frame)
+        if batch: screen.blits(batch, False)
+
+    def describe(self, scene, frame):
+        """ghosts for a drawing backend -- one batch"""
+        scene.batch(self.visible(frame))
+
+
+def synthetic_replays(settings, count, frames, seed=0):
+    """replays of birds holding a random height for the whole run -- for benchmarks"""
+    rng = random.Random(seed)
+    screen = list(screen_of(settings))
+    replays = []
+    for _ in range(count):
+        target = rng.randint(settings.height // 5, settings.height * 3 // 4)
+        rect = pg.Rect(0, settings.height // 2, 0, 0)
+        velocity, jumps = 0, []
+        for frame in range(frames):
+            if rect.centery > target and velocity >= 0:
+                jumps.append(frame)
+                velocity = -6
+            velocity += settings.gravity
+            rect.centery += velocity
+        replays.append({"seed": 0, "screen": screen, "frames": frames, "score": 0, "jumps": jumps, "spawns": []})
+    return replays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ghost layer draw benchmark")
+    parser.add_argument("--ghosts", type=int, default=500)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+    from settings import Settings
+    from bird import Bird
+    settings = Settings()
+    screen = pg.display.set_mode((settings.width, settings.height))
+    background = screen.copy()
+    layer = GhostLayer(settings, Bird(settings))
+    layer.start(synthetic_replays(settings, args.ghosts, args.frames + 1))
+
+    times = []
+    for frame in range(args.frames):
+        start = time.perf_counter()
+        screen.blit(background, (0, 0))
+        layer.draw(screen, frame)
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    budget = 1000 / settings.FPS
+    p99 = times[int(len(times) * 0.99)]
+    print(f"{args.ghosts} ghosts: median {times[len(times) // 2]:.2f} ms, p99 {p99:.2f} ms, budget {budget:.1f} ms")
+    pg.quit()
+    sys.exit(0 if p99 < budget else 1)
+
+
+if __name__ == "__main__":
+    main()
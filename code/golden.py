@@ -0,0 +1,205 @@
+"""golden frame checks -- a scripted headless session with a fixed seed, frames at fixed points compared to
+stored images so drawing optimizations can't quietly change what players see
+
+    python code/golden.py            # compare against testing/golden, exit 1 on a mismatch
+    python code/golden.py --update   # re-record after an intended visual change
+
+comparison is pygame blits only (no numpy): a 16x16 average hash catches a changed layout at a glance, the
+per pixel check counts pixels where any channel is off by more than `tolerance`. mismatches are written to
+--out as actual & diff images
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+GOLDEN_DIR = "testing/golden"
+CHECKPOINTS = ("start_menu", "leaderboard", "countdown", "mid_flight", "pause", "game_over")
+LEADERBOARD = {"scores": [{"name": "ada", "score": 31}, {"name": "linus", "score": 17}, {"name": "grace", "score": 4}]}
+
+
+def pin_fonts():
+    """pygame's bundled font for every SysFont -- goldens mustn't depend on fonts installed on the machine"""
+    pg.font.SysFont = lambda name, size, bold=False, italic=False: pg.font.Font(None, size)
+
+
+def average_hash(surface, size=16):
+    """perceptual hash -- bit per cell of a size x size grayscale thumbnail, set where brighter than mean"""
+    small = pg.transform.grayscale(pg.transform.smoothscale(surface, (size, size)))
+    values = [small.get_at((x, y))[0] for y in range(size) for x in range(size)]
+    mean = sum(values) / len(values)
+    return sum(1 << i for i, value in enumerate(values) if value > mean)
+
+
+def hash_distance(a, b):
+    return (a ^ b).bit_count()
+
+
+def diff_surface(a, b):
+    """|a - b| per channel as a surface -- two saturating subtractions added up"""
+    size = a.get_size()
+    x, y = pg.Surface(size), pg.Surface(size)
+    x.blit(a, (0, 0))
+    y.blit(b, (0, 0))
+    diff = x.copy()
+    diff.blit(y, (0, 0), special_flags=pg.BLEND_RGB_SUB)  # a - b, clamped at 0
+    y.blit(x, (0, 0), special_flags=pg.BLEND_RGB_SUB)  # b - a, clamped at 0
+    diff.blit(y, (0, 0), special_flags=pg.BLEND_RGB_ADD)
+    return diff
+
+
+def differing_pixels(a, b, tolerance=8):
+    """pixels where any channel is off by more than tolerance -- all pixels if sizes differ"""
+    if a.get_size() != b.get_size(): return max(a.get_width() * a.get_height(), b.get_width() * b.get_height())
+    diff = diff_surface(a, b)
+    diff.fill((tolerance, tolerance, tolerance), special_flags=pg.BLEND_RGB_SUB)  # within tolerance -> black
+    same = pg.mask.from_threshold(diff, (0, 0, 0, 255), (1, 1, 1, 255)).count()
+    return a.get_width() * a.get_height() - same
+
+
+class GoldenSession:
+    """headless game driven through every checkpoint -- same frames on every run"""
+    def __init__(self, seed=3, size="small"):
+        from settings import Settings
+        from game import Game
+        from main import FrameTimers, Bot
+        from simulation import flap_through_gaps
+
+        pg.init()
+        pin_fonts()
+        settings = Settings()
+        settings.update_screen_size(size) # small & large are fixed sizes, medium follows the display
+        settings.seed = seed
+        settings.sound_enabled = False
+        settings.ghost_count = 0
+        settings.adaptive_quality = False # governor would pick levels by machine speed
+        self.game = game = Game(settings)
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        game.score_system.leaderboard_file = os.path.join(self.tmpdir.name, "leaderboard.json")
+        with open(game.score_system.leaderboard_file, 'w') as file: json.dump(LEADERBOARD, file)
+        game.score_system.high_score = LEADERBOARD["scores"][0]["score"]
+
+        self.timers = FrameTimers(game)
+        game.on_frame = self.timers
+        self.bot = Bot(game)
+        self.flying = True
+        game.controller = lambda game: self.flying and flap_through_gaps(game)
+        self.frames = 0
+
+    def steps(self, count):
+        for _ in range(count): self.step()
+
+    def step(self):
+        self.game.step()
+        self.frames += 1
+
+    def steps_until(self, done, limit=20000):
+        while not done():
+            if limit == 0: raise RuntimeError("golden session got stuck")
+            self.step()
+            limit -= 1
+
+    def key(self, key, unicode=""):
+        pg.event.post(pg.event.Event(pg.KEYDOWN, key=key, unicode=unicode, mod=0))
+        self.step()
+
+    def checkpoints(self):
+        """yield (name, frame) -- frame is only valid until next one is asked for"""
+        game = self.game
+        self.steps(30)
+        yield "start_menu", game.backend.frame()
+
+        game.toggle_leaderboard()
+        self.steps(5)
+        yield "leaderboard", game.backend.frame()
+        game.toggle_leaderboard()
+
+        game.start_countdown()
+        self.steps(game.settings.FPS * 3 // 2)
+        yield "countdown", game.backend.frame()
+
+        self.steps_until(lambda: game.game_active)
+        self.steps_until(lambda: game.score_system.score >= 1)
+        self.steps(40)
+        yield "mid_flight", game.backend.frame()
+
+        self.key(pg.K_p)
+        self.steps(5)
+        yield "pause", game.backend.frame()
+        self.key(pg.K_p)
+
+        self.steps_until(lambda: game.score_system.score >= 2)
+        self.flying = False # crash -- score qualifies for the leaderboard
+        self.steps_until(lambda: not game.game_active)
+        for char in "kiosk": self.key(ord(char), char)
+        self.steps(5)
+        yield "game_over", game.backend.frame()
+
+    def close(self):
+        self.tmpdir.cleanup()
+
+
+def check(golden_dir=GOLDEN_DIR, out=None, update=False, tolerance=8, max_pixels=0.001, max_hash=6):
+    """run session -- ([(checkpoint, hash distance, differing pixels, ok)], frames stepped). update re-records goldens"""
+    session = GoldenSession()
+    results = []
+    try:
+        for name, frame in session.checkpoints():
+            path = os.path.join(golden_dir, f"{name}.png")
+            if update:
+                os.makedirs(golden_dir, exist_ok=True)
+                pg.image.save(frame, path)
+                results.append((name, 0, 0, True))
+                continue
+
+            if not os.path.exists(path):
+                results.append((name, None, None, False))
+                continue
+            golden = pg.image.load(path)
+            distance = hash_distance(average_hash(frame), average_hash(golden))
+            pixels = differing_pixels(frame, golden, tolerance)
+            ok = distance <= max_hash and pixels <= max_pixels * golden.get_width() * golden.get_height()
+            results.append((name, distance, pixels, ok))
+
+            if not ok and out:
+                os.makedirs(out, exist_ok=True)
+                pg.image.save(frame, os.path.join(out, f"{name}-actual.png"))
+                if frame.get_size() == golden.get_size():
+                    diff = diff_surface(frame, golden)
+                    for _ in range(3): diff.blit(diff, (0, 0), special_flags=pg.BLEND_RGB_ADD) # x8 -- small differences made visible
+                    pg.image.save(diff, os.path.join(out, f"{name}-diff.png"))
+    finally:
+        session.close()
+    return results, session.frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="golden frame visual regression check")
+    parser.add_argument("--update", action="store_true", help="re-record golden images")
+    parser.add_argument("--golden", default=GOLDEN_DIR)
+    parser.add_argument("--out", default="golden-out", help="actual & diff images of mismatches go here")
+    parser.add_argument("--tolerance", type=int, default=8, help="per channel difference still counted as same")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, frames = check(args.golden, args.out, args.update, args.tolerance)
+    elapsed = time.perf_counter() - start
+
+    for name, distance, pixels, ok in results:
+        if distance is None: print(f"{name:<12} missing golden -- run with --update")
+        else: print(f"{name:<12} {'ok' if ok else 'MISMATCH':<9} hash distance {distance:3d}  pixels off {pixels}")
+    print(f"{frames} frames in {elapsed:.2f}s -- {frames / elapsed:.0f} fps")
+    pg.quit()
+    sys.exit(0 if all(ok for *_, ok in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""adaptive quality -- steps drawing quality down while frames run late, back up once there's headroom
+
+levels are cumulative, each one gives up a bit more looks for frame time:
+    0  full quality
+    1  bird rotation quantized to ROTATION_STEP degrees & cached -- no rotozoom every frame
+    2  no text shadows (score messages, game over screen, title)
+    3  no see-through overlays -- menus & panels drawn straight over the game
+
+only drawing reads settings.quality -- runs & replays play the same at every level. off unless
+settings.adaptive_quality (--adaptive-quality) -- level changes show in the flappy_quality_level gauge (metrics.py)
+"""
+from array import array
+import pygame as pg
+from metrics import game_metrics
+
+QUANTIZED_ROTATION = 1
+NO_SHADOWS = 2
+OPAQUE_OVERLAYS = 3
+LEVEL_NAMES = ("full", "quantized rotation", "no text shadows", "no overlay alpha")
+
+ROTATION_STEP = 6  # degrees per cached bird rotation
+
+
+def rotate(image, angle, quality, cache):
+    """rotozoom image by angle -- snapped to ROTATION_STEP & kept in cache from QUANTIZED_ROTATION up"""
+    if quality < QUANTIZED_ROTATION: return pg.transform.rotozoom(image, angle, 1)
+
+    angle = round(angle / ROTATION_STEP) * ROTATION_STEP
+    rotated = cache.get((image, angle))
+    if rotated is None:
+        rotated = pg.transform.rotozoom(image, angle, 1)
+        cache[(image, angle)] = rotated
+    return rotated
+
+
+class QualityGovernor:
+    """fed the work time of every frame -- decides once per window of frames
+
+    a window with more than a tenth of its frames late steps quality down right away. stepping back up
+    needs `calm` windows in a row where even the slowest frame left `headroom` of the budget, so a level
+    that only just fits isn't left & re-entered every window
+    """
+    def __init__(self, settings, window=40, late=0.9, headroom=0.6, calm=4):
+        self.settings = settings
+        budget = 1000 / settings.FPS
+        self.late = budget * late  # work ms that count as a late frame
+        self.headroom = budget * headroom
+        self.calm = calm
+
+        self.times = array('d', [0.0] * window)
+        self.frames = 0
+        self.calm_windows = 0
+        game_metrics.quality_level.set(settings.quality)
+
+    def record(self, work_ms):
+        """work time of last frame (Game.step, tick's sleep left out) -- new level if it changed"""
+        times = self.times
+        times[self.frames % len(times)] = work_ms
+        self.frames += 1
+        if self.frames % len(times): return None
+
+        level = self.settings.quality
+        late = sum(1 for t in times if t > self.late)
+        if late > len(times) // 10:
+            self.calm_windows = 0
+            if level < len(LEVEL_NAMES) - 1: return self.set_level(level + 1)
+        elif max(times) < self.headroom:
+            self.calm_windows += 1
+            if self.calm_windows >= self.calm and level > 0:
+                self.calm_windows = 0
+                return self.set_level(level - 1)
+        else: self.calm_windows = 0
+        return None
+
+    def set_level(self, level):
+        self.settings.quality = level
+        game_metrics.quality_level.set(level)
+        return level
@@ -1,8 +1,50 @@
 import pygame as pg
 from pygame.locals import *
+from governor import NO_SHADOWS, OPAQUE_OVERLAYS
+
+# SysFont scans installed fonts on every call -- way too slow for per frame use, so fonts are shared from here
+_font_cache = {}
+
+def get_font(name, size):
+    """return cached SysFont for name & size"""
+    key = (name, size)
+    font = _font_cache.get(key)
+    if font is None:
+        font = pg.font.SysFont(name, size)
+        _font_cache[key] = font
+    return font
+
+
+class Widget:
+    """base of retained UI tree -- layout is done once per screen size, drawing only blits cached surfaces"""
+    def __init__(self, rect=(0, 0, 0, 0)):
+        self.rect = pg.Rect(rect)
+        self.children = []
+        self.visible = True
+
+    def add(self, *widgets):
+        self.children.extend(widgets)
+
+    def handle_event(self, event):
+        """pass event to children (topmost first) -- returns the widget that got activated or None"""
+        # mouse motion goes to hidden widgets too so hover state is never stale when they show up again
+        if not self.visible and event.type != MOUSEMOTION: return None
+
+        for child in reversed(self.children):
+            activated = child.handle_event(event)
+            if activated is not None: return activated
+        return None
+
+    def draw(self, screen):
+        if not self.visible: return
+        for child in self.children: child.draw(screen)
+
+
+class Button(Widget):
+    margin = 2  # shading lines stick out of the button rect a bit
 
-class Button:
     def __init__(self, x, y, text, width=None, height=None, color=(17, 208, 51)):
+        super().__init__((x, y, width, height))
         self.x = x
         self.y = y
         self.text = text
@@ -12,53 +54,167 @@ class Button:
         self.hover_col = (min(color[0] + 30, 255), min(color[1] + 30, 255), min(color[2] + 30, 255))
         self.click_col = (max(color[0] - 50, 0), max(color[1] - 50, 0), max(color[2] - 50, 0))
         self.text_col = (255, 255, 255)
-        self.clicked = False
-        self.last_click_time = 0
-
-    def draw_button(self, screen):
-        action = False
 
-        pos = pg.mouse.get_pos() # mouse position
+        # visual state -- driven by events, not by polling the mouse
+        self.hovered = False
+        self.pressed = False
 
-        button_rect = Rect(self.x, self.y, self.width, self.height) # rect for button
+        self.render_states()
 
-        # check mouseover & clicked conditions
-        if button_rect.collidepoint(pos):
-            if pg.mouse.get_pressed()[0] == 1:
-                cur_time = pg.time.get_ticks() # preventing multiple clicks by checking time
-                if cur_time - self.last_click_time > 200:  # ms in debounce
-                    self.clicked = True
-                    self.last_click_time = cur_time
-                pg.draw.rect(screen, self.click_col, button_rect)
+    def render_states(self):
+        """pre-render one surface per visual state"""
+        self.surfaces = {
+            "normal": self.render_state(self.button_col),
+            "hover": self.render_state(self.hover_col),
+            "pressed": self.render_state(self.click_col),
+        }
 
-            elif pg.mouse.get_pressed()[0] == 0 and self.clicked == True:
-                self.clicked = False
-                action = True
+    def render_state(self, color):
+        """render button body, shading & label into a surface"""
+        m = self.margin
+        w, h = self.rect.width, self.rect.height
+        surface = pg.Surface((w + m * 2, h + m * 2), pg.SRCALPHA)
 
-            else:
-                pg.draw.rect(screen, self.hover_col, button_rect)
-
-        else:
-            pg.draw.rect(screen, self.button_col, button_rect)
+        pg.draw.rect(surface, color, (m, m, w, h))
 
         # shading
-        pg.draw.line(screen, (255, 255, 255), (self.x, self.y), (self.x + self.width, self.y), 2)
-        pg.draw.line(screen, (255, 255, 255), (self.x, self.y), (self.x, self.y + self.height), 2)
-        pg.draw.line(screen, (0, 0, 0), (self.x, self.y + self.height), (self.x + self.width, self.y + self.height), 3)
-        pg.draw.line(screen, (0, 0, 0), (self.x + self.width, self.y), (self.x + self.width, self.y + self.height), 3)
+        pg.draw.line(surface, (255, 255, 255), (m, m), (m + w, m), 2)
+        pg.draw.line(surface, (255, 255, 255), (m, m), (m, m + h), 2)
+        pg.draw.line(surface, (0, 0, 0), (m, m + h), (m + w, m + h), 3)
+        pg.draw.line(surface, (0, 0, 0), (m + w, m), (m + w, m + h), 3)
 
         # font size based on button size -- width, height
-        font_size = min(int(self.height * 0.6), int(self.width * 0.2))
-        button_font = pg.font.SysFont('Constantia', font_size)
-
-        # text for buttons
-        text_img = button_font.render(self.text, True, self.text_col)
-        text_len = text_img.get_width()
-        text_height = text_img.get_height()
+        font_size = min(int(h * 0.6), int(w * 0.2))
+        text_img = get_font('Constantia', font_size).render(self.text, True, self.text_col)
 
         # centering text inside button
-        screen.blit(text_img, (self.x + (self.width - text_len) // 2, self.y + (self.height - text_height) // 2))
-        return action
+        surface.blit(text_img, (m + (w - text_img.get_width()) // 2, m + (h - text_img.get_height()) // 2))
+        return surface
+
+    def state(self):
+        if self.pressed and self.hovered: return "pressed"
+        return "hover" if self.hovered else "normal"
+
+    def handle_event(self, event):
+        """track hover & press -- returns self when clicked (pressed and released over the button)"""
+        if event.type == MOUSEMOTION:
+            self.hovered = self.rect.collidepoint(event.pos)
+            return None
+        if not self.visible: return None
+
+        if event.type == MOUSEBUTTONDOWN and event.button == 1:
+            self.hovered = self.rect.collidepoint(event.pos)
+            self.pressed = self.hovered
+            return None
+
+        if event.type == MOUSEBUTTONUP and event.button == 1:
+            clicked = self.pressed and self.rect.collidepoint(event.pos)
+            self.pressed = False
+            return self if clicked else None
+
+        return None
+
+    def draw(self, screen):
+        if self.visible:
+            screen.blit(self.surfaces[self.state()], (self.rect.x - self.margin, self.rect.y - self.margin))
+
+
+class NameInput(Widget):
+    """leaderboard name entry -- text box + submit button sharing one layout for drawing & hit testing"""
+    def __init__(self, settings):
+        super().__init__()
+        self.text = ""
+        self.active = False
+        self.max_length = 15
+        self.blink = 0  # frames drawn since the box came up -- cursor blinks by frame count, renders don't depend on the clock
+        self.layout(settings)
+
+    def layout(self, settings):
+        """compute rects & render static parts for current screen size"""
+        self.settings = settings
+        s = settings.scale_factor
+        self.font = get_font('Arial', int(32 * s))
+
+        # input box -- positioned higher to make room for buttons below
+        input_width = 400 * s
+        input_height = 50 * s
+        input_x = (settings.width - input_width) // 2
+        input_y = settings.height // 3 + 75
+        self.rect = pg.Rect(input_x, input_y, input_width, input_height)
+
+        # instruct text
+        self.label = self.font.render("Enter your name for the leaderboard:", True, (255, 255, 255))
+        self.label_rect = self.label.get_rect(center=(settings.width // 2, input_y - 25))
+
+        # box with inactive & active borders
+        self.box = {}
+        for active, border in ((False, (100, 100, 100)), (True, (0, 200, 0))):
+            box = pg.Surface(self.rect.size)
+            box.fill((50, 50, 50))
+            pg.draw.rect(box, border, box.get_rect(), 3)
+            self.box[active] = box
+
+        # -------------- SUBMIT BUTTON -------------- #
+        submit_width = 150 * s
+        submit_height = 40 * s
+        self.submit_button = SubmitButton(
+            (settings.width - submit_width) // 2, input_y + input_height + 20,
+            submit_width, submit_height, self.font
+        )
+        self.children = [self.submit_button]
+
+        self.render_text()
+
+    def render_text(self):
+        self.text_surface = self.font.render(self.text, True, (255, 255, 255))
+
+    def set_text(self, text):
+        self.text = text
+        self.render_text()
+
+    def handle_event(self, event):
+        """returns self when name is submitted -- by Enter or by the submit button"""
+        if event.type == MOUSEBUTTONDOWN:
+            self.active = self.rect.collidepoint(event.pos) # if clicked on input box
+
+        elif event.type == KEYDOWN and self.active:
+            if event.key == K_RETURN: return self
+            elif event.key == K_BACKSPACE: self.set_text(self.text[:-1])
+            elif len(self.text) < self.max_length: self.set_text(self.text + event.unicode)
+            return None
+
+        return self if super().handle_event(event) is not None else None
+
+    def draw(self, screen):
+        screen.blit(self.label, self.label_rect)
+        screen.blit(self.box[self.active], self.rect)
+        screen.blit(self.text_surface, (self.rect.x + 10, self.rect.y + 10))
+
+        # blinking cursor when active -- half a second on, half off
+        if self.active and self.blink // max(1, self.settings.FPS // 2) % 2 == 0:
+            cursor_x = self.rect.x + 10 + self.text_surface.get_width()
+            pg.draw.line(screen, (255, 255, 255), (cursor_x, self.rect.y + 10), (cursor_x, self.rect.bottom - 10), 2)
+        self.blink += 1
+
+        self.submit_button.draw(screen)
+
+
+class SubmitButton(Button):
+    margin = 0
+
+    def __init__(self, x, y, width, height, font):
+        self.font = font
+        super().__init__(x, y, "Submit", width, height, (0, 150, 0))
+
+    def render_state(self, color):
+        surface = pg.Surface(self.rect.size, pg.SRCALPHA)
+        radius = int(self.rect.height // 4)
+        pg.draw.rect(surface, color, surface.get_rect(), border_radius=radius)
+        pg.draw.rect(surface, (0, 200, 0), surface.get_rect(), 3, border_radius=radius)
+
+        text = self.font.render(self.text, True, self.text_col)
+        surface.blit(text, text.get_rect(center=surface.get_rect().center))
+        return surface
 
 
 class UI:
@@ -67,9 +223,11 @@ class UI:
         self.create_buttons()
 
         # font setups
-        self.game_font = pg.font.SysFont('Impact', int(40 * settings.scale_factor))
-        self.pause_font = pg.font.SysFont('Arial', 72)
-        self.title_font = pg.font.SysFont('Impact', int(80 * settings.scale_factor))
+        self.game_font = get_font('Impact', int(40 * settings.scale_factor))
+        self.pause_font = get_font('Arial', 72)
+        self.title_font = get_font('Impact', int(80 * settings.scale_factor))
+
+        self.render_overlays()
 
     def create_buttons(self):
         """create all UI buttons BASED ON current screen size"""
@@ -94,7 +252,7 @@ class UI:
         again_y = h * 0.65
         self.again_button = Button(again_x, again_y, 'Play Again', again_width, again_height)
 
-        ### -------------- QUIT BUTTON -------------- ###  
+        ### -------------- QUIT BUTTON -------------- ###
         quit_width = int(180 * button_scale_w)
         quit_height = int(70 * button_scale_h)
         quit_x = w - quit_width - (w - quit_width) // 4
@@ -137,71 +295,94 @@ class UI:
         large_x = w - size_opt_width - 10
         self.large_button = Button(large_x, size_opt_y - 10, 'Large', size_opt_width, size_opt_height, (80, 80, 200))
 
+        # -------------- widget groups -- shown / hidden together -------------- #
+        self.start_menu = Widget()
+        self.start_menu.add(self.start_button)
+
+        self.game_over_menu = Widget()
+        self.game_over_menu.add(self.again_button, self.quit_button, self.menu_button)
+
+        self.pause_menu = Widget()
+        self.pause_menu.add(self.resume_button)
+
+        self.size_options = Widget()
+        self.size_options.add(self.small_button, self.medium_button, self.large_button)
+
     def resize(self, settings):
         """update interface for new screen size if changed"""
         self.settings = settings
         self.create_buttons()
-        self.game_font = pg.font.SysFont('Impact', int(40 * settings.scale_factor))
-        self.title_font = pg.font.SysFont('Impact', int(80 * settings.scale_factor))
+        self.game_font = get_font('Impact', int(40 * settings.scale_factor))
+        self.title_font = get_font('Impact', int(80 * settings.scale_factor))
+        self.render_overlays()
 
-    def draw_start_menu(self, screen):
-        """draw start menu screen"""
+    def render_overlays(self):
+        """pre-render static start menu & pause overlays for current screen size"""
+        w, h = self.settings.width, self.settings.height
+
+        # ---------- START MENU ---------- #
         # semi-transparent overlay for text visibility
-        overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 80))
-        screen.blit(overlay, (0, 0))
+        self.start_overlay = pg.Surface((w, h), pg.SRCALPHA)
+        self.start_overlay.fill((0, 0, 0, 80))
 
         # game title
-        title_shadow = self.title_font.render("FLAPPY BIRD", True, (100, 100, 0))
-        title_text = self.title_font.render("FLAPPY BIRD", True, (255, 255, 0))
-
-        shadow_rect = title_shadow.get_rect(center=(self.settings.width // 2 + 5, self.settings.height // 4 + 5))
-        title_rect = title_text.get_rect(center=(self.settings.width // 2, self.settings.height // 4))
-
-        screen.blit(title_shadow, shadow_rect)
-        screen.blit(title_text, title_rect)
+        self.title_shadow = self.title_font.render("FLAPPY BIRD", True, (100, 100, 0))
+        self.title_text = self.title_font.render("FLAPPY BIRD", True, (255, 255, 0))
+        self.title_shadow_rect = self.title_shadow.get_rect(center=(w // 2 + 5, h // 4 + 5))
+        self.title_rect = self.title_text.get_rect(center=(w // 2, h // 4))
 
         # subtitle -- Press to Start the game
-        subtitle_font = pg.font.SysFont('Arial', int(30 * self.settings.scale_factor))
-        subtitle_text = subtitle_font.render("Press Play to start the Game!", True, (255, 255, 255))
-        subtitle_rect = subtitle_text.get_rect(center=(self.settings.width // 2, self.settings.height * 0.35))
-        screen.blit(subtitle_text, subtitle_rect)
-
-        # highest score -- if exists
-        if hasattr(self, 'high_score') and self.high_score > 0:
-            high_score_text = self.game_font.render(f"High Score: {self.high_score}", True, (255, 255, 255))
-            high_score_rect = high_score_text.get_rect(center=(self.settings.width // 2, self.settings.height * 0.45))
-            screen.blit(high_score_text, high_score_rect)
+        subtitle_font = get_font('Arial', int(30 * self.settings.scale_factor))
+        self.subtitle_text = subtitle_font.render("Press Play to start the Game!", True, (255, 255, 255))
+        self.subtitle_rect = self.subtitle_text.get_rect(center=(w // 2, h * 0.35))
 
-    def draw_pause_overlay(self, screen):
-        """draw pause menu overlay"""
-        overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        screen.blit(overlay, (0, 0))
+        # ---------- PAUSE ---------- #
+        self.pause_overlay = pg.Surface((w, h), pg.SRCALPHA)
+        self.pause_overlay.fill((0, 0, 0, 128))
 
         # box background
         pause_width = int(300 * self.settings.scale_factor)
         pause_height = int(200 * self.settings.scale_factor)
-        pause_x = (self.settings.width - pause_width) // 2
-        pause_y = (self.settings.height - pause_height) // 2
+        pause_x = (w - pause_width) // 2
+        pause_y = (h - pause_height) // 2
 
         # rounded rect -- for PAUSED menu text
         pause_rect = pg.Rect(pause_x, pause_y, pause_width, pause_height)
-        pg.draw.rect(screen, (60, 60, 80, 220), pause_rect, border_radius=15)
-        pg.draw.rect(screen, (100, 100, 120), pause_rect, width=3, border_radius=15)
+        pg.draw.rect(self.pause_overlay, (60, 60, 80), pause_rect, border_radius=15)
+        pg.draw.rect(self.pause_overlay, (100, 100, 120), pause_rect, width=3, border_radius=15)
 
         # PAUSED text with shadowing
         paused_text = self.pause_font.render("PAUSED", True, (255, 255, 255))
         shadow_text = self.pause_font.render("PAUSED", True, (80, 80, 80))
 
-        text_rect = paused_text.get_rect(center=(self.settings.width // 2, pause_y + 60))
-        shadow_rect = shadow_text.get_rect(center=(self.settings.width // 2 + 4, pause_y + 64))
+        text_rect = paused_text.get_rect(center=(w // 2, pause_y + 60))
+        shadow_rect = shadow_text.get_rect(center=(w // 2 + 4, pause_y + 64))
 
-        screen.blit(shadow_text, shadow_rect)
-        screen.blit(paused_text, text_rect)
+        self.pause_overlay.blit(shadow_text, shadow_rect)
+        self.pause_overlay.blit(paused_text, text_rect)
 
         # hint text
-        hint_font = pg.font.SysFont('Arial', int(18 * self.settings.scale_factor))
+        hint_font = get_font('Arial', int(18 * self.settings.scale_factor))
         hint_text = hint_font.render("Press P or double-click to resume", True, (200, 200, 200))
-        hint_rect = hint_text.get_rect(center=(self.settings.width // 2, text_rect.bottom + 20))
-        screen.blit(hint_text, hint_rect)
+        hint_rect = hint_text.get_rect(center=(w // 2, text_rect.bottom + 20))
+        self.pause_overlay.blit(hint_text, hint_rect)
+        self.pause_box = pause_rect.union(hint_rect)  # part still drawn when overlays go opaque
+
+    def draw_start_menu(self, screen):
+        """draw start menu screen"""
+        if self.settings.quality < OPAQUE_OVERLAYS: screen.blit(self.start_overlay, (0, 0))
+
+        if self.settings.quality < NO_SHADOWS: screen.blit(self.title_shadow, self.title_shadow_rect)
+        screen.blit(self.title_text, self.title_rect)
+        screen.blit(self.subtitle_text, self.subtitle_rect)
+
+        # highest score -- if exists
+        if hasattr(self, 'high_score') and self.high_score > 0:
+            high_score_text = self.game_font.render(f"High Score: {self.high_score}", True, (255, 255, 255))
+            high_score_rect = high_score_text.get_rect(center=(self.settings.width // 2, self.settings.height * 0.45))
+            screen.blit(high_score_text, high_score_rect)
+
+    def draw_pause_overlay(self, screen):
+        """draw pause menu overlay -- only the box at lower quality, no dimming"""
+        if self.settings.quality < OPAQUE_OVERLAYS: screen.blit(self.pause_overlay, (0, 0))
+        else: screen.blit(self.pause_overlay, self.pause_box, self.pause_box)
@@ -1,6 +1,31 @@
 import pygame as pg
+from interface import Button, Widget, get_font
+from governor import OPAQUE_OVERLAYS
 
-class LeaderboardButton:
+class RoundedButton(Button):
+    """button with rounded corners & optional white border -- used by leaderboard screen"""
+    margin = 0
+
+    def __init__(self, x, y, text, width, height, color, font, hover_color=None, clicked_color=None, border=True):
+        self.font = font
+        self.border = border
+        super().__init__(x, y, text, width, height, color)
+        if hover_color or clicked_color:
+            self.hover_col = hover_color or self.hover_col
+            self.click_col = clicked_color or self.click_col
+            self.render_states()
+
+    def render_state(self, color):
+        surface = pg.Surface(self.rect.size, pg.SRCALPHA)
+        pg.draw.rect(surface, color, surface.get_rect(), border_radius=10)
+        if self.border: pg.draw.rect(surface, (255, 255, 255), surface.get_rect(), width=2, border_radius=10) # circular border
+
+        text = self.font.render(self.text, True, self.text_col)
+        surface.blit(text, text.get_rect(center=surface.get_rect().center))
+        return surface
+
+
+class LeaderboardButton(RoundedButton):
     def __init__(self, settings):
         self.settings = settings
 
@@ -14,42 +39,154 @@ class LeaderboardButton:
         self.normal_color = (124, 100, 150)
         self.hover_color = (100, 100, 255)
         self.clicked_color = (80, 80, 200)
-        self.clicked = False
 
-        self.font = pg.font.SysFont('Arial', int(20 * settings.scale_factor))
+        super().__init__(
+            self.button_x, self.button_y, "Leaderboard", self.button_width, self.button_height,
+            self.normal_color, get_font('Arial', int(20 * settings.scale_factor)),
+            self.hover_color, self.clicked_color
+        )
 
     def resize(self, settings):
         """update width & height when Screen Size changes"""
+        self.__init__(settings)
+
+
+class LeaderboardPanel(Widget):
+    """leaderboard screen -- static parts rendered once per size, rows cached & re-rendered only when they change"""
+    row_height = 40
+    row_step = 50
+
+    def __init__(self, settings):
+        super().__init__()
+        self.entries = []
+        self.rows = []  # composed row surfaces -- same order as entries
+        self.scroll = 0
+        self.layout(settings)
+
+    def layout(self, settings):
+        """compute panel geometry & render static parts for current screen size"""
         self.settings = settings
-        self.button_width = int(150 * settings.scale_factor)
-        self.button_height = int(40 * settings.scale_factor)
-        self.font = pg.font.SysFont('Arial', int(20 * settings.scale_factor))
-
-    def draw_button(self, screen):
-        """leaderboard button  & handle clicks"""
-        action = False
-
-        mouse_pos = pg.mouse.get_pos()
-        button_rect = pg.Rect(self.button_x, self.button_y, self.button_width, self.button_height)
-
-        # mouse over and clicked conditions
-        if button_rect.collidepoint(mouse_pos):
-            if pg.mouse.get_pressed()[0] == 1:
-                self.clicked = True
-                pg.draw.rect(screen, self.clicked_color, button_rect, border_radius=10)
-            elif pg.mouse.get_pressed()[0] == 0 and self.clicked == True:
-                self.clicked = False
-                action = True
-            else:
-                pg.draw.rect(screen, self.hover_color, button_rect, border_radius=10)
-        else:
-            pg.draw.rect(screen, self.normal_color, button_rect, border_radius=10)
-
-        # ---------- LEADERBOARD BUTTON ---------- #
-        pg.draw.rect(screen, (255, 255, 255), button_rect, width=2, border_radius=10) # circular border for Leaderboard button
-        
-        text = self.font.render("Leaderboard", True, (255, 255, 255))
-        text_rect = text.get_rect(center=button_rect.center)
-        screen.blit(text, text_rect)
-
-        return action
+        w, h = settings.width, settings.height
+        s = settings.scale_factor
+
+        self.title_font = get_font('Impact', int(50 * s))
+        self.font = get_font('Arial', int(30 * s))
+
+        # semi-transparent background overlay
+        self.overlay = pg.Surface((w, h), pg.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 200))
+
+        # leaderboard panel -- centered
+        self.panel = pg.Surface((w * 0.8, h * 0.8), pg.SRCALPHA)
+        self.panel.fill((40, 40, 60, 230))
+        self.rect = self.panel.get_rect(center=(w // 2, h // 2))
+
+        # title
+        title_text = self.title_font.render("LEADERBOARD", True, (255, 215, 0))
+        title_rect = title_text.get_rect(center=(self.rect.width // 2, 50))
+        self.panel.blit(title_text, title_rect)
+
+        # headers -- | RANK | NAME | SCORE |
+        header_y = title_rect.bottom + 30
+        self.column_width = (self.rect.width - 60) / 3
+        for column, header in enumerate(("RANK", "NAME", "SCORE")):
+            text = self.font.render(header, True, (200, 200, 200))
+            self.panel.blit(text, (self.column_x(column) - text.get_width() / 2, header_y))
+
+        # horizontal line below headers
+        pg.draw.line(self.panel, (200, 200, 200), (30, header_y + 35), (self.rect.width - 30, header_y + 35), 2)
+
+        # -------- CLOSE BUTTON -------- #
+        self.close_button = RoundedButton(
+            self.rect.centerx - 75, self.rect.bottom - 60, "Close", 150, 40, (180, 50, 50),
+            self.font, hover_color=(180, 50, 50), border=False
+        )
+        self.children = [self.close_button]
+
+        # rows scroll inside area between headers & close button
+        top = self.rect.top + header_y + 60
+        self.viewport = pg.Rect(self.rect.left + 30, top, self.rect.width - 60, self.close_button.rect.top - 10 - top)
+
+        # text & row backgrounds depend on font size -- drop all cached rows
+        self.text_cache = {}
+        self.row_backgrounds = []
+        for color in ((60, 60, 80), (80, 80, 100)):
+            background = pg.Surface((self.viewport.width, self.row_height), pg.SRCALPHA)
+            pg.draw.rect(background, color, background.get_rect(), border_radius=5)
+            self.row_backgrounds.append(background)
+
+        entries, self.entries, self.rows = self.entries, [], []
+        self.set_scores(entries)
+
+    def column_x(self, column):
+        """center x of column -- relative to panel"""
+        return self.column_width * (column + 0.5)
+
+    def render_text(self, text, color):
+        """render text once -- reused by every row showing same text"""
+        key = (text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+
+    def render_row(self, index, entry):
+        """compose one row from cached background & text"""
+        row = self.row_backgrounds[index % 2].copy()
+        texts = (
+            self.render_text(f"{index + 1}", (255, 255, 255)),
+            self.render_text(entry["name"], (255, 255, 255)),
+            self.render_text(str(entry["score"]), (255, 215, 0)),
+        )
+        for column, text in enumerate(texts):
+            row.blit(text, (self.column_x(column) - text.get_width() / 2, 5))
+        return row
+
+    def set_scores(self, entries):
+        """update rows from leaderboard entries -- only rows that changed are re-rendered"""
+        if entries == self.entries: return
+
+        rows = []
+        for i, entry in enumerate(entries):
+            unchanged = i < len(self.entries) and self.entries[i] == entry
+            rows.append(self.rows[i] if unchanged else self.render_row(i, entry))
+
+        self.entries = [dict(entry) for entry in entries]
+        self.rows = rows
+
+        # drop text of entries that fell off the board -- kiosk runs for days
+        if len(self.text_cache) > 3 * len(entries) + 16: self.text_cache.clear()
+        self.scroll_by(0) # clamp scroll to new length
+
+    def scroll_by(self, pixels):
+        max_scroll = max(0, len(self.rows) * self.row_step - self.viewport.height)
+        self.scroll = min(max(self.scroll + pixels, 0), max_scroll)
+
+    def handle_event(self, event):
+        if not self.visible: return super().handle_event(event)
+
+        if event.type == pg.MOUSEWHEEL: self.scroll_by(-event.y * self.row_step)
+        elif event.type == pg.KEYDOWN and event.key == pg.K_DOWN: self.scroll_by(self.row_step)
+        elif event.type == pg.KEYDOWN and event.key == pg.K_UP: self.scroll_by(-self.row_step)
+
+        return super().handle_event(event)
+
+    def draw(self, screen):
+        if not self.visible: return
+
+        if self.settings.quality < OPAQUE_OVERLAYS: screen.blit(self.overlay, (0, 0))
+        screen.blit(self.panel, self.rect)
+
+        # blit only rows inside viewport
+        first = self.scroll // self.row_step
+        last = min(len(self.rows), (self.scroll + self.viewport.height) // self.row_step + 1)
+        clip = screen.get_clip()
+        screen.set_clip(self.viewport)
+        y = self.viewport.top + first * self.row_step - self.scroll
+        for row in self.rows[first:last]:
+            screen.blit(row, (self.viewport.left, y))
+            y += self.row_step
+        screen.set_clip(clip)
+
+        self.close_button.draw(screen)
@@ -0,0 +1,158 @@
+"""load generator for the leaderboard server -- submission throughput & top-N read latency
+
+    python code/loadgen.py                                  # starts its own server.py on a free port
+    python code/loadgen.py --url http://127.0.0.1:8707      # or hits one already running
+    python code/loadgen.py --submissions 200000 --connections 32 --pipeline 16 --batch 1
+
+submitters send single-entry POSTs (the shape ScoreSystem.add_score writes) over keep-alive connections, several
+in flight per connection. then top-N reads go one at a time, with & without the ETag. the server's /stats CPU
+seconds give throughput per core -- this process shares the machine with it
+"""
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit
+
+
+def percentile(values, q):
+    """value at fraction q of sorted values"""
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def request(method, path, host, body=None, headers=""):
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n{headers}"
+    if body is None: return (head + "\r\n").encode()
+    return (head + f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def read_response(reader):
+    """(status, headers, body) -- headers lowercased"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if value: headers[name.lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    return int(lines[0].split()[1]), headers, await reader.readexactly(length) if length else b""
+
+
+async def submitter(host, port, count, batch, pipeline, payloads):
+    """count entries in POSTs of batch, pipeline POSTs in flight"""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = 0
+    try:
+        while sent < count:
+            posts = min(pipeline, -(-(count - sent) // batch))
+            for _ in range(posts): writer.write(random.choice(payloads))
+            await writer.drain()
+            for _ in range(posts):
+                status, _, _ = await read_response(reader)
+                if status != 200: raise RuntimeError(f"submission refused: {status}")
+            sent += posts * batch
+    finally:
+        writer.close()
+    return sent
+
+
+async def reads(host, port, count, n):
+    """round trip ms of sequential top-n reads -- (full replies, 304s)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    full, cached = [], []
+    etag = None
+    try:
+        for i in range(count * 2):
+            conditional = i % 2 == 1
+            headers = f"If-None-Match: {etag}\r\n" if conditional else ""
+            start = time.perf_counter()
+            writer.write(request("GET", f"/top?n={n}", host, headers=headers))
+            status, response_headers, _ = await read_response(reader)
+            (cached if conditional else full).append((time.perf_counter() - start) * 1000)
+            etag = response_headers.get("etag")
+            if status != (304 if conditional else 200): raise RuntimeError(f"unexpected {status} for top read")
+    finally:
+        writer.close()
+    return sorted(full), sorted(cached)
+
+
+async def stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(request("GET", "/stats", host))
+    _, _, body = await read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+async def run(host, port, args):
+    # payloads made up front -- generating them would be most of this process's work
+    rng = random.Random(args.seed)
+    payloads = []
+    for _ in range(256):
+        entries = [{"name": f"player{rng.randrange(10000)}", "score": int(rng.expovariate(1 / 40))} for _ in range(args.batch)]
+        body = json.dumps(entries[0] if args.batch == 1 else {"scores": entries}).encode()
+        payloads.append(request("POST", "/scores", host, body))
+
+    before = await stats(host, port)
+    start = time.perf_counter()
+    per_connection = -(-args.submissions // args.connections)
+    sent = sum(await asyncio.gather(*(
+        submitter(host, port, per_connection, args.batch, args.pipeline, payloads) for _ in range(args.connections)
+    )))
+    elapsed = time.perf_counter() - start
+    after = await stats(host, port)
+    cpu = after["cpu_seconds"] - before["cpu_seconds"]
+
+    print(f"submissions: {sent:,} in {elapsed:.2f}s -- {sent / elapsed:,.0f}/s wall, "
+          f"{sent / cpu:,.0f}/s per server CPU second ({cpu:.2f}s CPU, {args.connections} connections, "
+          f"{args.pipeline} in flight, {args.batch} per POST)")
+    print(f"  server holds {after['entries']:,} entries")
+
+    full, cached = await reads(host, port, args.reads, args.top)
+    for name, values in ((f"top {args.top} read", full), ("  same, 304", cached)):
+        print(f"{name:<14} ms  median {percentile(values, 0.5):.3f}  p99 {percentile(values, 0.99):.3f}  "
+              f"max {values[-1]:.3f}  ({len(values)} round trips)")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="leaderboard server load generator")
+    parser.add_argument("--url", default=None, help="server to hit -- default starts one (no score log)")
+    parser.add_argument("--submissions", type=int, default=100000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=8, help="POSTs in flight per connection")
+    parser.add_argument("--batch", type=int, default=1, help="entries per POST -- sync.py batches queued scores")
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        port = free_port()
+        server = subprocess.Popen([sys.executable, __file__.replace("loadgen.py", "server.py"), "--host", "127.0.0.1",
+                                   "--port", str(port), "--log", ""], stdout=subprocess.PIPE, text=True)
+        server.stdout.readline() # listening
+        host = "127.0.0.1"
+    else:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+
+    try: asyncio.run(run(host, port, args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,195 @@
+"""entry point -- plays the game, or runs it bounded / headless / scripted for CI & profiling
+
+    python code/main.py
+    python code/main.py --size large --fps 60
+    python code/main.py --pacing busy --bench  # steadiest frame intervals for a full core -- jitter printed at exit
+    python code/main.py --adaptive-quality  # drawing quality steps down while frames run late (see governor.py)
+    python code/main.py --headless --bot --seed 7 --frames 20000 --uncapped --bench
+    python code/main.py --ai                # trained network plays (see trainer.py)
+    python code/main.py --autopilot         # attract mode -- search based autopilot starts & flies runs
+
+headless & uncapped runs spawn pipes & flap on frame counts instead of wall clock timers, so a seed gives the
+same runs at any speed. a windowed game checkpoints the run in progress to data/session.ckpt & starts paused in
+that run after a crash -- Resume carries on, Main Menu drops it
+"""
 import pygame as pg
 import sys
 import os
+import argparse
+import statistics
 from settings import Settings
 from game import Game
+import audio
+import resources
+from metrics import MetricsServer
+from checkpoint import read_checkpoint, restore
+from trainer import NeuralPlayer
+from autopilot import Autopilot
+from blitaudit import BlitAudit
+from pacing import MODES
+from governor import LEVEL_NAMES
+from simulation import flap_through_gaps
+
+
+class FrameTimers:
+    """pipe spawn & flap events posted on frame counts, game clock advanced one frame per frame"""
+    def __init__(self, game):
+        settings = game.settings
+        pg.time.set_timer(settings.SPAWNPIPE, 0)
+        pg.time.set_timer(settings.BIRDFLAP, 0)
+        pg.event.clear((settings.SPAWNPIPE, settings.BIRDFLAP)) # any a wall clock timer already queued
+        self.spawn_frames = max(1, round(settings.pipe_spawn_time * settings.FPS / 1000))
+        self.flap_frames = max(1, round(settings.bird_flap_time * settings.FPS / 1000))
+        self.fps = settings.FPS
+        self.frame = 0
+        game.now = self.now
+
+    def now(self):
+        return self.frame / self.fps
+
+    def __call__(self, game):
+        if self.frame % self.spawn_frames == 0: pg.event.post(pg.event.Event(game.settings.SPAWNPIPE))
+        if self.frame % self.flap_frames == 0: pg.event.post(pg.event.Event(game.settings.BIRDFLAP))
+        self.frame += 1
+
+
+class Bot:
+    """scripted player -- starts a new run whenever there's none & flaps when below middle of next gap"""
+    def __init__(self, game):
+        game.controller = flap_through_gaps
+        self.runs = 0  # runs started
+        self.scores = []
+
+    def __call__(self, game):
+        if game.countdown_active or game.game_active: return
+        if not game.in_start_menu: self.scores.append(game.score_system.score) # run just ended
+        game.in_start_menu = False
+        game.restart_game()
+        self.runs += 1
+
+
+
+def percentile(values, q):
+    """q in [0, 1] of sorted values -- nearest rank"""
+    return values[min(len(values) - 1, int(len(values) * q))]
+
 
+def bench_report(frame_log, fps):
+    """frame time statistics of a run -- list of lines"""
+    if not frame_log: return ["bench: no frames"]
+    budget = 1000 / fps
+    work = sorted(w for w, _ in frame_log)
+    frames = sorted(f for _, f in frame_log)
+    total = sum(frames) / 1000
+    late = sum(1 for w in work if w > budget)
 
-def main():
+    lines = [f"bench: {len(frame_log)} frames in {total:.2f}s -- {len(frame_log) / total:.1f} fps (target {fps})"]
+    for name, values in (("work", work), ("frame", frames)):
+        lines.append(
+            f"  {name + ' ms':<9} mean {statistics.fmean(values):7.3f}  median {percentile(values, 0.5):7.3f}  "
+            f"p95 {percentile(values, 0.95):7.3f}  p99 {percentile(values, 0.99):7.3f}  max {values[-1]:7.3f}"
+        )
+    lines.append(f"  over {budget:.2f} ms budget: {late} frames ({late / len(frame_log):.2%})")
+    return lines
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Flappy Bird")
+    parser.add_argument("--headless", action="store_true", help="dummy video & audio drivers -- no window, no sound")
+    bound = parser.add_mutually_exclusive_group()
+    bound.add_argument("--frames", type=int, default=None, help="quit after N frames")
+    bound.add_argument("--seconds", type=float, default=None, help="quit after S seconds of wall time")
+    parser.add_argument("--seed", type=int, default=None, help="fixed seed for pipe layouts")
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument("--fps", type=int, default=None, help="frame rate target (game speed is per frame)")
+    rate.add_argument("--uncapped", action="store_true", help="don't wait between frames")
+    parser.add_argument("--pacing", choices=MODES, default=None,
+                        help="frame wait -- tick sleeps (least CPU, default), busy spins, hybrid sleeps then spins, vsync waits for the display")
+    parser.add_argument("--size", choices=("small", "medium", "large"), default=None)
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="step drawing quality down while frames run late & back up with headroom")
+    parser.add_argument("--bot", action="store_true", help="scripted player starts runs & flies through gaps")
+    parser.add_argument("--ai", nargs="?", const=True, default=None, metavar="FILE",
+                        help="trained network flies the bird -- bundled one, or FILE from trainer.py")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="attract mode -- planner flies the bird within a per frame CPU budget, runs start by themselves")
+    parser.add_argument("--bench", action="store_true", help="print frame time statistics at exit")
+    parser.add_argument("--audit-blits", action="store_true",
+                        help="time every drawing op & flag surfaces on slow blit paths -- report at exit (slows frames)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    parser.add_argument("--leaderboard-url", default=None, help="global leaderboard server, e.g. http://host:8707")
+    parser.add_argument("--run-log", default=None, help="per-run analytics log (default data/runs.log, off when headless)")
+    parser.add_argument("--archive", default=None, help="run archive (default data/runs.archive, off when headless)")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default data/session.ckpt, off when headless)")
+    parser.add_argument("--no-resume", action="store_true", help="start fresh even if a checkpointed run is there")
+    return parser.parse_args(argv)
+
+
+def make_game(args):
+    """settings from command line, the game & its bot (None without --bot) -- pygame initialized"""
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    audio.pre_init() # low latency mixer -- must come before pg.init
     pg.init()     # initialize pygame
 
     settings = Settings() # create game settings
+    if args.seed is not None: settings.seed = args.seed
+    if args.fps is not None: settings.FPS = args.fps
+    settings.uncapped = args.uncapped
+    if args.pacing: settings.pacing = args.pacing
+    if args.size: settings.update_screen_size(args.size)
+    if args.adaptive_quality: settings.adaptive_quality = True
+    if args.metrics_port is not None: settings.metrics_port = args.metrics_port
+    if args.leaderboard_url: settings.leaderboard_url = args.leaderboard_url
+    settings.run_log_file = args.run_log or (None if args.headless else resources.data_path("runs.log"))
+    settings.archive_file = args.archive or (None if args.headless else resources.data_path("runs.archive"))
+    settings.checkpoint_file = args.checkpoint or (None if args.headless else resources.data_path("session.ckpt"))
+
+    os.makedirs(resources.DATA_DIR, exist_ok=True) # make sure data dir exists
+
+    # run left by a crash -- read before Game's checkpointer can start the file over
+    snapshot = read_checkpoint(settings.checkpoint_file) if settings.checkpoint_file and not args.no_resume else None
+
+    game = Game(settings)  # create obj game
+
+    bot = Bot(game) if args.bot or args.autopilot else None
+    if args.ai: game.controller = NeuralPlayer.load(None if args.ai is True else args.ai) # --bot still starts runs
+    if args.autopilot: game.controller = Autopilot(settings, settings.autopilot_budget)
+    if snapshot:
+        restore(game, snapshot)
+        if bot: game.game_paused = False # nobody to press Resume
+        print(f"resumed run from checkpoint -- score {snapshot.score}, frame {snapshot.run_frame}")
+    hooks = [hook for hook in (FrameTimers(game) if args.headless or args.uncapped else None, bot) if hook]
+    if hooks:
+        def on_frame(game):
+            for hook in hooks: hook(game)
+        game.on_frame = on_frame
+
+    if args.bench: game.frame_log = []
+    return game, bot
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    game, bot = make_game(args)
+
+    if game.settings.metrics_port: MetricsServer(port=game.settings.metrics_port).start() # background thread
+    audit = BlitAudit(game) if args.audit_blits else None
 
-    os.makedirs("data", exist_ok=True) # make sure data dir exists
-    
-    game = Game(settings)  # create obj game and run it
-    game.run()
+    game.run(args.frames, args.seconds)
 
+    if args.bench:
+        print("\n".join(bench_report(game.frame_log, game.settings.FPS)))
+        print("  " + game.pacer.report())
+        if game.governor: print(f"  quality: ended at level {game.settings.quality} ({LEVEL_NAMES[game.settings.quality]})")
+        if bot and bot.scores: print(f"  bot: {len(bot.scores)} runs finished, scores {bot.scores}")
+        if isinstance(game.controller, Autopilot): print("  " + game.controller.report())
+        if game.capture:
+            game.capture.close() # ring drained -- counts are final
+            print("  " + game.capture.report())
+    if audit: print("\n".join(audit.report()))
     pg.quit()
     sys.exit()
 
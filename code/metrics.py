@@ -0,0 +1,138 @@
+"""Prometheus metrics for a running game -- served from a background thread on localhost
+
+hot path (Game.run, PipeManager, ScoreSystem) only bumps numbers in preallocated arrays --
+no locks, no new containers. the scrape thread reads them as they are; a scrape may see
+a histogram mid-update, which Prometheus tolerates
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = array('Q', [0])
+
+    def inc(self, amount=1):
+        self.value[0] += amount
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter", f"{self.name} {self.value[0]}"]
+
+
+class Gauge:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = array('d', [0.0])
+
+    def set(self, value):
+        self.value[0] = value
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.value[0]:g}"]
+
+
+class Histogram:
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(buckets))
+        self.counts = array('Q', [0] * (len(self.bounds) + 1))  # last slot is +Inf
+        self.total = array('d', [0.0])
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total[0] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        counts = self.counts.tolist() # copy first -- main thread keeps writing
+        cumulative = 0
+        for bound, count in zip(self.bounds + ("+Inf",), counts):
+            cumulative += count
+            le = bound if bound == "+Inf" else f"{bound:g}"
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {self.total[0]:g}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class GameMetrics:
+    """all metrics exported by the game"""
+    def __init__(self):
+        self.frame_time = Histogram(
+            "flappy_frame_time_seconds", "Time between presented frames.",
+            (0.005, 0.0125, 0.01667, 0.025, 0.033, 0.05, 0.1, 0.25, 1.0)
+        )
+        self.dropped_frames = Counter("flappy_dropped_frames_total", "Frames missed against the FPS target.")
+        self.pipes_alive = Gauge("flappy_pipes_alive", "Pipes currently held by PipeManager.")
+        self.runs_started = Counter("flappy_runs_started_total", "Runs started.")
+        self.runs_finished = Counter("flappy_runs_finished_total", "Runs finished by a collision.")
+        self.score = Histogram("flappy_run_score", "Score of finished runs.", (0, 1, 2, 5, 10, 20, 50, 100, 200))
+        self.quality_level = Gauge("flappy_quality_level", "Drawing quality level picked by the governor, 0 is full quality.")
+        self.capture_dropped = Counter("flappy_capture_dropped_frames_total", "Frames frame capture dropped because its writer fell behind.")
+        self.leaderboard_write = Histogram(
+            "flappy_leaderboard_write_seconds", "Latency of writing the leaderboard file.",
+            (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+        )
+
+    def record_frame(self, frame_ms, fps):
+        """interval between presented frames in ms -- frames longer than 1.5 budgets count the missed ones as dropped"""
+        self.frame_time.observe(frame_ms / 1000)
+        budget = 1000 / fps
+        if frame_ms > budget * 1.5: self.dropped_frames.inc(round(frame_ms / budget) - 1)
+
+    def render(self):
+        lines = []
+        for metric in (self.frame_time, self.dropped_frames, self.pipes_alive, self.runs_started,
+                       self.runs_finished, self.score, self.quality_level, self.capture_dropped, self.leaderboard_write):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+game_metrics = GameMetrics()
+
+
+class MetricsServer:
+    """tiny /metrics endpoint on a daemon thread"""
+    def __init__(self, registry=game_metrics, port=9100, host="127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # keep console clean -- scraped every few seconds
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1] # real port if 0 was asked for
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,93 @@
+"""frame pacing -- waits out the rest of each frame's budget so frames go up at an even interval
+
+    tick     pygame Clock.tick -- sleeps in whole milliseconds, cheapest, intervals wobble by a ms or two. the default --
+             the others spend CPU for evenness, which operators opt into
+    busy     Clock.tick_busy_loop -- spins the whole wait, steadiest, one core flat out
+    hybrid   sleeps until spin_margin before the deadline, spins the rest -- near busy's evenness at little CPU
+    vsync    display made with vsync (SCALED surface / renderer vsync), present waits for the refresh --
+             no wait here, hybrid if the display couldn't get vsync. frames come at the monitor's rate & the
+             game's speed is per frame, so FPS should match it
+
+tick & busy count each frame from the end of the last wait. hybrid keeps an absolute schedule instead -- a frame
+that woke late is made up by a shorter next wait, so the average interval stays on the budget. falling behind by
+more than a frame starts the schedule over rather than rushing frames out to catch up.
+
+intervals between frames are counted in a jitter histogram (|interval - budget|, JITTER_BIN wide bins) -- fixed
+size however long a kiosk runs. report() gives its percentiles & the CPU share the process used meanwhile. uncapped
+frames have no budget, so the histogram holds the raw intervals & the report gives frame time percentiles
+"""
+import time
+import pygame as pg
+from array import array
+
+MODES = ("tick", "busy", "hybrid", "vsync")
+JITTER_BIN = 0.05  # ms
+JITTER_BINS = 2000  # up to 100 ms -- anything later goes in the last bin
+
+
+class Pacer:
+    def __init__(self, settings):
+        if settings.pacing not in MODES: raise ValueError(f"pacing must be one of {MODES}, got {settings.pacing!r}")
+        self.mode = settings.pacing
+        self.fps = settings.FPS
+        self.uncapped = settings.uncapped
+        self.interval = 1 / settings.FPS
+        self.spin_margin = settings.spin_margin
+        self.clock = pg.time.Clock()
+        self.deadline = None  # hybrid -- when the current frame is due to end
+        self.vsync = False  # display really waits for the refresh -- set from the backend, hybrid stands in if not
+
+        # stats -- uncapped there's no budget to be off from, raw frame intervals are counted instead
+        self.target = 0.0 if self.uncapped else self.interval
+        self.jitter = array('Q', bytes(8 * JITTER_BINS))
+        self.frames = 0
+        self.last = None  # end of last wait
+        self.started = None  # wall & CPU time of the first frame
+
+    def wait(self):
+        """end of a frame -- returns once its budget is used up"""
+        if self.uncapped: pass
+        elif self.mode == "tick": self.clock.tick(self.fps)
+        elif self.mode == "busy": self.clock.tick_busy_loop(self.fps)
+        elif self.mode == "hybrid" or not self.vsync: self.hybrid()
+        self.record(time.perf_counter())
+
+    def hybrid(self):
+        now = time.perf_counter()
+        if self.deadline is None or now > self.deadline + self.interval: self.deadline = now # start over
+        self.deadline += self.interval
+        rest = self.deadline - now - self.spin_margin
+        if rest > 0: time.sleep(rest)
+        while time.perf_counter() < self.deadline: pass
+
+    def record(self, now):
+        if self.last is None: self.started = (now, time.process_time())
+        else:
+            off = abs((now - self.last) - self.target) * 1000
+            self.jitter[min(int(off / JITTER_BIN), JITTER_BINS - 1)] += 1
+            self.frames += 1
+        self.last = now
+
+    # -------- stats -------- #
+
+    def percentile(self, q):
+        """jitter ms (frame ms uncapped) at fraction q of the recorded intervals -- upper edge of its bin"""
+        target = min(self.frames - 1, int(self.frames * q))
+        seen = 0
+        for i, count in enumerate(self.jitter):
+            seen += count
+            if seen > target: return (i + 1) * JITTER_BIN
+        return JITTER_BINS * JITTER_BIN
+
+    def cpu_share(self):
+        """CPU seconds the process used per wall second since the first frame"""
+        if self.started is None or self.last == self.started[0]: return 0.0
+        return (time.process_time() - self.started[1]) / (self.last - self.started[0])
+
+    def report(self):
+        if not self.frames: return "pacing: no frames"
+        fps = self.frames / (self.last - self.started[0])
+        worst = next(i for i in range(JITTER_BINS - 1, -1, -1) if self.jitter[i])
+        return (f"pacing {self.mode}{' (uncapped)' if self.uncapped else ''}: {fps:.1f} fps, {'frame' if self.uncapped else 'jitter'} ms  p50 "
+                f"{self.percentile(0.5):.2f}  p95 {self.percentile(0.95):.2f}  p99 {self.percentile(0.99):.2f}  "
+                f"max {(worst + 1) * JITTER_BIN:.2f}  -- CPU {self.cpu_share():.0%}")
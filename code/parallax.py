@@ -0,0 +1,96 @@
+"""parallax layers -- horizontally scrolling strips drawn back to front, each at its own speed
+
+a moving layer tiles its image once into a strip at least a screen wide. its offset into the strip is kept in
+1/SUBPIXELS of a pixel, grows by speed every frame & wraps at the strip width -- slow layers still creep along at
+small sizes instead of rounding to a standstill, & never drift the way a summed float would. a frame draws the
+strip from the offset to its end & the start of it after that: two slices, never more than a screen width of
+pixels. static layers behind the first moving one are composited once into a backdrop -- one blit per frame
+however many there are
+"""
+import math
+import pygame as pg
+
+SUBPIXELS = 256  # offset steps per pixel
+
+
+class Layer:
+    """one strip -- y is its top, speed in pixels per frame (0 is static)"""
+    def __init__(self, image, y=0, speed=0.0):
+        self.image = image
+        self.y = y
+        self.speed = speed
+        self.step = round(speed * SUBPIXELS)
+        self.position = 0  # strip x at the left edge of the screen, in subpixels
+        self.strip = None
+        self.slices = (pg.Rect(0, 0, 0, 0), pg.Rect(0, 0, 0, 0))  # reused every frame
+
+    def tile(self, width):
+        """strip of whole tiles covering width -- the image itself if one does"""
+        tile_width, height = self.image.get_size()
+        tiles = max(1, math.ceil(width / tile_width))
+        if tiles == 1: self.strip = self.image
+        else:
+            self.strip = pg.Surface((tiles * tile_width, height), pg.SRCALPHA)
+            self.strip.blits([(self.image, (i * tile_width, 0)) for i in range(tiles)], False)
+        self.width = width
+        self.period = self.strip.get_width() * SUBPIXELS
+        self.position %= self.period
+
+    @property
+    def offset(self):
+        """strip x at the left edge of the screen, pixels"""
+        return self.position / SUBPIXELS
+
+    @offset.setter
+    def offset(self, x):
+        self.position = round(x * SUBPIXELS) % self.period
+
+    def scroll(self):
+        self.position = (self.position + self.step) % self.period
+
+    def describe(self, scene):
+        """strip from the offset on, then from its start where that runs out"""
+        start = self.position // SUBPIXELS
+        first, second = self.slices
+        first.update(start, 0, min(self.strip.get_width() - start, self.width), self.strip.get_height())
+        scene.image(self.strip, (0, self.y), first)
+        if first.width < self.width:
+            second.update(0, 0, self.width - first.width, first.height)
+            scene.image(self.strip, (first.width, self.y), second)
+
+
+class Parallax:
+    """layers of one screen size, back to front"""
+    def __init__(self, size):
+        self.size = size
+        self.layers = []
+        self.behind = 0  # leading static layers -- what the backdrop holds
+        self.backdrop = None
+        self.front = []  # layers drawn every frame
+
+    def add(self, image, y=0, speed=0.0):
+        layer = Layer(image, y, speed)
+        layer.tile(self.size[0])
+        self.layers.append(layer)
+        self.behind = next((i for i, each in enumerate(self.layers) if each.speed), len(self.layers))
+        self.front = self.layers[self.behind:]
+        self.backdrop = None
+        return layer
+
+    def update(self):
+        for layer in self.front: layer.scroll()
+
+    def composite(self):
+        """backdrop from the leading static layers -- opaque & RLE encoded: blitted as one run per row through the
+        cache. a plain opaque surface goes up with streaming stores that leave the frame cold for every sprite after"""
+        self.backdrop = pg.Surface(self.size, pg.SRCALPHA).convert_alpha()
+        self.backdrop.fill((0, 0, 0, 255))
+        for layer in self.layers[:self.behind]: self.backdrop.blit(layer.image, (0, layer.y))
+        self.backdrop.set_alpha(255, pg.RLEACCEL)
+
+    def describe(self, scene):
+        if self.backdrop is None: self.composite()
+        scene.image(self.backdrop, (0, 0))
+        for layer in self.front:
+            if layer.speed: layer.describe(scene)
+            else: scene.image(layer.image, (0, layer.y))
@@ -1,5 +1,6 @@
 import pygame as pg
 import random
+import resources
 
 class PipeManager:
     def __init__(self, settings):
@@ -9,6 +10,9 @@ class PipeManager:
         self.pipes = []
         self.passed_pipes = []
 
+        # own rng -- seeded per run so a replay gets the same pipe heights
+        self.rng = random.Random()
+
         # load images
         self.load_pipe_image()
 
@@ -21,9 +25,10 @@ class PipeManager:
 
     def load_pipe_image(self):
         """laod & SCALE pipe img"""
-        self.pipe_image = pg.image.load("assets/img/pipe.png").convert_alpha()
+        self.pipe_image = resources.image("img/pipe.png")
         self.pipe_image.set_colorkey(self.settings.WHITE)
         self.pipe_image = pg.transform.scale2x(self.pipe_image)
+        self.sprites = {}  # pipe size -> (bottom, top) images -- scaled once, not per pipe per frame
 
     def resize(self, settings):
         """update pipe manager if new Screen Size selected"""
@@ -43,20 +48,19 @@ class PipeManager:
 
     def create_pipe_pair(self):
         """create pair of top & bottom pipes"""
-        random_pipe_pos = random.choice(self.pipe_heights)
+        random_pipe_pos = self.rng.choice(self.pipe_heights)
         pipe_gap = self.settings.height // 3  # gap between pipes scales with screen height
 
-        # scale pipe size based on screen size
-        pipe_scaled = pg.transform.scale(
-            self.pipe_image,
-            (
-                int(self.pipe_image.get_width() * self.settings.width / self.settings.SCREEN_SIZES["medium"][0]),
-                int(self.pipe_image.get_height() * self.settings.height / self.settings.SCREEN_SIZES["medium"][1])
-            )
+        # scale pipe size based on screen size -- only the rect is needed, draw() scales the image
+        pipe_size = (
+            int(self.pipe_image.get_width() * self.settings.width / self.settings.SCREEN_SIZES["medium"][0]),
+            int(self.pipe_image.get_height() * self.settings.height / self.settings.SCREEN_SIZES["medium"][1])
         )
 
-        bottom_pipe = pipe_scaled.get_rect(midtop=(self.settings.width + 100, random_pipe_pos))
-        top_pipe = pipe_scaled.get_rect(midbottom=(self.settings.width + 100, random_pipe_pos - pipe_gap))
+        bottom_pipe = pg.Rect((0, 0), pipe_size)
+        bottom_pipe.midtop = (self.settings.width + 100, random_pipe_pos)
+        top_pipe = pg.Rect((0, 0), pipe_size)
+        top_pipe.midbottom = (self.settings.width + 100, random_pipe_pos - pipe_gap)
 
         return bottom_pipe, top_pipe
 
@@ -66,20 +70,24 @@ class PipeManager:
 
     def move_pipes(self):
         """moving pipes from right to left -- towards the bird (player)"""
-        speed_factor = self.settings.scale_factor
-        for pipe in self.pipes: pipe.centerx -= 5 * speed_factor
+        shift = self.pipe_shift()
+        for pipe in self.pipes: pipe.centerx -= shift
 
         # limit the number of pipes for better performance // fixing the bugs
         if len(self.pipes) > 8:
             self.pipes = self.pipes[-8:]
+            self.passed_pipes = [pipe for pipe in self.passed_pipes if pipe in self.pipes] # dropped pipes must not stay in passed list forever
+
+    def pipe_shift(self):
+        """pixels pipes move left each frame"""
+        return 5 * self.settings.scale_factor
 
     def remove_offscreen_pipes(self):
         """remove pipes that have moved off screen // fixing the problem of game slowing down due to 'overflow' of pipes in the array"""
-        pipes_copy = self.pipes.copy()
-        for pipe in pipes_copy:
-            if pipe.centerx <= -100: # fixed from <100 to <=
-                self.pipes.remove(pipe)
-                if pipe in self.passed_pipes: self.passed_pipes.remove(pipe)
+        # pipes are in spawn order & move at same speed -- off-screen ones are always at the front, no list copy per frame
+        while self.pipes and self.pipes[0].centerx <= -100: # fixed from <100 to <=
+            pipe = self.pipes.pop(0)
+            if pipe in self.passed_pipes: self.passed_pipes.remove(pipe)
 
     def check_score(self, bird_x):
         """check if bird passed a pipe to score a point"""
@@ -95,17 +103,25 @@ class PipeManager:
             if bird_rect.colliderect(pipe): return True
         return False
 
+    def pipe_sprites(self, size):
+        """pipe image scaled to size & flipped copy for top pipes"""
+        sprites = self.sprites.get(size)
+        if sprites is None:
+            bottom = pg.transform.scale(self.pipe_image, size)
+            sprites = (bottom, pg.transform.flip(bottom, False, True))
+            self.sprites[size] = sprites
+        return sprites
+
     def draw(self, screen):
         """draw all pipes"""
         for pipe in self.pipes:
-            if pipe.bottom >= self.settings.height: # bottom pipe
-                screen.blit(pg.transform.scale(self.pipe_image, (pipe.width, pipe.height)), pipe)
-            else: # top -- flipped image
-                flip_pipe = pg.transform.flip(
-                    pg.transform.scale(self.pipe_image, (pipe.width, pipe.height)),
-                    False, True
-                )
-                screen.blit(flip_pipe, pipe)
+            bottom, top = self.pipe_sprites(pipe.size)
+            if pipe.bottom >= self.settings.height: screen.blit(bottom, pipe) # bottom pipe
+            else: screen.blit(top, pipe) # top -- flipped image
+
+    def describe(self, scene):
+        """pipes for a drawing backend -- scaling & flipping of top pipes left to the backend"""
+        for pipe in self.pipes: scene.sprite(self.pipe_image, pipe, None, pipe.bottom < self.settings.height)
 
     def reset(self):
         """clear all pipes"""
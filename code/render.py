@@ -0,0 +1,231 @@
+"""offline replay rendering -- recorded runs drawn frame by frame with the game's own drawing code
+
+    python code/render.py data/leaderboard.json --out renders --format png
+    python code/render.py submissions.jsonl --format raw --chunk 240 --workers 8
+
+every run is split into chunks of frames and chunks are rendered on a process pool. each run is first played once
+with Game.update (no drawing) & checkpointed at every chunk start (see checkpoint.py) -- a chunk resumes from its
+checkpoint, so any chunk renders the same pixels no matter which process gets it & a run costs one pass however
+it's chunked. png frames are numbered per run, raw chunks are stitched into one capture file per run (see capture.py)
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+_renderers = {}  # per process -- one headless Game per screen size
+_scratch = None  # per process -- directory for the renderers' empty leaderboards, removed by render_replays
+
+
+class ReplayRenderer:
+    """drives a headless Game through a replay -- same update & draw code as a live run"""
+    def __init__(self, screen):
+        import pygame as pg
+        from simulation import make_game
+
+        self.game = make_game(screen, start=False)
+        settings = self.game.settings
+
+        # no timers -- spawns come from the replay, flaps on a fixed frame count
+        pg.time.set_timer(settings.SPAWNPIPE, 0)
+        pg.time.set_timer(settings.BIRDFLAP, 0)
+        self.flap_frames = max(1, round(settings.bird_flap_time * settings.FPS / 1000))
+
+    def start(self, replay):
+        """put game at start of replay's run"""
+        game = self.game
+        game.in_start_menu = False
+        game.countdown_active = False
+        game.show_leaderboard = False
+        game.show_size_menu = False
+        game.floor_pos = 0
+        game.bird.bird_index = 0
+        game.bird.image = game.bird.bird_frames[0]
+        game.score_system.high_score = 0
+        game.restart_game()
+        game.pipe_manager.rng.seed(replay["seed"])
+        game.recorder.start(replay["seed"], game.recorder.screen) # logged like a live run -- checkpoints carry it
+
+        self.jumps = set(replay["jumps"])
+        self.spawns = Counter(replay["spawns"])
+        self.frame = 0
+
+    def advance(self):
+        """one gameplay frame -- same order as Game.step"""
+        game, frame = self.game, self.frame
+        for _ in range(self.spawns.get(frame, 0)):
+            game.pipe_manager.spawn_pipe()
+            game.recorder.spawn(game.run_frame)
+        if frame % self.flap_frames == 0: game.bird.flap_animation()
+        if frame in self.jumps and game.game_active:
+            game.bird.jump()
+            game.recorder.jump(game.run_frame)
+        game.update()
+        self.frame += 1
+
+    def checkpoints(self, replay, starts):
+        """play replay once without drawing -- (frame, state) at each of the sorted start frames"""
+        from checkpoint import encode
+        self.start(replay)
+        states = []
+        for start in starts:
+            while self.frame < start: self.advance()
+            game = self.game
+            messages = [(message.x, message.y, message.lifetime) for message in game.score_system.score_messages]
+            layers = [layer.position for layer in game.parallax.layers]
+            states.append((start, (encode(game, 0, 0), messages, layers)))
+        return states
+
+    def resume(self, replay, frame, state):
+        """put game back at a checkpointed frame of replay -- what checkpoint.restore leaves out too"""
+        from checkpoint import decode, restore
+        from score_system import ScoreMessage
+        payload, messages, layers = state
+        self.start(replay)
+        game = self.game
+        restore(game, decode(payload, [], []))
+        game.game_paused = False
+        game.score_system.score_messages = [ScoreMessage(x, y, lifetime) for x, y, lifetime in messages]
+        for layer, position in zip(game.parallax.layers, layers): layer.position = position
+        self.frame = frame
+
+    def render(self, replay, start, end, state=None):
+        """yield screen after each update in [start, end) -- from the checkpoint of start if there is one"""
+        if state is not None: self.resume(replay, start, state)
+        else: self.start(replay)
+        while self.frame < start: self.advance()
+        while self.frame < end:
+            self.advance()
+            self.game.draw()
+            yield self.frame - 1, self.game.backend.frame()
+
+
+def get_renderer(screen):
+    renderer = _renderers.get(screen)
+    if renderer is None:
+        renderer = ReplayRenderer(screen)
+        _renderers[screen] = renderer
+    # own empty leaderboard -- game over screen mustn't depend on local high scores
+    name = f"leaderboard-{os.getpid()}-{'x'.join(map(str, screen))}.json"
+    renderer.game.score_system.leaderboard_file = os.path.join(_scratch, name)
+    return renderer
+
+
+def init_worker(scratch):
+    global _scratch
+    import pygame as pg
+    from simulation import init_headless
+    init_headless()
+    pg.font.init()
+    _scratch = scratch
+
+
+def plan_run(job):
+    """checkpoints of one run at its chunk starts -- returns (run, [(start, state)])"""
+    run, replay, starts = job
+    return run, get_renderer(tuple(replay["screen"])).checkpoints(replay, starts)
+
+
+def render_chunk(job):
+    """render frames [start, end) of one run -- returns (run, start, frames written)"""
+    import pygame as pg
+    from capture import FILE_HEADER, FRAME_HEADER, MAGIC
+
+    run, replay, start, end, out, fmt, state = job
+    renderer = get_renderer(tuple(replay["screen"]))
+    run_dir = os.path.join(out, run)
+    os.makedirs(run_dir, exist_ok=True)
+
+    written = 0
+    if fmt == "png":
+        for frame, screen in renderer.render(replay, start, end, state):
+            pg.image.save(screen, os.path.join(run_dir, f"frame_{frame:06d}.png"))
+            written += 1
+    else:
+        with open(os.path.join(run_dir, f"chunk_{start:08d}.cap"), 'wb') as file:
+            for frame, screen in renderer.render(replay, start, end, state):
+                if written == 0: file.write(FILE_HEADER.pack(MAGIC, screen.get_bytesize(), 0, *screen.get_masks()))
+                pixels = screen.get_view('0')
+                file.write(FRAME_HEADER.pack(frame, frame / renderer.game.settings.FPS, *screen.get_size(), screen.get_pitch(), pixels.length))
+                file.write(pixels)
+                del pixels
+                written += 1
+    return run, start, written
+
+
+def stitch(run_dir, path):
+    """join raw chunks of a run into one capture file -- header of first chunk kept, rest dropped"""
+    from capture import FILE_HEADER
+    chunks = sorted(name for name in os.listdir(run_dir) if name.startswith("chunk_"))
+    with open(path, 'wb') as output:
+        for i, name in enumerate(chunks):
+            with open(os.path.join(run_dir, name), 'rb') as chunk:
+                if i > 0: chunk.seek(FILE_HEADER.size)
+                shutil.copyfileobj(chunk, output, 1 << 20)
+            os.remove(os.path.join(run_dir, name))
+    os.rmdir(run_dir)
+
+
+def make_jobs(replays, out, fmt, chunk, states=None):
+    """(run name, replay, start, end, out, format, checkpoint) per chunk -- checkpoints from plan_run, else None"""
+    jobs = []
+    for i, replay in enumerate(replays):
+        run, frames = f"run_{i:03d}", int(replay["frames"])
+        planned = dict(states.get(run, ())) if states else {}
+        for start in range(0, frames, chunk):
+            jobs.append((run, replay, start, min(frames, start + chunk), out, fmt, planned.get(start)))
+    return jobs
+
+
+def render_replays(replays, out, fmt="png", chunk=240, workers=None):
+    """render all replays -- returns frames written"""
+    plans = [(f"run_{i:03d}", replay, list(range(chunk, int(replay["frames"]), chunk))) for i, replay in enumerate(replays)]
+    plans = [plan for plan in plans if plan[2]] # one chunk runs start to end anyway
+    chunks = sum(-(-int(replay["frames"]) // chunk) for replay in replays)
+
+    with tempfile.TemporaryDirectory(prefix="render-") as scratch:
+        if workers == 1 or chunks == 1:
+            init_worker(scratch)
+            states = dict(map(plan_run, plans))
+            results = [render_chunk(job) for job in make_jobs(replays, out, fmt, chunk, states)]
+        else:
+            # spawn -- forking a process that already runs SDL is not safe
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(scratch,)) as pool:
+                states = dict(pool.map(plan_run, plans)) # a pass per run, runs in parallel
+                results = list(pool.map(render_chunk, make_jobs(replays, out, fmt, chunk, states)))
+
+    if fmt == "raw":
+        for run in sorted({run for run, _, _ in results}): stitch(os.path.join(out, run), os.path.join(out, run + ".cap"))
+    return sum(written for _, _, written in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="render recorded runs into png frames or raw capture files")
+    parser.add_argument("replays", help="leaderboard file or submissions file (one JSON object per line)")
+    parser.add_argument("--out", default="renders")
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--chunk", type=int, default=240, help="frames per pool job")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="render only the best N runs")
+    args = parser.parse_args()
+
+    from ghosts import read_replays
+    replays = read_replays(args.replays)[:args.limit]
+    if not replays:
+        print(f"no replays in {args.replays}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    frames = render_replays(replays, args.out, args.format, args.chunk, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames of {len(replays)} runs in {elapsed:.1f}s -- {frames / elapsed / 80:.1f}x real time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""run recording -- seed + input log is all it takes to re-play a run with Simulation"""
+
+
+class RunRecorder:
+    """records one run as frame numbers of jumps & pipe spawns
+
+    frame = number of gameplay updates since run start -- pause, menus & countdown don't count
+    """
+    def __init__(self):
+        self.start(0, (0, 0, 0))
+
+    def start(self, seed, screen):
+        self.seed = seed
+        self.screen = tuple(screen)  # (width, height, medium height)
+        self.jumps = []
+        self.spawns = []
+        self.frames = 0
+        self.valid = True  # resizing mid run can't be re-played
+
+    def jump(self, frame): self.jumps.append(frame)
+
+    def spawn(self, frame): self.spawns.append(frame)
+
+    def finish(self, frames): self.frames = frames
+
+    def invalidate(self): self.valid = False
+
+    def to_dict(self, score):
+        """replay as stored with leaderboard submissions"""
+        return {
+            "seed": self.seed,
+            "screen": list(self.screen),
+            "frames": self.frames,
+            "score": score,
+            "jumps": list(self.jumps),
+            "spawns": list(self.spawns),
+        }
+
+
+def screen_of(settings):
+    """(width, height, medium height) of current settings"""
+    return settings.width, settings.height, settings.SCREEN_SIZES["medium"][1]
@@ -0,0 +1,122 @@
+"""game files -- images & sounds by name, where the leaderboard lives
+
+from source, assets/ & data/ are found next to code/ -- starting the game from another directory works too.
+in a zipapp (python code/build.py) images & built-in sounds come from one pack inside the archive: raw pixels
+already in the display's format, so loading one is a frombuffer -- no png / jpg decoding at launch. data/ then
+sits next to the .pyz
+"""
+import os
+import io
+import json
+import struct
+import zipimport
+from array import array
+import pygame as pg
+
+PACK = "assets.pack"
+HEADER = struct.Struct("<I")  # length of the json index that follows it -- blob after that
+
+if isinstance(globals().get("__loader__"), zipimport.zipimporter):
+    ROOT = os.path.dirname(os.path.abspath(__loader__.archive))
+else:
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(ROOT, "assets")
+DATA_DIR = os.path.join(ROOT, "data")
+
+_pack = None  # (index, blob) once read -- False when there's no pack
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def asset_path(name):
+    return os.path.join(ASSET_DIR, name)
+
+
+def pack():
+    """(index, blob) of the pack in the archive, None when running from source"""
+    global _pack
+    if _pack is None:
+        try: _pack = read_pack(__loader__.get_data(os.path.join(os.path.dirname(__file__), PACK)))
+        except (OSError, AttributeError): _pack = False
+    return _pack or None
+
+
+def read_pack(data):
+    """(index, blob) of pack bytes -- blob is a view, nothing copied"""
+    size = HEADER.unpack_from(data)[0]
+    return json.loads(data[HEADER.size:HEADER.size + size]), memoryview(data)[HEADER.size + size:]
+
+
+def image(name):
+    """assets/<name> converted for the display -- convert_alpha on a packed image only if the display's format
+    differs from the one the build stored"""
+    packed = pack()
+    if packed and name in packed[0]["images"]:
+        offset, length, width, height, fmt = packed[0]["images"][name]
+        surface = pg.image.frombuffer(packed[1][offset:offset + length], (width, height), fmt)
+        if surface.get_masks() == display_masks(): return surface
+        return surface.convert_alpha()
+    return pg.image.load(asset_path(name)).convert_alpha()
+
+
+def display_masks():
+    return pg.Surface((1, 1)).convert_alpha().get_masks()
+
+
+def asset_file(name):
+    """assets/<name> as something pygame & open-style readers take -- path or file object over packed bytes.
+    None if missing"""
+    packed = pack()
+    if packed:
+        entry = packed[0]["files"].get(name)
+        if entry: return io.BytesIO(packed[1][entry[0]:entry[0] + entry[1]])
+        return None
+    path = asset_path(name)
+    return path if os.path.exists(path) else None
+
+
+def samples(name):
+    """built-in sound synthesized at build time -- mono 16-bit samples, None when not packed"""
+    packed = pack()
+    if not packed or name not in packed[0]["samples"]: return None
+    offset, length = packed[0]["samples"][name]
+    values = array('h')
+    values.frombytes(packed[1][offset:offset + length])
+    return values
+
+
+# ---------------- Building ---------------- #
+
+def byte_order(surface):
+    """pixel layout of a 32-bit surface as frombuffer / tobytes name it"""
+    names = dict(zip(surface.get_shifts(), "RGBA"))
+    return "".join(names[shift] for shift in (0, 8, 16, 24))
+
+
+def write_pack(path, images, files, sound_samples):
+    """images: names under assets/, converted for the current display. files: names under assets/ stored
+    as is. sound_samples: name -> array('h')"""
+    index = {"images": {}, "files": {}, "samples": {}}
+    blob = bytearray()
+
+    def add(data):
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    for name in images:
+        surface = pg.image.load(asset_path(name)).convert_alpha()
+        fmt = byte_order(surface)
+        index["images"][name] = [*add(pg.image.tobytes(surface, fmt)), *surface.get_size(), fmt]
+    for name in files:
+        with open(asset_path(name), 'rb') as file: index["files"][name] = add(file.read())
+    for name, values in sound_samples.items():
+        index["samples"][name] = add(values.tobytes())
+
+    header = json.dumps(index).encode()
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(len(header)))
+        file.write(header)
+        file.write(blob)
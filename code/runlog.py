@@ -0,0 +1,330 @@
+"""per-run analytics log -- one fixed-width record per finished run, stored column by column
+
+    python code/runlog.py                           # report over data/runs.log
+    python code/runlog.py --settings 1a2b3c4d       # only runs played with these settings
+    python code/runlog.py --screen 480x720 --cause pipe
+
+file is MAGIC then blocks of BLOCK_RUNS runs. a block is a header -- b"BLK1", runs in it, capacity -- then one
+array per column, room for every run of the block preallocated (sparse until written). appending a run writes
+its value into each column & then bumps the block's count, so a crash mid append leaves the run out, not half
+in. the report maps the file & counts straight off the column arrays: Counter & compress over memoryviews,
+several columns packed into one int key per run by strided byte copies -- Python only loops over distinct
+values, about half a second per million runs.
+settings hashes are explained in a small JSON file next to the log (<log>.settings.json)
+"""
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+from operator import eq, and_
+from itertools import compress, repeat
+from collections import Counter
+
+MAGIC = b"FLPRUNS1"
+BLOCK = struct.Struct("<4sII")  # tag, runs written, capacity
+BLOCK_TAG = b"BLK1"
+BLOCK_HEADER = 16  # BLOCK padded -- keeps every column 4 byte aligned
+BLOCK_RUNS = 16384
+COLUMNS = (
+    ("score", "I"),
+    ("frames", "I"),     # run duration in gameplay updates
+    ("cause", "B"),      # simulation.PIPE / FLOOR / CEILING
+    ("x", "h"),          # bird center at death -- x from center of nearest pipe, y from top of screen
+    ("y", "h"),
+    ("width", "H"),      # screen size
+    ("height", "H"),
+    ("settings", "I"),   # settings_hash
+)
+CAUSES = {1: "pipe", 2: "floor", 3: "ceiling"}
+KEY_CODES = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}  # joint() keys by width
+HEATMAP_BINS = {"x": 8, "y": 8}  # pixels -- deaths counted per 8x8 square before the grid is laid out
+BIN_TABLES = {size: bytes(value // size for value in range(256)) for size in (2, 4, 8, 16, 32, 64, 128)}
+
+
+def column_offsets(capacity):
+    """byte offset of every column inside a block"""
+    offsets, at = [], BLOCK_HEADER
+    for _, code in COLUMNS:
+        offsets.append(at)
+        at += capacity * struct.calcsize(code)
+    return offsets, at
+
+
+def tuning(settings, pipe_manager):
+    """difficulty knobs a run was played with -- pipe heights as ratios of screen height"""
+    return {
+        "speed": settings.speed, "gravity": settings.gravity, "pipe_spawn_time": settings.pipe_spawn_time,
+        "pipe_heights": [round(height / settings.height, 4) for height in pipe_manager.pipe_heights], "fps": settings.FPS,
+    }
+
+
+def settings_hash(knobs):
+    return zlib.crc32(json.dumps(knobs, sort_keys=True).encode())
+
+
+# ---------------- Writing ---------------- #
+
+class RunLog:
+    """appends finished runs -- a few small writes per run, no fsync (losing the last runs of a crash is fine)"""
+    def __init__(self, path, capacity=BLOCK_RUNS):
+        self.path = path
+        self.capacity = capacity
+        self.explained = None  # settings hashes in the sidecar -- read on first append
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self.fd).st_size
+        if size == 0: os.pwrite(self.fd, MAGIC, 0)
+        elif os.pread(self.fd, len(MAGIC), 0) != MAGIC: raise ValueError(f"{path} is not a run log")
+
+        # last block & how full it is
+        self.block, self.count, at = None, 0, len(MAGIC)
+        while at + BLOCK_HEADER <= size:
+            tag, count, capacity = BLOCK.unpack(os.pread(self.fd, BLOCK.size, at))
+            if tag != BLOCK_TAG: break
+            self.block, self.count, self.block_capacity = at, count, capacity
+            at += column_offsets(capacity)[1]
+
+    def append(self, record):
+        """record -- values in COLUMNS order"""
+        self.extend([record])
+
+    def extend(self, records):
+        """many records -- one write per column per block"""
+        done = 0
+        while done < len(records):
+            if self.block is None or self.count == self.block_capacity: self.new_block()
+            chunk = records[done:done + self.block_capacity - self.count]
+            offsets, _ = column_offsets(self.block_capacity)
+            for column, ((_, code), offset) in enumerate(zip(COLUMNS, offsets)):
+                values = array(code, (record[column] for record in chunk))
+                os.pwrite(self.fd, values.tobytes(), self.block + offset + self.count * values.itemsize)
+            self.count += len(chunk)
+            os.pwrite(self.fd, struct.pack("<I", self.count), self.block + 4) # runs are in once counted
+            done += len(chunk)
+
+    def new_block(self):
+        self.block = os.fstat(self.fd).st_size
+        self.block_capacity = self.capacity
+        self.count = 0
+        os.ftruncate(self.fd, self.block + column_offsets(self.capacity)[1]) # sparse -- disk used as runs come in
+        os.pwrite(self.fd, BLOCK.pack(BLOCK_TAG, 0, self.capacity), self.block)
+
+    def explain(self, knobs):
+        """hash of knobs -- written to the sidecar the first time it shows up"""
+        key = settings_hash(knobs)
+        if self.explained is None: self.explained = read_explained(self.path)
+        if str(key) not in self.explained:
+            self.explained[str(key)] = knobs
+            with open(self.path + ".settings.json.tmp", 'w') as file: json.dump(self.explained, file)
+            os.replace(self.path + ".settings.json.tmp", self.path + ".settings.json")
+        return key
+
+    def record_run(self, game):
+        """finished run of a Game -- call right after the bird died"""
+        settings, bird = game.settings, game.bird
+        x = min((bird.rect.centerx - pipe.centerx for pipe in game.pipe_manager.pipes), key=abs, default=0)
+        self.append((
+            game.score_system.score, game.run_frame, game.death or 0, x, bird.rect.centery,
+            settings.width, settings.height, self.explain(tuning(settings, game.pipe_manager)),
+        ))
+
+    def close(self):
+        if self.fd is not None: os.close(self.fd)
+        self.fd = None
+
+
+def read_explained(path):
+    try:
+        with open(path + ".settings.json", 'r') as file: return json.load(file)
+    except (OSError, ValueError): return {}
+
+
+# ---------------- Reading ---------------- #
+
+class RunTable:
+    """mapped run log -- views[name][block] is a column of one block, cast straight over the map"""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.views = {name: [] for name, _ in COLUMNS}
+        self.runs = self.blocks = 0
+        self.map = None
+        if os.fstat(self.file.fileno()).st_size <= len(MAGIC): return
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC: raise ValueError(f"{path} is not a run log")
+
+        data, at = memoryview(self.map), len(MAGIC)
+        while at + BLOCK_HEADER <= len(self.map):
+            tag, count, capacity = BLOCK.unpack_from(self.map, at)
+            offsets, size = column_offsets(capacity)
+            if tag != BLOCK_TAG or at + size > len(self.map): break
+            for (name, code), offset in zip(COLUMNS, offsets):
+                start = at + offset
+                self.views[name].append(data[start:start + count * struct.calcsize(code)].cast(code))
+            self.runs += count
+            self.blocks += 1
+            at += size
+
+    def close(self):
+        for views in self.views.values():
+            for view in views: view.release()
+        self.views = {}
+        if self.map is not None: self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def select(table, settings=None, screen=None, cause=None):
+    """per block masks of runs matching the filters -- None when there are none"""
+    tests = []
+    if settings is not None: tests.append(("settings", settings))
+    if screen is not None: tests += [("width", screen[0]), ("height", screen[1])]
+    if cause is not None: tests.append(("cause", cause))
+    if not tests: return None
+    masks = []
+    for block in range(table.blocks):
+        mask = None
+        for name, value in tests:
+            matches = map(eq, table.views[name][block], repeat(value))
+            mask = matches if mask is None else map(and_, mask, matches)
+        masks.append(list(mask))
+    return masks
+
+
+def joint(views, codes, bins):
+    """one int per run packing the bytes of several columns -- counting those beats zipping tuples.
+    a column binned by a power of two has its low byte translated to low byte // bin -- value // bin in C"""
+    sizes = [struct.calcsize(code) for code in codes]
+    width = next(width for width in (1, 2, 4, 8) if width >= sum(sizes))
+    keys = bytearray(len(views[0]) * width)
+    at = 0
+    for view, size, bin in zip(views, sizes, bins):
+        raw = memoryview(view).cast('B')
+        for byte in range(size):
+            lane = raw[byte::size]
+            keys[at + byte::width] = lane.tobytes().translate(BIN_TABLES[bin]) if byte == 0 and bin > 1 else lane
+        at += size
+    return memoryview(keys).cast(KEY_CODES[width])
+
+
+def counts(table, masks, *names, bins=None):
+    """Counter of values -- or of value tuples for several columns -- over selected runs.
+    bins {name: size} counts a column in bins of size, keys are bin starts -- fewer distinct keys"""
+    codes = [dict(COLUMNS)[name] for name in names]
+    sizes = [(bins or {}).get(name, 1) for name in names]
+    counter = Counter()
+    for block in range(table.blocks):
+        views = [table.views[name][block] for name in names]
+        values = views[0] if len(views) == 1 else joint(views, codes, sizes)
+        counter.update(values if masks is None else compress(values, masks[block]))
+    if len(names) == 1: return counter
+
+    row = struct.Struct("<" + "".join(codes))
+    width = next(width for width in (1, 2, 4, 8) if width >= row.size)
+    joined = Counter()
+    for key, count in counter.items():
+        values = row.unpack(key.to_bytes(width, "little")[:row.size])
+        joined[tuple(value + (value & 0xFF) * (size - 1) for value, size in zip(values, sizes))] += count
+    return joined
+
+
+def percentiles(counter, qs=(0.5, 0.9, 0.99)):
+    """value at each fraction of runs -- walked over distinct values only"""
+    total = sum(counter.values())
+    results, seen, values = [], 0, sorted(counter)
+    targets = iter(qs)
+    q = next(targets, None)
+    for value in values:
+        seen += counter[value]
+        while q is not None and seen > q * total:
+            results.append(value)
+            q = next(targets, None)
+    while q is not None:
+        results.append(values[-1])
+        q = next(targets, None)
+    return results
+
+
+def heatmap(positions, columns=12, rows=16):
+    """grid of deaths -- positions is a Counter of (x, y, width, height). across is bird from nearest pipe
+    (half a screen either side), down is screen height"""
+    grid = [[0] * columns for _ in range(rows)]
+    for (x, y, width, height), count in positions.items():
+        if not width or not height: continue
+        x, y = x + HEATMAP_BINS["x"] // 2, y + HEATMAP_BINS["y"] // 2 # middle of the bin
+        column = min(columns - 1, max(0, (x + width // 2) * columns // width))
+        row = min(rows - 1, max(0, y * rows // height))
+        grid[row][column] += count
+    return grid
+
+
+def report(path, settings=None, screen=None, cause=None, out=sys.stdout):
+    """summary of the runs matching the filters -- printed"""
+    explained = read_explained(path)
+    with RunTable(path) as table:
+        masks = select(table, settings, screen, cause)
+        runs = table.runs if masks is None else sum(map(sum, masks))
+        print(f"{runs:,} runs of {table.runs:,} in {path}", file=out)
+        if not runs: return
+
+        for key, count in counts(table, masks, "settings").most_common(8):
+            print(f"  settings {key:08x}: {count:>10,}  {json.dumps(explained.get(str(key), '?'))}", file=out)
+        positions = counts(table, masks, "x", "y", "width", "height", bins=HEATMAP_BINS)
+        screens = Counter()
+        for (_, _, width, height), count in positions.items(): screens[width, height] += count
+        for (width, height), count in sorted(screens.items()):
+            print(f"  screen {width}x{height}: {count:>10,}", file=out)
+
+        scores = counts(table, masks, "score")
+        score_p50, score_p90, score_p99 = percentiles(scores)
+        print(f"score   mean {sum(v * c for v, c in scores.items()) / runs:7.2f}  p50 {score_p50}  p90 {score_p90}  "
+              f"p99 {score_p99}  max {max(scores)}", file=out)
+        frames = counts(table, masks, "frames")
+        p50, p90, p99 = percentiles(frames)
+        print(f"frames  p50 {p50}  p90 {p90}  p99 {p99}  max {max(frames)}", file=out)
+
+        # score histogram -- ten buckets up to p99, rest in the last one
+        step = max(1, -(-score_p99 // 10))
+        buckets = Counter()
+        for value, count in scores.items(): buckets[min(value // step, 10)] += count
+        biggest = max(buckets.values())
+        for bucket in range(11):
+            label = f"{bucket * step}-{bucket * step + step - 1}" if bucket < 10 else f">={10 * step}"
+            print(f"  {label:>11} {buckets[bucket]:>10,} {'#' * round(40 * buckets[bucket] / biggest)}", file=out)
+
+        causes = counts(table, masks, "cause")
+        print("deaths  " + "  ".join(f"{CAUSES.get(c, '?')} {n / runs:.1%}" for c, n in causes.most_common()), file=out)
+
+        grid = heatmap(positions)
+        peak = max(max(row) for row in grid) or 1
+        shades = " .:-=+*#%@"
+        print("death heatmap -- across: bird from nearest pipe, down: screen top to bottom", file=out)
+        for row in grid:
+            print("  |" + "".join(shades[min(9, -(-9 * cell // peak))] for cell in row) + "|", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="report over the per-run analytics log")
+    parser.add_argument("path", nargs="?", default=None, help="run log (default data/runs.log)")
+    parser.add_argument("--settings", default=None, help="settings hash (hex) to keep")
+    parser.add_argument("--screen", default=None, help="WIDTHxHEIGHT to keep")
+    parser.add_argument("--cause", choices=sorted(CAUSES.values()), default=None)
+    args = parser.parse_args()
+    if args.path is None: # data/ next to code/ -- not via resources, that pulls in pygame
+        args.path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "runs.log")
+
+    screen = tuple(int(v) for v in args.screen.lower().split("x")) if args.screen else None
+    cause = {name: code for code, name in CAUSES.items()}.get(args.cause)
+    report(args.path, int(args.settings, 16) if args.settings else None, screen, cause)
+
+
+if __name__ == "__main__":
+    main()
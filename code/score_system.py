@@ -1,6 +1,21 @@
 import pygame as pg
 import json
 import os
+import time
+import atexit
+from interface import NameInput, get_font
+from metrics import game_metrics
+from governor import NO_SHADOWS, OPAQUE_OVERLAYS
+from verifier import VerifyQueue
+import resources
+
+LEADERBOARD_SIZE = 100  # default for tools without settings -- the game uses settings.leaderboard_size
+
+
+def rank_scores(scores, limit=LEADERBOARD_SIZE):
+    """sort by score DESCENDING order -- from highest to lowest & keep only top ones"""
+    return sorted(scores, key=lambda x: x["score"], reverse=True)[:limit]
+
 
 class ScoreMessage:
     def __init__(self, x, y, lifetime=60):
@@ -12,10 +27,9 @@ class ScoreMessage:
         self.lifetime -= 1
         self.y -= 1
 
-    def draw(self, screen, font):
-        message = font.render("+1", True, (0, 255, 0))
-        shadow = font.render("+1", True, (0, 100, 0))  # shadow effect
-        screen.blit(shadow, (self.x + 2, self.y + 2))
+    def draw(self, screen, message, shadow=None):
+        """message & shadow are pre-rendered by ScoreSystem -- same "+1" for every message"""
+        if shadow is not None: screen.blit(shadow, (self.x + 2, self.y + 2))  # shadow effect
         screen.blit(message, (self.x, self.y))
 
     def is_expired(self):
@@ -28,29 +42,52 @@ class ScoreSystem:
         self.high_score = 0
         self.score_messages = []
 
-        self.leaderboard_file = "data/leaderboard.json"  # leaderboard file
+        self.leaderboard_file = resources.data_path("leaderboard.json")  # leaderboard file -- next to code/ or the .pyz
 
         top_scores = self.get_top_scores(1)  # top score from leaderboard
         if top_scores: self.high_score = top_scores[0]["score"]
 
         # username input for leaderboard
-        self.username = ""
-        self.active_input = False
+        self.name_input = NameInput(settings)
         self.show_name_input = False
+        self.replay = None  # replay of last finished run -- set by Game, sent along with submission
+        self.submit_note = None  # "checking" / "saved" / "rejected" line shown on game over once the name is in
+        self.note_for = None  # submission submit_note is about -- its verdict replaces the note
+        self.verifier = VerifyQueue()  # submissions re-played on a worker process -- saved only if scores match
+        self.sync = None  # LeaderboardSync -- set by Game when there's a global leaderboard
 
         # load fonts
-        self.game_font = pg.font.SysFont('Impact', int(40 * settings.scale_factor))
-        self.score_message_font = pg.font.SysFont('Impact', int(30 * settings.scale_factor))
-        self.score_display_font = pg.font.SysFont('Impact', int(48 * settings.scale_factor))
-        self.input_font = pg.font.SysFont('Arial', int(32 * settings.scale_factor))
+        self.game_font = get_font('Impact', int(40 * settings.scale_factor))
+        self.score_message_font = get_font('Impact', int(30 * settings.scale_factor))
+        self.score_display_font = get_font('Impact', int(48 * settings.scale_factor))
+        self.input_font = get_font('Arial', int(32 * settings.scale_factor))
+        self.render_static()
 
     def resize(self, settings): 
         """update interface for new screen size if changed"""
         self.settings = settings
-        self.game_font = pg.font.SysFont('Impact', int(40 * settings.scale_factor))
-        self.score_message_font = pg.font.SysFont('Impact', int(30 * settings.scale_factor))
-        self.score_display_font = pg.font.SysFont('Impact', int(48 * settings.scale_factor))
-        self.input_font = pg.font.SysFont('Arial', int(32 * settings.scale_factor))
+        self.game_font = get_font('Impact', int(40 * settings.scale_factor))
+        self.score_message_font = get_font('Impact', int(30 * settings.scale_factor))
+        self.score_display_font = get_font('Impact', int(48 * settings.scale_factor))
+        self.input_font = get_font('Arial', int(32 * settings.scale_factor))
+        self.name_input.layout(settings)
+        self.render_static()
+
+    def render_static(self):
+        """pre-render text & overlay that don't change during a run -- drawn every frame otherwise"""
+        w, h = self.settings.width, self.settings.height
+        self.message_text = self.score_message_font.render("+1", True, (0, 255, 0))
+        self.message_shadow = self.score_message_font.render("+1", True, (0, 100, 0))
+
+        # half transparent overlay for game over text visibility
+        self.game_over_overlay = pg.Surface((w, h), pg.SRCALPHA)
+        self.game_over_overlay.fill((0, 0, 0, 160))
+
+        gameover_font = get_font('Impact', int(50 * self.settings.scale_factor))
+        self.gameover_shadow = gameover_font.render("GAME OVER", True, (150, 0, 0))
+        self.gameover_text = gameover_font.render("GAME OVER", True, (255, 50, 50))
+        self.gameover_shadow_rect = self.gameover_shadow.get_rect(center=(w // 2 + 5, h // 10 + 3))
+        self.gameover_rect = self.gameover_text.get_rect(center=(w // 2, h // 10))
 
     def increase_score(self): self.score += 1
 
@@ -64,7 +101,8 @@ class ScoreSystem:
 
     def draw_score_messages(self, screen):
         """draw all score messages"""
-        for msg in self.score_messages: msg.draw(screen, self.score_message_font)
+        shadow = self.message_shadow if self.settings.quality < NO_SHADOWS else None
+        for msg in self.score_messages: msg.draw(screen, self.message_text, shadow)
 
     def draw_score(self, screen, game_state):
         """score display based on game state"""
@@ -93,147 +131,85 @@ class ScoreSystem:
             screen.blit(score_surface, (text_x, text_y))
 
         elif game_state == 'game_over':
-            # half transparent overlay for text visibility
-            overlay = pg.Surface((self.settings.width, self.settings.height), pg.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
+            shadows = self.settings.quality < NO_SHADOWS
+            if self.settings.quality < OPAQUE_OVERLAYS: screen.blit(self.game_over_overlay, (0, 0))
 
             # game over txt
-            gameover_shadow = pg.font.SysFont('Impact', int(50 * self.settings.scale_factor)).render(
-                "GAME OVER", True, (150, 0, 0))
-            gameover_text = pg.font.SysFont('Impact', int(50 * self.settings.scale_factor)).render(
-                "GAME OVER", True, (255, 50, 50))
-
-            shadow_rect = gameover_shadow.get_rect(center=(self.settings.width // 2 + 5, self.settings.height // 10 + 3))        
-            gameover_rect = gameover_text.get_rect(center=(self.settings.width // 2, self.settings.height // 10))
-
-            screen.blit(gameover_shadow, shadow_rect)
-            screen.blit(gameover_text, gameover_rect)
+            if shadows: screen.blit(self.gameover_shadow, self.gameover_shadow_rect)
+            screen.blit(self.gameover_text, self.gameover_rect)
 
             # curr score display w/ shadow effect -- font.render
             score_text = f'Your Score: {int(self.score)}'
-            score_shadow = self.game_font.render(score_text, True, (100, 0, 0))
             score_surface = self.game_font.render(score_text, True, (255, 50, 50))
-
             score_rect = score_surface.get_rect(center=(self.settings.width // 2, self.settings.height // 5))
-            screen.blit(score_shadow, (score_rect.x + 2, score_rect.y + 2))
+            if shadows: screen.blit(self.game_font.render(score_text, True, (100, 0, 0)), (score_rect.x + 2, score_rect.y + 2))
             screen.blit(score_surface, score_rect)
 
             # display max score
             top_score_txt = f'Highest Score: {int(self.high_score)}'
-            top_score_shadow = self.game_font.render(top_score_txt, True, (100, 50, 0))
             top_score_surface = self.game_font.render(top_score_txt, True, (255, 165, 0))
-
             top_score_rect = top_score_surface.get_rect(
                 center=(self.settings.width // 2, self.settings.height // 5 + score_rect.height * 1.5))
-            screen.blit(top_score_shadow, (top_score_rect.x + 2, top_score_rect.y + 2))
+            if shadows: screen.blit(self.game_font.render(top_score_txt, True, (100, 50, 0)), (top_score_rect.x + 2, top_score_rect.y + 2))
             screen.blit(top_score_surface, top_score_rect)
 
-            # display name input if score is high enough for leaderboard
-            is_ts = self.isTopScore(self.score) # is top score
-            if self.show_name_input and is_ts: self.draw_name_input(screen)
+            # display name input if score is high enough for leaderboard -- checked once at game over in update_high_score
+            if self.show_name_input: self.draw_name_input(screen)
+            elif self.submit_note is not None: screen.blit(self.submit_note, self.submit_note.get_rect(center=self.name_input.rect.center))
 
     def draw_name_input(self, screen):
         """input field for player name when game is Over and user scored at least one pt"""
-        # input box bg
-        input_width = 400 * self.settings.scale_factor
-        input_height = 50 * self.settings.scale_factor
-        input_x = (self.settings.width - input_width) // 2
-        input_y = self.settings.height // 3 + 75  # positioned higher to make room for buttons below
-
-        input_rect = pg.Rect(input_x, input_y, input_width, input_height)
-
-        # instruct text 
-        label_text = "Enter your name for the leaderboard:"
-        label_surface = self.input_font.render(label_text, True, (255, 255, 255))
-        label_rect = label_surface.get_rect(center=(self.settings.width // 2, input_y - 25))
-        screen.blit(label_surface, label_rect)
-
-        # input box
-        pg.draw.rect(screen, (50, 50, 50), input_rect)
-        if self.active_input: pg.draw.rect(screen, (0, 200, 0), input_rect, 3)
-        else: pg.draw.rect(screen, (100, 100, 100), input_rect, 3)
-
-        # input txt
-        input_surface = self.input_font.render(self.username, True, (255, 255, 255))
-        screen.blit(input_surface, (input_rect.x + 10, input_rect.y + 10))
-
-        # blinking cursor when active
-        if self.active_input and int(pg.time.get_ticks() / 500) % 2 == 0:
-            cursor_pos = self.input_font.size(self.username)[0]
-            pg.draw.line(
-                screen, (255, 255, 255),
-                (input_rect.x + 10 + cursor_pos, input_rect.y+10),
-                (input_rect.x + 10 + cursor_pos, input_rect.y + input_height - 10),
-                2
-            )
-
-        # -------------- SUBMIT BUTTON -------------- #
-        submit_width = 150 * self.settings.scale_factor
-        submit_height = 40 * self.settings.scale_factor
-        submit_x = (self.settings.width - submit_width) // 2
-        submit_y = input_y + input_height + 20
-
-        submit_rect = pg.Rect(submit_x, submit_y, submit_width, submit_height)
-
-        # button rect
-        pg.draw.rect(screen, (0, 150, 0), submit_rect, border_radius=int(submit_height // 4))
-        pg.draw.rect(screen, (0, 200, 0), submit_rect, 3, border_radius=int(submit_height // 4))
-
-        # button text
-        submit_text = self.input_font.render("Submit", True, (255, 255, 255))
-        submit_text_rect = submit_text.get_rect(center=submit_rect.center)
-        screen.blit(submit_text, submit_text_rect)
-
-        return submit_rect
+        self.name_input.draw(screen)
 
     def handle_input_events(self, event):
         """handle input events for name entry"""
         if not self.show_name_input: return None
 
-        input_width = 400 * self.settings.scale_factor
-        input_height = 50 * self.settings.scale_factor
-        input_x = (self.settings.width - input_width) // 2
-        input_y = self.settings.height // 3 
-        
-        submit_width = 150 * self.settings.scale_factor
-        submit_height = 40 * self.settings.scale_factor
-        submit_x = (self.settings.width - submit_width) // 2
-        submit_y = input_y + input_height + 20
-
-        submit_rect = pg.Rect(submit_x, submit_y, submit_width, submit_height)
-        input_rect = pg.Rect(input_x, input_y, input_width, input_height)
-
-        if event.type == pg.MOUSEBUTTONDOWN:
-            # if clicked on input box
-            self.active_input = True if input_rect.collidepoint(event.pos) else False
-
-            # submit button clicked
-            if submit_rect.collidepoint(event.pos):
-                self.submit_score()
-                return "submitted"
-
-        elif event.type == pg.KEYDOWN and self.active_input:
-            if event.key == pg.K_RETURN:
-                self.submit_score()
-                return "submitted"
-            elif event.key == pg.K_BACKSPACE:
-                self.username = self.username[:-1]
-            else:
-                if len(self.username) < 15:
-                    self.username += event.unicode
-
+        if self.name_input.handle_event(event) is not None:
+            self.submit_score()
+            return "submitted"
         return None
 
     def submit_score(self):
-        """submit score to leaderboard & hide input"""
+        """queue score for verification & hide input -- saved by check_submissions once its replay scores the same.
+        a run without a replay (e.g. window resized mid run) can't be checked & isn't saved"""
         if self.show_name_input and self.score > 0:
-            self.add_score(self.username, self.score)
+            if self.replay is None:
+                self.note_for = None
+                self.set_note("Score not saved -- run has no replay to check")
+            else:
+                self.note_for = {"name": self.name_input.text, "score": self.score, "replay": self.replay}
+                atexit.unregister(self.finish_submissions)
+                atexit.register(self.finish_submissions) # queue waited for at exit -- registered once
+                self.verifier.submit(self.note_for)
+                self.set_note("Checking score...")
             self.show_name_input = False
-            self.username = ""  # reset username for next game
+            self.name_input.set_text("")  # reset username for next game
             return True
         return False
 
+    def set_note(self, note):
+        self.submit_note = get_font('Arial', int(24 * self.settings.scale_factor)).render(note, True, (255, 255, 255))
+
+    def check_submissions(self):
+        """save submissions whose replays verified -- cheap enough for every frame, Game calls it in step"""
+        for submission, accepted, reason in self.verifier.finished(): self.settle(submission, accepted, reason)
+
+    def finish_submissions(self):
+        """wait for every queued submission -- at exit, so a score typed in just before quitting is still saved"""
+        atexit.unregister(self.finish_submissions)
+        for submission, accepted, reason in self.verifier.finished(wait=True): self.settle(submission, accepted, reason, note=False)
+
+    def settle(self, submission, accepted, reason, note=True):
+        """verdict of a queued submission -- only verified runs are saved & sent to the global leaderboard"""
+        if accepted:
+            entry = self.add_score(submission["name"], submission["score"], submission["replay"])
+            if self.sync: self.sync.submit(entry) # queued -- sent by the sync thread
+        else: print(f"score of {submission['name'] or 'Player'} rejected: {reason}")
+        if note and submission is self.note_for: # still on its game over screen
+            self.set_note("Score saved" if accepted else "Score rejected -- replay doesn't match")
+            self.note_for = None
+
     def load_leaderboard(self):
         """load leaderboard from file or create new one if file doesn't exist"""
         try:
@@ -255,13 +231,15 @@ class ScoreSystem:
     def save_leaderboard(self, leaderboard):
         """saving leaderboard to file"""
         try:
+            start = time.perf_counter()
             with open(self.leaderboard_file, 'w') as file:
                 json.dump(leaderboard, file)
+            game_metrics.leaderboard_write.observe(time.perf_counter() - start)
         except Exception as e:
             print(f"Error saving leaderboard: {e}")
 
-    def add_score(self, name, score):
-        """add a new score to leaderboard"""
+    def add_score(self, name, score, replay=None):
+        """add a new score to leaderboard -- local file only, returns the entry"""
         if not name.strip(): name = "Player"
 
         leaderboard = self.load_leaderboard()  # load current leaderboard
@@ -273,24 +251,17 @@ class ScoreSystem:
             "name": name,
             "score": score
         }
+        if replay is not None: new_entry["replay"] = replay # lets verifier.py re-check entry later
 
         leaderboard["scores"].append(new_entry)
-
-        # sort by score DESCENDING order -- from highest to lowest
-        leaderboard["scores"] = sorted(
-            leaderboard["scores"],
-            key=lambda x: x["score"],
-            reverse=True
-        )
-
-        # save only top 7 scores
-        if len(leaderboard["scores"]) > 7:
-            leaderboard["scores"] = leaderboard["scores"][:7]
+        leaderboard["scores"] = rank_scores(leaderboard["scores"], self.settings.leaderboard_size)
 
         self.save_leaderboard(leaderboard)
+        return new_entry
 
-    def get_top_scores(self, limit=7):
+    def get_top_scores(self, limit=None):
         """get top scores from leaderboard"""
+        if limit is None: limit = self.settings.leaderboard_size
         leaderboard = self.load_leaderboard()
         
         # handle both structures for compatibility
@@ -303,7 +274,7 @@ class ScoreSystem:
     def isTopScore(self, score):
         """check if score qualifies for leaderboard"""
         top_scores = self.get_top_scores()
-        return True if len(top_scores) < 7 else (score > min([entry["score"] for entry in top_scores]))
+        return True if len(top_scores) < self.settings.leaderboard_size else (score > min([entry["score"] for entry in top_scores]))
 
     def update_high_score(self):
         """update max score if current score is greater"""
@@ -312,11 +283,15 @@ class ScoreSystem:
         # if qualifies for leaderboard AND its NOT ZERO -- in case leaderboard is empty
         if self.isTopScore(self.score) and self.score > 0:
             self.show_name_input = True
-            self.active_input = True
+            self.name_input.active = True
+            self.name_input.blink = 0
 
     def reset_score(self):
         """reset score & score messages"""
         self.score = 0
         self.score_messages.clear()
         self.show_name_input = False
-        self.username = ""
+        self.replay = None
+        self.submit_note = None
+        self.note_for = None
+        self.name_input.set_text("")
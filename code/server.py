@@ -0,0 +1,315 @@
+"""global leaderboard server -- stdlib only, asyncio streams, one process on one core
+
+    python code/server.py --port 8707 --log data/global.log
+    python code/loadgen.py --url http://127.0.0.1:8707         # throughput & read latency
+
+speaks sync.py's protocol over keep-alive HTTP/1.1 (pipelined requests are answered in order):
+
+    POST /scores     {"scores": [{"name", "score"}, ...]} or one {"name", "score"}  -> {"accepted": n, "ranks": [...]}
+    GET  /top?n=N    If-None-Match: <etag>                                          -> {"scores": [...]} + ETag, or 304
+    GET  /rank?score=S                                                              -> {"rank": r, "total": n}
+    GET  /stats                                                                     -> counters & CPU seconds used
+
+scores live in a ScoreIndex: a Fenwick tree of counts per score value for O(log n) insert & rank, plus the best
+TOP_KEEP entries kept sorted for top-N reads -- encoded replies are cached until the top changes.
+
+every entry goes to an append-only log, a JSON line [name, score] each: every few seconds the entries that came in
+since the last append are written on a worker thread, so a write costs what arrived meanwhile, never the whole
+board. every entry counts for ranks, so nothing is ever dropped from the log -- a log a crash left torn, or a whole
+file leaderboard (a cabinet's leaderboard.json, an old snapshot) it starts from, is compacted into clean lines once
+at start
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+from array import array
+from bisect import insort
+from urllib.parse import urlsplit, parse_qs
+
+TOP_KEEP = 100  # most entries a top-N read returns
+MAX_SCORE = 1_000_000  # tree has a slot per score value -- 8 MB at most
+NAME_LENGTH = 15  # NameInput's max_length
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def clean_entry(item):
+    """(name, score) from a submitted entry -- BadRequest unless it's a leaderboard entry"""
+    if not isinstance(item, dict): raise BadRequest("entry must be an object")
+    name, score = item.get("name"), item.get("score")
+    if not isinstance(name, str): raise BadRequest("name must be a string")
+    if type(score) is not int or not 0 <= score <= MAX_SCORE: raise BadRequest(f"score must be an int in 0..{MAX_SCORE}")
+    return name.strip()[:NAME_LENGTH] or "Player", score
+
+
+# ---------------- Index ---------------- #
+
+class ScoreIndex:
+    """every score submitted -- counts per score in a Fenwick tree, best `keep` entries sorted"""
+    def __init__(self, keep=TOP_KEEP):
+        self.keep = keep
+        self.tree = array('Q', [0] * 1025)  # 1-based -- score s counted at index s + 1
+        self.entries = []  # (name, score) in arrival order -- what the log holds
+        self.top = []  # (-score, arrival, name) best first -- equal scores keep arrival order
+        self.version = 0  # bumped whenever top changes -- ETag of top reads
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, name, score):
+        """insert & return rank -- 1 + entries with a higher score"""
+        if score + 1 >= len(self.tree): self.grow(score)
+        tree, i = self.tree, score + 1
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+        arrival = len(self.entries)
+        self.entries.append((name, score))
+        if len(self.top) < self.keep or -score < self.top[-1][0]:
+            insort(self.top, (-score, arrival, name))
+            if len(self.top) > self.keep: self.top.pop()
+            self.version += 1
+        return self.rank(score)
+
+    def rank(self, score):
+        """rank a score would get -- 1 + entries scoring higher"""
+        at_most, i = 0, min(score + 1, len(self.tree) - 1)
+        while i > 0:
+            at_most += self.tree[i]
+            i -= i & -i
+        return len(self.entries) - at_most + 1
+
+    def grow(self, score):
+        """room for score -- tree size doubled until it fits & rebuilt from the entries"""
+        size = len(self.tree) - 1
+        while size <= score: size *= 2
+        counts = array('Q', [0] * (size + 1))
+        for _, value in self.entries: counts[value + 1] += 1
+        for i in range(1, size + 1): # linear Fenwick build
+            parent = i + (i & -i)
+            if parent <= size: counts[parent] += counts[i]
+        self.tree = counts
+
+    def best(self, n):
+        return [{"name": name, "score": -score} for score, _, name in self.top[:n]]
+
+
+def read_log(path):
+    """(entries, clean) of a score log -- clean is False if it needs compacting: torn or damaged lines, or a whole
+    file leaderboard {"scores": [...]} instead of lines"""
+    try:
+        with open(path, 'r') as file: text = file.read()
+    except FileNotFoundError: return [], True
+    try: data = json.loads(text)
+    except ValueError: data = None
+    if isinstance(data, dict):
+        items, clean = data.get("scores", []), False
+        if not isinstance(items, list): items = []
+    else:
+        items, clean = [], text.endswith("\n") or not text
+        for line in text.splitlines():
+            try:
+                name, score = json.loads(line)
+                items.append({"name": name, "score": score})
+            except (ValueError, TypeError): clean = False # half written at a crash
+
+    entries = []
+    for item in items:
+        try: entries.append(clean_entry(item))
+        except BadRequest: clean = False
+    return entries, clean
+
+
+def encode_entries(entries):
+    return "".join(json.dumps(entry) + "\n" for entry in entries)
+
+
+def append_log(path, entries):
+    """entries onto the end of the log -- flushed & fsynced"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as file:
+        file.write(encode_entries(entries))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def compact_log(path, entries):
+    """log rewritten as clean lines of entries -- temp file & rename, a crash mid write leaves the old one intact"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", 'w') as file:
+        file.write(encode_entries(entries))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+
+# ---------------- Server ---------------- #
+
+def reply(status, body=b"", headers=b""):
+    head = b"HTTP/1.1 %d %s\r\n" % (status, REASONS[status].encode())
+    if status == 304: return head + headers + b"\r\n"  # no body, no length
+    return head + b"Content-Type: application/json\r\nContent-Length: %d\r\n%s\r\n" % (len(body), headers) + body
+
+
+class LeaderboardServer:
+    def __init__(self, host="127.0.0.1", port=8707, log=None, interval=5.0, index=None):
+        self.host, self.port = host, port
+        self.log = log
+        self.interval = interval  # seconds between log appends
+        self.index = index or ScoreIndex()
+        if log:
+            entries, clean = read_log(log)
+            for name, score in entries: self.index.add(name, score)
+            if not clean: compact_log(log, self.index.entries)
+        self.saved = len(self.index)  # entries in the log
+        self.top_cache = {}  # n -> (version, encoded reply)
+        self.server = None
+        self.log_task = None
+        self.stopping = None
+
+        # stats
+        self.connections = 0
+        self.requests = 0
+        self.submissions = 0
+        self.cpu_start = time.process_time()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, reuse_address=True)
+        self.port = self.server.sockets[0].getsockname()[1] # real port if 0 was asked for
+        self.stopping = asyncio.Event()
+        if self.log: self.log_task = asyncio.create_task(self.appends())
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.stopping.set()
+        if self.log_task: await self.log_task # last append -- never cut off mid write
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"leaderboard server on http://{self.host}:{self.port} -- {len(self.index)} entries", flush=True)
+        try: await self.server.serve_forever()
+        finally: await self.stop()
+
+    # -------- log -------- #
+
+    async def appends(self):
+        """entries since the last append go to the log every interval -- & once more when stopping"""
+        while not self.stopping.is_set():
+            try: await asyncio.wait_for(self.stopping.wait(), self.interval)
+            except asyncio.TimeoutError: pass
+            count = len(self.index)
+            if count == self.saved: continue
+            entries = self.index.entries[self.saved:count] # only the new ones -- the loop keeps adding meanwhile
+            try: await asyncio.to_thread(append_log, self.log, entries)
+            except OSError as e: print(f"error appending to score log: {e}") # tried again with the next ones
+            else: self.saved = count
+
+    # -------- HTTP -------- #
+
+    async def handle(self, reader, writer):
+        """one connection -- requests answered in order until the client hangs up"""
+        self.connections += 1
+        try:
+            while True:
+                try: head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError: break # closed between requests
+                except asyncio.LimitOverrunError:
+                    writer.write(reply(400, b'{"error": "headers too long"}', b"Connection: close\r\n"))
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                length, etag, close = 0, None, False
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    name = name.lower()
+                    if name == "content-length": length = int(value)
+                    elif name == "if-none-match": etag = value.strip()
+                    elif name == "connection": close = value.strip().lower() == "close"
+                if length > MAX_BODY:
+                    writer.write(reply(413, b'{"error": "body too large"}', b"Connection: close\r\n"))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                writer.write(self.respond(method, target, body, etag))
+                if close: break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass # client went away or spoke something else
+        finally:
+            writer.close()
+
+    def respond(self, method, target, body, etag):
+        url = urlsplit(target)
+        try:
+            if url.path == "/scores":
+                if method != "POST": return reply(405)
+                return self.post_scores(body)
+            if method != "GET": return reply(405)
+            query = parse_qs(url.query)
+            if url.path == "/top": return self.get_top(int(query.get("n", ["7"])[0]), etag)
+            if url.path == "/rank":
+                return self.json(200, {"rank": self.index.rank(int(query["score"][0])), "total": len(self.index)})
+            if url.path == "/stats": return self.json(200, self.stats())
+            return reply(404)
+        except (BadRequest, ValueError, KeyError) as e:
+            return self.json(400, {"error": str(e)})
+
+    def post_scores(self, body):
+        data = json.loads(body)
+        items = data["scores"] if isinstance(data, dict) and "scores" in data else [data]
+        if not isinstance(items, list): raise BadRequest("scores must be a list")
+        entries = [clean_entry(item) for item in items] # all checked before any goes in
+        ranks = [self.index.add(name, score) for name, score in entries]
+        self.submissions += len(ranks)
+        return self.json(200, {"accepted": len(ranks), "ranks": ranks})
+
+    def get_top(self, n, etag):
+        """top n -- encoded once per change of top, 304 when the client has it already"""
+        n = min(max(n, 0), self.index.keep)
+        version = self.index.version
+        tag = f'"{version}"'
+        if etag == tag: return reply(304, headers=b"ETag: %s\r\n" % tag.encode())
+        cached = self.top_cache.get(n)
+        if cached is None or cached[0] != version:
+            body = json.dumps({"scores": self.index.best(n)}).encode()
+            cached = (version, reply(200, body, b"ETag: %s\r\n" % tag.encode()))
+            self.top_cache[n] = cached
+        return cached[1]
+
+    def stats(self):
+        return {"entries": len(self.index), "connections": self.connections, "requests": self.requests,
+                "submissions": self.submissions, "cpu_seconds": time.process_time() - self.cpu_start}
+
+    def json(self, status, payload):
+        return reply(status, json.dumps(payload).encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="global leaderboard server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8707)
+    parser.add_argument("--log", default=None, help="every entry appended here & loaded at start (default data/global.log, '' keeps them in memory only)")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between log appends")
+    args = parser.parse_args()
+    if args.log is None: # data/ next to code/ -- not via resources, that pulls in pygame
+        args.log = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "global.log")
+
+    server = LeaderboardServer(args.host, args.port, args.log, args.interval)
+    try: asyncio.run(server.serve_forever())
+    except KeyboardInterrupt: print("stopped -- score log written")
+
+
+if __name__ == "__main__":
+    main()
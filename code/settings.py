@@ -20,11 +20,58 @@ class Settings:
 
         # game constants / settings
         self.FPS = 80
+        self.uncapped = False  # run as fast as possible -- FPS still sets the frame budget in metrics
+        self.pacing = "tick"  # tick / busy / hybrid / vsync -- CPU spent waiting against even frame intervals (see pacing.py)
+        self.spin_margin = 0.001  # hybrid -- seconds before a frame's deadline the wait stops sleeping & spins -- covers most sleep overshoot
         self.speed = 5
+        self.background_speed = 0.0  # background scroll, px per frame at medium size -- 0 keeps it in the cached backdrop
         self.gravity = 0.25
         self.pipe_spawn_time = 1300  # ms
         self.bird_flap_time = 200  # ms
         self.double_click_interval = 0.4  # seconds
+        self.seed = None  # fixed seed for pipe layouts -- None picks a random one for every run
+        self.leaderboard_size = 100  # entries kept in the leaderboard & shown (scrolling) in its panel
+
+        # audio
+        self.sound_enabled = True
+        self.sound_volume = 0.6
+        self.audio_channels = 6  # reserved voices -- extra sounds steal the oldest one
+
+        # ghost racing -- best leaderboard runs fly along as see-through birds, 0 turns them off
+        self.ghost_count = 7
+        self.ghost_file = None  # race these replays instead (leaderboard or submissions file)
+
+        # drawing backend -- "surface" blits in software, "texture" draws with an SDL renderer (see backends.py)
+        self.renderer = "surface"
+        self.render_driver = None  # SDL render driver for "texture" -- "software" needs no GPU, None picks the best
+
+        # drawing quality -- 0 is full, higher levels trade looks for frame time (see governor.py)
+        self.quality = 0
+        self.adaptive_quality = False  # governor picks the level from recent frame times -- opt in for slow hardware
+
+        # frame capture for highlights -- every presented frame written to this file by a background thread
+        self.capture_file = None
+        self.capture_slots = 16  # ring buffer frames -- writer behind by more drops frames instead of stalling
+        self.capture_compress = 0  # zlib level, 0 writes raw pixels
+
+        # checkpoints of the run in progress -- resumed after a crash or power loss (see checkpoint.py), None is off
+        self.checkpoint_file = None
+        self.checkpoint_interval = 40  # gameplay updates between checkpoints -- half a second at 80 FPS
+
+        # per-run analytics log -- score, duration, death cause & place of every finished run (see runlog.py), None is off
+        self.run_log_file = None
+
+        # archive of every re-playable run -- seed & inputs, indexed for top runs & random access (see archive.py), None is off
+        self.archive_file = None
+
+        # attract mode autopilot (see autopilot.py) -- planning time allowed per frame, seconds
+        self.autopilot_budget = 0.002
+
+        # global leaderboard server (see sync.py & server.py), e.g. http://10.0.0.5:8707 -- None keeps scores local
+        self.leaderboard_url = None
+
+        # Prometheus metrics on http://127.0.0.1:<port>/metrics -- None keeps the endpoint off
+        self.metrics_port = None
 
         # colors
         self.WHITE = (255, 255, 255)
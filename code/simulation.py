@@ -0,0 +1,171 @@
+"""headless game simulation -- real Bird & PipeManager rules without drawing, timers or events
+
+used to re-play recorded runs (see replay.py / verifier.py). make_game & fly set up & drive a headless Game the same
+way for tests & tools, flap_through_gaps is the scripted player they share & bot_replay records its runs
+"""
+import os
+import random
+import pygame as pg
+from settings import Settings
+from bird import Bird
+from pipes import PipeManager
+from replay import screen_of
+
+
+def init_headless():
+    """dummy video & audio so images can be loaded & converted without a window"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pg.display.init()
+    if pg.display.get_surface() is None: pg.display.set_mode((1, 1))
+
+
+def make_settings(screen, **options):
+    """settings for a recorded screen -- (width, height, medium height), set up for headless play: no sound,
+    no ghosts & fixed drawing quality, so the same inputs give the same frames on any machine. options set
+    other settings, e.g. seed=5
+
+    medium height comes from the display the run was played on and pipe scaling depends on it
+    """
+    width, height, medium_height = screen
+    settings = Settings()
+    settings.SCREEN_SIZES["medium"] = (settings.SCREEN_SIZES["medium"][0], medium_height)
+    settings.width, settings.height = width, height
+    settings.scale_factor = width / settings.SCREEN_SIZES["medium"][0]
+    settings.sound_enabled = False
+    settings.ghost_count = 0
+    settings.adaptive_quality = False
+    for name, value in options.items():
+        if not hasattr(settings, name): raise AttributeError(f"no setting {name!r}")
+        setattr(settings, name, value)
+    return settings
+
+
+def make_game(screen, start=True, **options):
+    """headless Game for make_settings(screen, **options) -- in a fresh run unless start is False"""
+    from game import Game # game imports this module
+    game = Game(make_settings(screen, **options))
+    if start:
+        game.in_start_menu = False
+        game.restart_game()
+    return game
+
+
+def hold_middle(game):
+    """jump when below mid screen & falling -- bird stays up between pipes of any gap"""
+    bird = game.bird
+    return bird.rect.centery > game.settings.height // 2 and bird.velocity >= 0
+
+
+def flap_through_gaps(game):
+    """scripted player -- jump when below middle of next gap & falling. game is a Game or a Simulation"""
+    bird, height = game.bird, game.settings.height
+    target = height // 2
+    for pipe in game.pipe_manager.pipes:
+        if pipe.bottom >= height and pipe.right > bird.rect.left: # next bottom pipe
+            target = pipe.top - height // 6  # middle of gap
+            break
+    return bird.rect.centery > target and bird.velocity >= 0
+
+
+def bot_replay(simulation, seed, frames, spam=0.0, rng=None, spawn_every=104, spawn_at=0):
+    """replay of a flap_through_gaps run on simulation -- pipe pair at frames spawn_at mod spawn_every (none if
+    spawn_every is 0), extra jumps with chance spam send the bird above the screen"""
+    rng = rng or random.Random(seed)
+    simulation.reset(seed)
+    jumps, spawns = [], []
+    for frame in range(frames):
+        spawn = bool(spawn_every) and frame % spawn_every == spawn_at
+        if spawn: spawns.append(frame)
+        jump = flap_through_gaps(simulation) or rng.random() < spam
+        if jump: jumps.append(frame)
+        if not simulation.step(jump, spawn): break
+    return {"seed": seed, "screen": list(screen_of(simulation.settings)), "frames": simulation.frame,
+            "score": simulation.score, "jumps": jumps, "spawns": spawns}
+
+
+def fly(game, frames, jump=None, spawn_every=104, draw=False):
+    """`frames` updates of game without timers -- a pipe pair every spawn_every run frames, jump(game) decides
+    flaps (game's own controller / keys if None). both logged to the run's recorder like a live run's. once the
+    run is over only the screen keeps scrolling"""
+    for _ in range(frames):
+        if game.game_active and not game.game_paused:
+            frame = game.run_frame
+            if spawn_every and frame % spawn_every == 0:
+                game.pipe_manager.spawn_pipe()
+                game.recorder.spawn(frame)
+            if jump(game) if jump else game.wants_jump():
+                game.bird.jump()
+                game.recorder.jump(frame)
+        game.update()
+        if draw: game.draw()
+
+
+PIPE, FLOOR, CEILING = 1, 2, 3  # death causes
+
+
+def death_cause(bird, pipe_manager, settings):
+    """what the bird just hit -- PIPE, FLOOR or CEILING, None while alive"""
+    # check pipe collisions
+    if pipe_manager.check_collision(bird.rect): return PIPE
+
+    # check boundary collisions
+    floor_height = settings.height - settings.height // 10
+    if bird.rect.bottom >= floor_height: return FLOOR
+    if bird.rect.top <= -100: return CEILING
+    return None
+
+
+def check_collisions(bird, pipe_manager, settings):
+    """True while bird is alive -- one rule for Game and Simulation"""
+    return death_cause(bird, pipe_manager, settings) is None
+
+
+class Simulation:
+    def __init__(self, settings, seed=0):
+        self.settings = settings
+        self.bird = Bird(settings)
+        self.pipe_manager = PipeManager(settings)
+        self.reset(seed)
+
+    def reset(self, seed):
+        """start new run -- same as Game.start_run"""
+        self.bird.reset()
+        self.pipe_manager.reset()
+        self.pipe_manager.rng.seed(seed)
+        self.score = 0
+        self.frame = 0
+        self.alive = True
+
+    def step(self, jump=False, spawns=0):
+        """one gameplay frame -- same order as Game.handle_events then Game.update"""
+        for _ in range(spawns): self.pipe_manager.spawn_pipe()
+        if jump: self.bird.jump()
+
+        self.pipe_manager.update()
+        if self.pipe_manager.check_score(self.bird.rect.centerx): self.score += 1
+        self.bird.update()
+
+        self.alive = check_collisions(self.bird, self.pipe_manager, self.settings)
+        self.frame += 1
+        return self.alive
+
+    def play(self, jumps, spawns, max_frames):
+        """replay input log (sorted frame numbers of jumps & pipe spawns) until bird dies or max_frames"""
+        ji = si = 0
+        n_jumps, n_spawns = len(jumps), len(spawns)
+        while self.alive and self.frame < max_frames:
+            frame = self.frame
+
+            spawned = 0
+            while si < n_spawns and spawns[si] == frame:
+                spawned += 1
+                si += 1
+
+            jump = False
+            while ji < n_jumps and jumps[ji] == frame:
+                jump = True
+                ji += 1
+
+            self.step(jump, spawned)
+        return self.score
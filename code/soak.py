@@ -0,0 +1,299 @@
+"""headless soak test -- drives the real Game loop through scripted sessions and tracks memory with tracemalloc
+
+    python code/soak.py --frames 2000000
+
+every session goes menu -> leaderboard -> countdown -> play -> pause -> game over -> name entry -> menu
+run from project root (same as main.py) -- exits with 1 if memory or per frame allocations grow in steady state
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+from settings import Settings
+from game import Game
+from simulation import flap_through_gaps
+
+SCENES = ("menu", "leaderboard", "countdown", "play", "pause", "game_over", "name_entry")
+
+
+def scene_of(game):
+    """name of scene the game is currently showing"""
+    if game.countdown_active: return "countdown"
+    if game.in_start_menu: return "leaderboard" if game.show_leaderboard else "menu"
+    if game.game_active: return "pause" if game.game_paused else "play"
+    return "name_entry" if game.score_system.show_name_input else "game_over"
+
+
+class SimulatedClock:
+    """game time advanced by exactly one frame per step -- so countdown etc. don't wait for wall time"""
+    def __init__(self, fps):
+        self.fps = fps
+        self.frame = 0
+
+    def __call__(self):
+        return self.frame / self.fps
+
+
+class ScriptedSession:
+    """scripted player -- posts mouse & key events like a real one and flies the bird through a few pipes"""
+    def __init__(self, game, target_score=2):
+        self.game = game
+        self.target_score = target_score
+        self.scene = None
+        self.scene_frame = 0
+        self.sessions = 0
+        self.visited_leaderboard = False
+        self.paused_once = False
+        self.typed = ""
+
+        game.controller = self.fly
+
+    def post(self, event_type, **attrs):
+        pg.event.post(pg.event.Event(event_type, **attrs))
+
+    def click(self, widget):
+        pos = widget.rect.center
+        self.post(pg.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+        self.post(pg.MOUSEBUTTONDOWN, pos=pos, button=1)
+        self.post(pg.MOUSEBUTTONUP, pos=pos, button=1)
+
+    def key(self, key, unicode=""):
+        self.post(pg.KEYDOWN, key=key, unicode=unicode, mod=0)
+
+    def fly(self, game):
+        """bot -- flap when below middle of next gap, stop flapping after target score to crash on purpose"""
+        if self.paused_once and game.score_system.score >= self.target_score: return False
+        return flap_through_gaps(game)
+
+    def before_frame(self, scene):
+        """queue input for coming frame"""
+        if scene != self.scene:
+            if scene == "menu" and self.scene in ("game_over", "name_entry"): self.new_session()
+            self.scene, self.scene_frame = scene, 0
+        self.scene_frame += 1
+        f = self.scene_frame
+        game = self.game
+
+        if scene == "menu" and f == 20:
+            self.click(game.ui.start_button if self.visited_leaderboard else game.leaderboard_button)
+            self.visited_leaderboard = True
+
+        elif scene == "leaderboard":
+            if f == 10: self.post(pg.MOUSEWHEEL, x=0, y=-1, flipped=False)
+            elif f == 20: self.post(pg.MOUSEWHEEL, x=0, y=1, flipped=False)
+            elif f == 40: self.click(game.leaderboard_panel.close_button)
+
+        elif scene == "play" and not self.paused_once and game.score_system.score >= self.target_score:
+            self.key(pg.K_p)
+            self.paused_once = True
+
+        elif scene == "pause" and f == 30: self.click(game.ui.resume_button)
+
+        elif scene == "name_entry":
+            if f > 5 and len(self.typed) < 4:
+                char = "soak"[len(self.typed)]
+                self.typed += char
+                self.key(ord(char), char)
+            elif f == 15: self.key(pg.K_RETURN)
+
+        # every other session goes straight back in with Play Again
+        elif scene == "game_over" and f == 30:
+            self.click(game.ui.again_button if self.sessions % 2 else game.ui.menu_button)
+            if self.sessions % 2: self.new_session()
+
+    def new_session(self):
+        self.sessions += 1
+        self.visited_leaderboard = False
+        self.paused_once = False
+        self.typed = ""
+
+        # empty leaderboard so name entry shows up every session
+        with open(self.game.score_system.leaderboard_file, 'w') as file:
+            json.dump({"scores": []}, file)
+
+
+class SceneStats:
+    def __init__(self):
+        self.frames = 0
+        self.window_allocs = []  # transient bytes allocated by each frame of current window
+        self.window_memory = None  # lowest traced memory after a frame of current window
+        self.windows = []  # (median alloc per frame, lowest traced memory) -- one per steady state window
+        self.baseline = None  # first snapshot after warmup
+        self.latest = None
+
+    def add_frame(self, alloc, memory):
+        self.window_allocs.append(alloc)
+        if self.window_memory is None or memory < self.window_memory: self.window_memory = memory
+
+    def close_window(self):
+        if self.window_allocs:
+            self.windows.append((statistics.median(self.window_allocs), self.window_memory))
+        self.window_allocs.clear()
+        self.window_memory = None
+
+    def steady_state(self):
+        """(early, late) medians of (alloc per frame, memory) -- None until two windows are closed"""
+        if len(self.windows) < 2: return None
+        half = len(self.windows) // 2
+        early, late = self.windows[:half], self.windows[half:]
+        return (
+            (statistics.median(w[0] for w in early), statistics.median(w[1] for w in early)),
+            (statistics.median(w[0] for w in late), statistics.median(w[1] for w in late)),
+        )
+
+
+class SoakHarness:
+    def __init__(self, frames, interval=5003, warmup=None, max_growth=64 * 1024, max_alloc_growth=1.25, seed=0):
+        self.frames = frames
+        self.interval = interval  # prime by default so samples land on every scene over time
+        self.warmup = warmup if warmup is not None else max(frames // 10, interval * 2)
+        self.max_growth = max_growth  # bytes of traced memory a scene may gain between early & late steady state
+        self.max_alloc_growth = max_alloc_growth  # allowed ratio of late vs early per frame allocation
+        self.seed = seed
+        self.scenes = {scene: SceneStats() for scene in SCENES}
+
+    def setup(self):
+        random.seed(self.seed)
+        pg.init()
+        settings = Settings()
+        settings.seed = self.seed
+        game = Game(settings)
+
+        # timers run on wall time -- replaced by events posted on simulated frames
+        pg.time.set_timer(settings.SPAWNPIPE, 0)
+        pg.time.set_timer(settings.BIRDFLAP, 0)
+        self.spawn_frames = max(1, round(settings.pipe_spawn_time * settings.FPS / 1000))
+        self.flap_frames = max(1, round(settings.bird_flap_time * settings.FPS / 1000))
+
+        self.clock = SimulatedClock(settings.FPS)
+        game.now = self.clock
+
+        game.score_system.verifier.start(wait=True) # worker process & its threads up before anything is traced
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        game.score_system.leaderboard_file = os.path.join(self.tmpdir.name, "leaderboard.json")
+
+        self.game = game
+        self.script = ScriptedSession(game)
+        self.script.new_session()
+        self.script.sessions = 0
+
+    def snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, statistics.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def sample(self, scene):
+        """periodic snapshot -- attributed to current scene"""
+        for stats in self.scenes.values(): stats.close_window()
+
+        snapshot = self.snapshot()
+        stats = self.scenes[scene]
+        if stats.baseline is None: stats.baseline = snapshot
+        stats.latest = snapshot
+
+    def run(self):
+        self.setup()
+        game, script, clock = self.game, self.script, self.clock
+        settings = game.settings
+
+        tracemalloc.start(8)
+        try:
+            for frame in range(self.frames):
+                clock.frame = frame
+                scene = scene_of(game)
+                stats = self.scenes[scene]
+                stats.frames += 1
+
+                if frame % self.spawn_frames == 0: script.post(settings.SPAWNPIPE)
+                if frame % self.flap_frames == 0: script.post(settings.BIRDFLAP)
+                script.before_frame(scene)
+
+                start = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                game.step()
+
+                if frame >= self.warmup:
+                    current, peak = tracemalloc.get_traced_memory()
+                    stats.add_frame(peak - start, current)
+                    if (frame - self.warmup) % self.interval == 0: self.sample(scene_of(game))
+        finally:
+            tracemalloc.stop()
+            self.tmpdir.cleanup()
+
+        return self.report()
+
+    def report(self):
+        """check steady state -- returns list of failures"""
+        failures = []
+        for scene, stats in self.scenes.items():
+            stats.close_window()
+            steady = stats.steady_state()
+            if steady is None: continue
+            (early_alloc, early_memory), (late_alloc, late_memory) = steady
+
+            if late_memory - early_memory > self.max_growth:
+                failures.append(f"{scene}: traced memory grew by {(late_memory - early_memory) / 1024:.1f} KiB")
+            if late_alloc > early_alloc * self.max_alloc_growth + 1024:
+                failures.append(f"{scene}: per frame allocation grew from {early_alloc:.0f} B to {late_alloc:.0f} B")
+        return failures
+
+    def print_report(self, failures, top=5):
+        print(f"{'scene':<12}{'frames':>10}{'mem growth':>14}{'alloc/frame early -> late':>30}")
+        for scene, stats in self.scenes.items():
+            growth = allocs = "-"
+            steady = stats.steady_state()
+            if steady:
+                (early_alloc, early_memory), (late_alloc, late_memory) = steady
+                growth = f"{(late_memory - early_memory) / 1024:+.1f} KiB"
+                allocs = f"{early_alloc:.0f} B -> {late_alloc:.0f} B"
+            print(f"{scene:<12}{stats.frames:>10}{growth:>14}{allocs:>30}")
+
+        # growth by call site -- per scene, latest snapshot vs first steady state one
+        for scene, stats in self.scenes.items():
+            if stats.latest is stats.baseline: continue
+            diffs = [d for d in stats.latest.compare_to(stats.baseline, 'lineno') if d.size_diff > 0][:top]
+            if not diffs: continue
+            print(f"\n[{scene}] top allocation growth by call site")
+            for diff in diffs:
+                frame = diff.traceback[0]
+                print(f"  {diff.size_diff / 1024:+9.1f} KiB {diff.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+
+        print()
+        if failures:
+            print("SOAK FAILED")
+            for failure in failures: print(f"  {failure}")
+        else: print("soak ok -- memory & per frame allocations flat in steady state")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="headless soak test of the game loop")
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    parser.add_argument("--interval", type=int, default=5003, help="frames between tracemalloc snapshots")
+    parser.add_argument("--warmup", type=int, default=None, help="frames ignored while caches fill up")
+    parser.add_argument("--max-growth", type=int, default=64 * 1024, help="bytes a scene may grow in steady state")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    harness = SoakHarness(args.frames, args.interval, args.warmup, args.max_growth, seed=args.seed)
+    failures = harness.run()
+    harness.print_report(failures)
+    pg.quit()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""global leaderboard sync -- submits scores to & fetches the top scores from a leaderboard server (see server.py)
+
+an asyncio loop on a background thread does all network work over one keep-alive HTTP/1.1 connection. the game
+thread never waits on it: submit() appends to a deque & pokes the loop, poll() pops the newest top scores if any
+came in. deque append & popleft are atomic, so neither side takes a lock.
+
+    POST /scores   {"scores": [{"name", "score"}, ...]}   -> 200 {"accepted": n}
+    GET  /top?n=N  If-None-Match: <etag>                  -> 200 {"scores": [...]} + ETag, or 304
+
+submissions queued together go out as one POST. while the server can't be reached they wait in the outbox --
+written to a spool file so they survive a restart -- & are retried with exponential backoff
+"""
+import os
+import json
+import atexit
+import asyncio
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+TOP = 100  # scores fetched -- the game passes settings.leaderboard_size
+
+
+class ServerError(Exception):
+    pass
+
+
+class LeaderboardSync:
+    def __init__(self, url, spool=None, top=TOP, interval=10.0, batch=64, linger=0.02, timeout=5.0, retry=1.0, max_retry=60.0):
+        parts = urlsplit(url)
+        if parts.scheme != "http": raise ValueError(f"leaderboard url must be http://, got {url!r}")
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.host_header = parts.netloc
+        self.base = parts.path.rstrip("/")
+        self.spool = spool
+        self.top = top
+        self.interval = interval  # seconds between top score fetches
+        self.batch = batch  # most submissions per POST
+        self.linger = linger  # wait this long after a submission for more to go in the same POST
+        self.timeout = timeout
+        self.retry, self.max_retry = retry, max_retry  # backoff after a failed exchange, doubled up to max_retry
+
+        self.outbox = deque(self.read_spool())  # not yet accepted by the server -- game thread appends, loop pops
+        self.updates = deque(maxlen=1)  # newest top scores for the render loop
+        self.spooled = bool(self.outbox)
+        self.want_top = True
+        self.etag = None
+        self.reader = self.writer = None
+        self.loop = self.thread = self.task = None
+
+        # stats
+        self.online = False
+        self.connections = 0
+        self.posts = 0
+        self.sent = 0
+        self.fetches = 0
+        self.not_modified = 0
+        self.failures = 0
+
+    # -------- game thread -------- #
+
+    def start(self):
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(ready,), name="leaderboard-sync", daemon=True)
+        self.thread.start()
+        ready.wait()
+        atexit.register(self.close)
+        return self
+
+    def submit(self, entry):
+        """queue a score -- returns at once. the game only submits runs its replay check accepted (ScoreSystem.settle)"""
+        self.outbox.append({"name": entry["name"], "score": entry["score"]})
+        self.poke()
+
+    def refresh(self):
+        """fetch top scores now instead of at the next interval -- leaderboard just opened"""
+        self.want_top = True
+        self.poke()
+
+    def poll(self):
+        """newest top scores since last poll, None if nothing new -- cheap enough for every frame"""
+        try: return self.updates.popleft()
+        except IndexError: return None
+
+    def poke(self):
+        loop = self.loop
+        if loop is None: return
+        try: loop.call_soon_threadsafe(self.wake.set)
+        except RuntimeError: pass # loop already closed
+
+    def close(self, timeout=2.0):
+        """stop the loop -- whatever wasn't sent stays in the spool file for next start. the loop thread writes it on
+        its way out; still busy after timeout, it's left to finish -- never two threads on the same temp file"""
+        if self.thread is None: return
+        try: self.loop.call_soon_threadsafe(self.task.cancel)
+        except RuntimeError: pass
+        self.thread.join(timeout)
+        if not self.thread.is_alive(): self.write_spool() # loop gone -- scores submitted after it stopped
+        self.thread = None
+
+    # -------- loop thread -------- #
+
+    def run(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.wake = asyncio.Event()
+        self.task = self.loop.create_task(self.main())
+        ready.set()
+        try: self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError: pass
+        finally:
+            self.disconnect()
+            self.write_spool()
+            self.loop.run_until_complete(asyncio.sleep(0)) # lets the transport finish closing
+            self.loop.close()
+
+    async def main(self):
+        loop = asyncio.get_running_loop()
+        delay = self.retry
+        next_fetch = 0
+        while True:
+            try:
+                while self.outbox: await self.flush()
+                if self.want_top or loop.time() >= next_fetch:
+                    self.want_top = False
+                    await self.fetch_top()
+                    next_fetch = loop.time() + self.interval
+                self.online = True
+                delay = self.retry
+            except (OSError, EOFError, asyncio.TimeoutError, ServerError, ValueError) as e:
+                if self.online: print(f"leaderboard server unreachable, retrying: {e!r}")
+                self.online = False
+                self.failures += 1
+                self.disconnect()
+                self.write_spool()
+                await asyncio.sleep(delay) # backoff -- submissions meanwhile just queue up
+                delay = min(delay * 2, self.max_retry)
+                continue
+
+            self.wake.clear()
+            if self.outbox or self.want_top: continue # came in during the exchange
+            try: await asyncio.wait_for(self.wake.wait(), max(0, next_fetch - loop.time()))
+            except asyncio.TimeoutError: pass
+            if self.outbox: await asyncio.sleep(self.linger) # let a burst gather into one POST
+
+    async def flush(self):
+        """one POST of up to `batch` queued submissions -- removed from outbox once the server took them"""
+        entries = [self.outbox[i] for i in range(min(self.batch, len(self.outbox)))]
+        status, _, body = await self.request("POST", "/scores", json.dumps({"scores": entries}).encode())
+        if status >= 500: raise ServerError(f"POST /scores: {status}")
+        if status != 200: print(f"leaderboard server refused {len(entries)} scores: {status} {body[:200]!r}")
+        for _ in entries: self.outbox.popleft() # refused ones would be refused again -- dropped
+        self.posts += 1
+        self.sent += len(entries)
+        if not self.outbox and self.spooled: self.write_spool()
+        self.want_top = True # board may have changed
+
+    async def fetch_top(self):
+        headers = [f"If-None-Match: {self.etag}"] if self.etag else []
+        status, response_headers, body = await self.request("GET", f"/top?n={self.top}", headers=headers)
+        self.fetches += 1
+        if status == 304:
+            self.not_modified += 1
+            return
+        if status != 200: raise ServerError(f"GET /top: {status}")
+        self.updates.append(json.loads(body)["scores"])
+        self.etag = response_headers.get("etag")
+
+    # -------- HTTP/1.1 over one stream -------- #
+
+    async def request(self, method, path, body=None, headers=()):
+        """(status, headers, body) -- a kept-alive connection the server dropped meanwhile is redialed once"""
+        for attempt in range(2):
+            fresh = self.writer is None
+            if fresh: await self.connect()
+            try:
+                return await asyncio.wait_for(self.exchange(method, path, body, headers), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.disconnect()
+                if fresh or attempt: raise
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        self.connections += 1
+
+    def disconnect(self):
+        if self.writer is not None: self.writer.close()
+        self.reader = self.writer = None
+
+    async def exchange(self, method, path, body, headers):
+        lines = [f"{method} {self.base}{path} HTTP/1.1", f"Host: {self.host_header}", *headers]
+        if body is not None: lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n": break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        length = int(response_headers.get("content-length", 0))
+        data = await self.reader.readexactly(length) if length else b""
+        if response_headers.get("connection", "").lower() == "close": self.disconnect()
+        return status, response_headers, data
+
+    # -------- spool -------- #
+
+    def read_spool(self):
+        if not self.spool: return []
+        try:
+            with open(self.spool, 'r') as file: return json.load(file)
+        except FileNotFoundError: return []
+        except (OSError, ValueError) as e:
+            print(f"leaderboard spool unreadable, starting empty: {e}")
+            return []
+
+    def write_spool(self):
+        """outbox to spool file -- temp file & rename, a crash leaves the old one intact. removed once empty"""
+        if not self.spool: return
+        entries = list(self.outbox)
+        try:
+            if entries:
+                os.makedirs(os.path.dirname(os.path.abspath(self.spool)), exist_ok=True)
+                with open(self.spool + ".tmp", 'w') as file: json.dump(entries, file)
+                os.replace(self.spool + ".tmp", self.spool)
+            elif os.path.exists(self.spool): os.remove(self.spool)
+            self.spooled = bool(entries)
+        except OSError as e:
+            print(f"error writing leaderboard spool: {e}")
@@ -0,0 +1,309 @@
+"""neuroevolution trainer for the AI player -- a population of small networks evolved on the game's own rules
+
+    python code/trainer.py --generations 60 --workers 4
+    python code/trainer.py --until-perfect 5           # stop once the best flew every course 5 generations running
+    python code/trainer.py --resume                     # carry on from data/trainer.json
+    python code/main.py --ai data/player.json           # watch the freshly trained player
+    python code/trainer.py --promote data/player.json   # make it the bundled player (assets/ai/player.json)
+    python code/main.py --ai                            # watch the bundled player
+
+genomes are weights of a fixed 5-6-1 tanh network (see NeuralPlayer). every generation is scored on seeded courses
+-- Simulation with pipes spawned on the game's frame count, one course per (screen size, seed) -- in batches on a
+process pool. fitness is frames survived plus a bonus per pipe passed, summed over courses. the best genomes go on
+unchanged, the rest are bred by tournament, uniform crossover & gaussian mutation. population is checkpointed
+after every generation. training writes to data/ -- the bundled player only changes through --promote
+"""
+import os
+import json
+import math
+import time
+import random
+import argparse
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+INPUTS, HIDDEN = 5, 6
+WEIGHTS = HIDDEN * (INPUTS + 1) + HIDDEN + 1
+SCREENS = ((480, 720, 683), (600, 683, 683), (720, 1200, 683))  # small, medium of a 768 px display, large
+SCORE_BONUS = 200  # fitness per pipe passed -- passing beats hovering
+PLAYER = "ai/player.json"  # bundled network, under assets/
+
+_simulations = {}  # per process -- one Simulation per screen so images load only once
+
+
+# ---------------- Player ---------------- #
+
+def sense(bird, pipe_manager, settings):
+    """network inputs -- next gap's edges & distance relative to bird, velocity, floor. ~100 px units so one
+    network flies every screen size (gravity & jump are in pixels, not scaled)"""
+    y = bird.rect.centery
+    gap_bottom, dx = settings.height // 2 + settings.height // 6, settings.width  # nothing ahead -- aim mid screen
+    for pipe in pipe_manager.pipes:
+        if pipe.bottom >= settings.height and pipe.right > bird.rect.left: # next bottom pipe -- top is a pipe_heights entry
+            gap_bottom, dx = pipe.top, pipe.left - bird.rect.right
+            break
+    gap_top = gap_bottom - settings.height // 3
+    floor = settings.height - settings.height // 10
+    return (gap_bottom - y) / 100, (y - gap_top) / 100, bird.velocity / 10, dx / 100, (floor - y) / 100
+
+
+def activate(weights, inputs):
+    """5-6-1 tanh network -- True to jump"""
+    out = weights[WEIGHTS - 1]
+    w = 0
+    for h in range(HIDDEN):
+        total = weights[w + INPUTS]  # bias
+        for i in range(INPUTS): total += weights[w + i] * inputs[i]
+        w += INPUTS + 1
+        out += weights[HIDDEN * (INPUTS + 1) + h] * math.tanh(total)
+    return out > 0
+
+
+class NeuralPlayer:
+    """trained network as a Game controller -- game.controller = NeuralPlayer.load()"""
+    def __init__(self, weights):
+        if len(weights) != WEIGHTS: raise ValueError(f"network needs {WEIGHTS} weights, got {len(weights)}")
+        self.weights = array('d', weights)
+
+    @classmethod
+    def load(cls, path=None):
+        """network file written by the trainer -- bundled one when no path given"""
+        if path is None:
+            import resources
+            path = resources.asset_file(PLAYER)
+            if path is None: raise FileNotFoundError(f"no bundled player ({PLAYER})")
+        if isinstance(path, str):
+            with open(path, 'r') as file: return cls(json.load(file)["weights"])
+        return cls(json.load(path)["weights"])
+
+    def __call__(self, game):
+        return activate(self.weights, sense(game.bird, game.pipe_manager, game.settings))
+
+
+# ---------------- Evaluation ---------------- #
+
+def get_simulation(screen):
+    from simulation import make_settings, Simulation # pygame stuff imported only where it's needed
+    simulation = _simulations.get(screen)
+    if simulation is None:
+        simulation = Simulation(make_settings(screen))
+        _simulations[screen] = simulation
+    return simulation
+
+
+def run_course(weights, screen, seed, max_frames):
+    """(frames survived, pipes passed) -- pipes spawn every frame count the game's timer would"""
+    simulation = get_simulation(screen)
+    settings = simulation.settings
+    spawn_frames = max(1, round(settings.pipe_spawn_time * settings.FPS / 1000))
+    bird, pipes = simulation.bird, simulation.pipe_manager
+    simulation.reset(seed)
+    while simulation.alive and simulation.frame < max_frames:
+        jump = activate(weights, sense(bird, pipes, settings))
+        simulation.step(jump, int(simulation.frame % spawn_frames == 0))
+    return simulation.frame, simulation.score
+
+
+def evaluate_batch(job):
+    """(genomes, courses, max frames) -> [(fitness, pipes passed, frames)] per genome"""
+    genomes, courses, max_frames = job
+    results = []
+    for genome in genomes:
+        weights = array('d')
+        weights.frombytes(genome)
+        fitness = passed = frames = 0
+        for screen, seed in courses:
+            survived, score = run_course(weights, screen, seed, max_frames)
+            fitness += survived + SCORE_BONUS * score
+            passed += score
+            frames += survived
+        results.append((fitness, passed, frames))
+    return results
+
+
+def init_worker():
+    from simulation import init_headless
+    init_headless()
+
+
+# ---------------- Evolution ---------------- #
+
+def random_genome(rng):
+    return [rng.gauss(0, 1) for _ in range(WEIGHTS)]
+
+
+def breed(population, fitness, rng, elite=4, tournament=3, mutation=0.15, sigma=0.4):
+    """next generation -- elite kept as is, children of tournament winners fill the rest"""
+    ranked = sorted(range(len(population)), key=fitness.__getitem__, reverse=True)
+    children = [population[i] for i in ranked[:elite]]
+
+    def pick():
+        return population[max(rng.sample(range(len(population)), tournament), key=fitness.__getitem__)]
+
+    while len(children) < len(population):
+        a, b = pick(), pick()
+        child = [x if rng.random() < 0.5 else y for x, y in zip(a, b)]
+        for i in range(WEIGHTS):
+            if rng.random() < mutation: child[i] += rng.gauss(0, sigma)
+        children.append(child)
+    return children
+
+
+class Trainer:
+    def __init__(self, population=80, courses=3, max_frames=8000, seed=0, workers=None, batch=8):
+        self.size = population
+        self.courses = courses  # seeds per screen size per generation
+        self.max_frames = max_frames
+        self.seed = seed
+        self.workers = workers
+        self.batch = batch  # genomes per pool task
+        self.generation = 0
+        self.population = None
+        self.best = None  # {"generation", "fitness", "passed", "weights"} -- best genome seen so far
+        self.pool = None
+
+    def rng(self):
+        """generation's own rng -- a resumed run breeds & draws courses exactly like an uninterrupted one"""
+        return random.Random(f"{self.seed}-{self.generation}")
+
+    def draw_courses(self, rng):
+        return [(screen, rng.getrandbits(32)) for screen in SCREENS for _ in range(self.courses)]
+
+    def evaluate(self, courses):
+        """score population on courses -- batches on the process pool"""
+        genomes = [array('d', genome).tobytes() for genome in self.population]
+        jobs = [(genomes[i:i + self.batch], courses, self.max_frames) for i in range(0, len(genomes), self.batch)]
+        if self.workers == 1:
+            init_worker()
+            batches = map(evaluate_batch, jobs)
+        else:
+            if self.pool is None:
+                # spawn -- forking a process that already runs SDL is not safe
+                context = multiprocessing.get_context("spawn")
+                self.pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=init_worker)
+            batches = self.pool.map(evaluate_batch, jobs)
+        return [result for batch in batches for result in batch]
+
+    def step(self):
+        """one generation -- evaluate, remember best, breed. returns (results, courses)"""
+        rng = self.rng()
+        if self.population is None: self.population = [random_genome(rng) for _ in range(self.size)]
+        courses = self.draw_courses(rng)
+        results = self.evaluate(courses)
+
+        fitness = [fit for fit, _, _ in results]
+        top = max(range(len(results)), key=fitness.__getitem__)
+        if self.best is None or fitness[top] >= self.best["fitness"]:
+            self.best = {"generation": self.generation, "fitness": fitness[top], "passed": results[top][1],
+                         "weights": list(self.population[top])}
+
+        self.population = breed(self.population, fitness, rng)
+        self.generation += 1
+        return results, courses
+
+    def perfect(self, results, courses):
+        """best genome of the generation flew every course to the end"""
+        return max(frames for _, _, frames in results) == self.max_frames * len(courses)
+
+    def close(self):
+        if self.pool is not None: self.pool.shutdown()
+        self.pool = None
+
+    # -------- checkpoints -------- #
+
+    def save(self, path):
+        """population & best so far -- written to a temp file & renamed, a crash leaves the old one intact"""
+        state = {
+            "generation": self.generation, "seed": self.seed, "max_frames": self.max_frames, "courses": self.courses,
+            "population": self.population, "best": self.best,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", 'w') as file: json.dump(state, file)
+        os.replace(path + ".tmp", path)
+
+    def load(self, path):
+        with open(path, 'r') as file: state = json.load(file)
+        self.generation, self.seed = state["generation"], state["seed"]
+        self.max_frames, self.courses = state["max_frames"], state["courses"]
+        self.population, self.best = state["population"], state["best"]
+        self.size = len(self.population)
+
+
+def save_player(best, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({"inputs": INPUTS, "hidden": HIDDEN, "generation": best["generation"], "fitness": best["fitness"],
+                   "weights": best["weights"]}, file)
+
+
+def promote(path, bundled=None):
+    """trained network at path becomes the bundled player -- checked to load first, temp file & rename"""
+    if bundled is None:
+        import resources
+        bundled = resources.asset_path(PLAYER)
+    NeuralPlayer.load(path) # wrong shape or not a network -- bundled one left alone
+    with open(path, 'r') as file: data = file.read()
+    os.makedirs(os.path.dirname(os.path.abspath(bundled)), exist_ok=True)
+    with open(bundled + ".tmp", 'w') as file: file.write(data)
+    os.replace(bundled + ".tmp", bundled)
+    return bundled
+
+
+def main():
+    import resources
+
+    parser = argparse.ArgumentParser(description="evolve the AI player")
+    parser.add_argument("--generations", type=int, default=60)
+    parser.add_argument("--population", type=int, default=80)
+    parser.add_argument("--courses", type=int, default=3, help="seeded courses per screen size per generation")
+    parser.add_argument("--max-frames", type=int, default=8000, help="a course ends here if the bird is still alive")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=resources.data_path("trainer.json"))
+    parser.add_argument("--resume", action="store_true", help="carry on from the checkpoint")
+    parser.add_argument("--out", default=resources.data_path("player.json"), help="best network goes here")
+    parser.add_argument("--promote", metavar="FILE", help="copy this trained network over the bundled player & exit")
+    parser.add_argument("--until-perfect", type=int, default=0,
+                        help="stop once the best genome finished every course this many generations in a row")
+    args = parser.parse_args()
+
+    if args.promote:
+        print(f"{args.promote} -> {promote(args.promote)}")
+        return
+
+    trainer = Trainer(args.population, args.courses, args.max_frames, args.seed, args.workers)
+    if args.resume:
+        trainer.load(args.checkpoint)
+        print(f"resumed at generation {trainer.generation}")
+
+    start = time.perf_counter()
+    generations = frames = streak = 0
+    try:
+        while trainer.generation < args.generations:
+            gen_start = time.perf_counter()
+            results, courses = trainer.step()
+            trainer.save(args.checkpoint)
+            generations += 1
+            frames += sum(f for _, _, f in results)
+            elapsed = time.perf_counter() - start
+
+            best = max(results)
+            mean = sum(fit for fit, _, _ in results) / len(results)
+            print(f"gen {trainer.generation - 1:4d}  best {best[0]:8.0f} ({best[1]} pipes)  mean {mean:8.0f}  "
+                  f"{time.perf_counter() - gen_start:5.2f}s  {generations / elapsed:.2f} gen/s  {frames / elapsed:,.0f} frames/s")
+
+            streak = streak + 1 if trainer.perfect(results, courses) else 0
+            if args.until_perfect and streak >= args.until_perfect: break
+    except KeyboardInterrupt:
+        print("stopped -- checkpoint has the last finished generation")
+    finally:
+        trainer.close()
+
+    if trainer.best:
+        save_player(trainer.best, args.out)
+        print(f"best: generation {trainer.best['generation']}, {trainer.best['passed']} pipes -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
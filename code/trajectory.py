@@ -0,0 +1,278 @@
+"""closed form bird trajectory & exact time of impact -- replays advance from event to event instead of per frame
+
+between two jumps the bird falls under constant gravity: velocity after k updates is v0 + k*g and
+centery is y0 + the sum of those velocities, each rounded by Rect. pipes move a constant whole number of
+pixels per frame. so the frame the bird hits a pipe, the floor or the ceiling can be solved for a whole
+stretch between jumps at once -- no frame is skipped, so nothing tunnels through a thin pipe edge.
+
+AnalyticSimulation gives the same score, frame & alive as Simulation.play
+"""
+import math
+from bisect import bisect_left
+from fractions import Fraction
+import pygame as pg
+from simulation import Simulation
+
+MAX_PIPES = 8  # PipeManager.move_pipes drops older pipes past this
+
+
+def first_true(lo, hi, pred):
+    """first k in [lo, hi] where monotone pred(k) holds -- hi + 1 if none"""
+    hi += 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pred(mid): hi = mid
+        else: lo = mid + 1
+    return lo
+
+
+def exact_float(value, max_denominator=2 ** 16):
+    """value is a float sum of it stays exact over a long run"""
+    return Fraction(value).denominator <= max_denominator
+
+
+def jump_velocity(bird):
+    """velocity right after Bird.jump"""
+    velocity = bird.velocity
+    bird.jump()
+    velocity, bird.velocity = bird.velocity, velocity
+    return velocity
+
+
+def alive_bounds(settings, bird):
+    """(lo, hi) -- bird is alive while lo < centery < hi, same bounds as check_collisions"""
+    half_height = bird.rect.height // 2
+    floor_height = settings.height - settings.height // 10
+    return half_height - 100, floor_height + half_height - bird.rect.height
+
+
+class Trajectory:
+    """bird offsets after k updates from a start velocity -- one table per start velocity, shared by all stretches
+
+    continuous path is v0*k + g*k*(k+1)/2. discrete one rounds each update, which for centery >= 0 is
+    y + floor(v + 0.5) -- so offsets don't depend on where the bird starts
+    """
+    def __init__(self, velocity, gravity):
+        self.v0 = velocity
+        self.gravity = gravity
+        self.velocities = [velocity]  # same float additions as Bird.update
+        self.offsets = [0]
+        self.lows = [math.inf]  # lowest offset + velocity any update up to k rounds -- sign check for Stretch
+
+        # apex -- last update that doesn't move bird down: v0 + k*g + 0.5 < 1
+        self.apex = max(0, math.ceil((Fraction(1, 2) - Fraction(velocity)) / Fraction(gravity)) - 1)
+
+    def extend(self, k):
+        while len(self.offsets) <= k:
+            velocity = self.velocities[-1] + self.gravity
+            offset = self.offsets[-1]
+            self.velocities.append(velocity)
+            self.lows.append(min(self.lows[-1], offset + velocity))
+            self.offsets.append(offset + math.floor(velocity + 0.5))
+
+    def continuous(self, k):
+        return self.v0 * k + self.gravity * k * (k + 1) / 2
+
+    def reach(self, distance):
+        """first k the continuous path is `distance` below start on falling side"""
+        a, b = self.gravity / 2, self.v0 + self.gravity / 2
+        return max(self.apex, math.ceil((-b + math.sqrt(max(0, b * b + 4 * a * distance))) / (2 * a)))
+
+    def land(self, distance):
+        """first k the discrete path is at least `distance` below start"""
+        k = self.reach(distance) + 2  # rounding drifts from continuous path by a few pixels at most
+        self.extend(k)
+        while self.offsets[k] < distance:
+            k *= 2
+            self.extend(k)
+        return first_true(self.apex, k, lambda i: self.offsets[i] >= distance)
+
+
+class Stretch:
+    """bird from a jump (or run start) up to the next one -- y(k) is centery after k updates, k in [0, length]
+
+    rising part (k <= apex) is non increasing, falling part non decreasing -- so every search is a bisection.
+    bird above top of screen (centery < 0) rounds the other way & is stepped with a real Rect instead
+    """
+    def __init__(self, trajectory, y0, frames, lo, hi):
+        self.y0 = y0
+        self.ys = None
+        self.length = min(frames, trajectory.land(hi - y0))  # never past the floor
+
+        if y0 + trajectory.lows[self.length] >= 0:
+            self.offsets = trajectory.offsets
+            self.apex = min(trajectory.apex, self.length)
+            return
+
+        rect = pg.Rect(0, y0, 0, 0)
+        self.ys = [y0]
+        for k in range(1, frames + 1):
+            trajectory.extend(k)
+            rect.centery += trajectory.velocities[k]
+            self.ys.append(rect.centery)
+            if not lo < rect.centery < hi: break # dead -- nothing after matters
+        self.length = len(self.ys) - 1
+
+    def y(self, k):
+        return self.y0 + self.offsets[k] if self.ys is None else self.ys[k]
+
+    def first_in(self, a, b, lo, hi):
+        """first k in [a, b] with lo < y(k) < hi -- None if there's none"""
+        if self.ys is not None: return next((k for k in range(a, b + 1) if lo < self.ys[k] < hi), None)
+
+        y, m = self.y, self.apex
+        if a <= m:
+            q = min(b, m)
+            k = first_true(a, q, lambda i: y(i) < hi)
+            if k <= q and y(k) > lo: return k
+        if b >= m:
+            p = max(a, m)
+            k = first_true(p, b, lambda i: y(i) > lo)
+            if k <= b and y(k) < hi: return k
+        return None
+
+    def first_out(self, a, b, lo, hi):
+        """first k in [a, b] with y(k) <= lo or y(k) >= hi -- None if there's none"""
+        if self.ys is not None: return next((k for k in range(a, b + 1) if not lo < self.ys[k] < hi), None)
+
+        y, m = self.y, self.apex
+        if a <= m:
+            q = min(b, m)
+            if y(a) >= hi: return a
+            k = first_true(a, q, lambda i: y(i) <= lo)
+            if k <= q: return k
+        if b >= m:
+            p = max(a, m)
+            if y(p) <= lo: return p
+            k = first_true(p, b, lambda i: y(i) >= hi)
+            if k <= b: return k
+        return None
+
+
+class AnalyticSimulation:
+    """Simulation.play without stepping every frame -- O(1)ish per jump & spawn, same score, frame & alive
+
+    falls back to Simulation.play when settings or input can't be solved exactly (gravity that isn't
+    exact in floats, half pixel pipe speed, several spawns on one frame, more than MAX_PIPES on screen)
+    """
+    def __init__(self, settings, seed=0):
+        self.settings = settings
+        self.simulation = Simulation(settings, seed)
+        bird, pipe_manager = self.simulation.bird, self.simulation.pipe_manager
+
+        bird.reset()
+        self.start_y = bird.rect.centery
+        self.bird_x = bird.rect.centerx
+        self.bird_left, self.bird_right = bird.rect.left, bird.rect.right
+        self.half_height = bird.rect.height // 2
+        self.bird_height = bird.rect.height
+        self.alive_lo, self.alive_hi = alive_bounds(settings, bird)
+
+        # whole pixels pipes move per frame -- same on both sides of x = 0 or pipes can't be solved
+        shift = pipe_manager.pipe_shift()
+        probe = pg.Rect(0, 0, 0, 0)
+        steps = set()
+        for x in (10 ** 6, -10 ** 6):
+            probe.centerx = x
+            probe.centerx -= shift
+            steps.add(x - probe.centerx)
+        self.pipe_step = steps.pop() if len(steps) == 1 else 0
+
+        gravity = settings.gravity
+        self.exact = (
+            self.pipe_step > 0 and gravity > 0
+            and exact_float(gravity) and exact_float(jump_velocity(bird)) and exact_float(bird.velocity)
+        )
+        if self.exact:
+            self.fall = Trajectory(bird.velocity, gravity)
+            self.rise = Trajectory(jump_velocity(bird), gravity)
+        self.reset(seed)
+
+    def reset(self, seed):
+        self.seed = seed
+        self.simulation.reset(seed)
+        self.score = 0
+        self.frame = 0
+        self.alive = True
+
+    def play(self, jumps, spawns, max_frames):
+        """replay input log (sorted frame numbers of jumps & pipe spawns) until bird dies or max_frames"""
+        result = None
+        if self.exact and max_frames > 0 and len(set(spawns)) == len(spawns):
+            result = self.advance(jumps, spawns, max_frames)
+        if result is None: # not solvable -- step it
+            simulation = self.simulation
+            simulation.reset(self.seed)
+            simulation.play(jumps, spawns, max_frames)
+            result = (simulation.score, simulation.frame, simulation.alive)
+
+        self.score, self.frame, self.alive = result
+        return self.score
+
+    def add_pipes(self, frame, pipes, removals, crossings):
+        """spawn pair like PipeManager does & solve its frames -- False if it would hit the pipe cap"""
+        step = self.pipe_step
+        pair = self.simulation.pipe_manager.create_pipe_pair()
+
+        # pipe x after update of frame f is x0 - step * (f - frame + 1) -- gone once centerx <= -100
+        removal = frame + -(-(pair[0].centerx + 100) // step) - 1
+        removals.append(removal)
+        if 2 * (len(removals) - bisect_left(removals, frame)) > MAX_PIPES: return False
+
+        scoring = [pipe for pipe in pair if pipe.bottom >= self.settings.height]
+        if len(scoring) > 1: return False # two points on one frame -- check_score gives only one
+        for pipe in scoring: crossings.append(frame + (pipe.centerx - self.bird_x) // step)
+
+        for pipe in pair:
+            first = frame + max(0, (pipe.left - self.bird_right) // step)
+            last = min(frame + -(-(pipe.right - self.bird_left) // step) - 2, removal - 1)
+            if first <= last:
+                pipes.append((first, last, pipe.top + self.half_height - self.bird_height, pipe.bottom + self.half_height))
+        return True
+
+    def advance(self, jumps, spawns, max_frames):
+        """(score, frame, alive) solved stretch by stretch -- None if run needs stepping"""
+        self.simulation.reset(self.seed)
+        lo, hi = self.alive_lo, self.alive_hi
+
+        jumps = sorted(set(frame for frame in jumps if frame < max_frames))
+        starts = jumps if jumps[:1] == [0] else [0] + jumps
+        spawns = [frame for frame in spawns if frame < max_frames]
+
+        pipes = []  # (first frame overlapping bird, last one, lo, hi) -- bird hits pipe while lo < centery < hi
+        removals, crossings = [], []
+        si = 0
+        y = self.start_y
+        frames = max_frames
+        alive = True
+
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else max_frames
+            trajectory = self.fall if i == 0 and start not in jumps[:1] else self.rise
+
+            while si < len(spawns) and spawns[si] < end:
+                if not self.add_pipes(spawns[si], pipes, removals, crossings): return None
+                si += 1
+
+            stretch = Stretch(trajectory, y, end - start, lo, hi)
+            hit = stretch.first_out(1, stretch.length, lo, hi)
+            last = stretch.length if hit is None else hit - 1
+
+            # time of impact -- earliest k the bird box overlaps a pipe box
+            for first_frame, last_frame, pipe_lo, pipe_hi in pipes:
+                a = max(1, first_frame - start + 1)
+                b = min(last, last_frame - start + 1)
+                if a > b: continue
+                k = stretch.first_in(a, b, pipe_lo, pipe_hi)
+                if k is not None: hit, last = k, k - 1
+
+            if hit is not None:
+                frames = start + hit
+                alive = False
+                break
+
+            y = stretch.y(end - start)
+            pipes = [pipe for pipe in pipes if pipe[1] >= end]
+
+        score = sum(1 for frame in crossings if frame < frames)
+        return score, frames, alive
@@ -0,0 +1,181 @@
+"""leaderboard submission verifier -- re-plays each run headless and accepts it only if scores match
+
+    python code/verifier.py submissions.jsonl --leaderboard data/leaderboard.json
+    python code/verifier.py --audit data/leaderboard.json
+
+submissions are {"name", "score", "replay"} -- one JSON object per line. batches run on a process pool.
+the game checks its own submissions through a VerifyQueue -- re-played on a worker process, saved once they match.
+--audit re-plays a leaderboard's entries & drops every one that doesn't verify, entries without a replay too
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_FRAMES = 80 * 60 * 60 * 4  # 4 hours at 80 fps -- anything longer is not a real run
+
+_simulations = {}  # per process -- one simulation per screen so images load only once
+
+
+def get_simulation(screen):
+    from simulation import make_settings # pygame stuff imported only where it's needed
+    from trajectory import AnalyticSimulation
+    simulation = _simulations.get(screen)
+    if simulation is None:
+        simulation = AnalyticSimulation(make_settings(screen))
+        _simulations[screen] = simulation
+    return simulation
+
+
+def check_inputs(frames_list, frames):
+    """sorted, non negative ints before the last frame"""
+    previous = 0
+    for frame in frames_list:
+        if type(frame) is not int or frame < previous or frame >= frames: return False
+        previous = frame
+    return True
+
+
+def verify_replay(replay, score):
+    """re-play run -- returns (accepted, reason)"""
+    try:
+        seed, frames = replay["seed"], replay["frames"]
+        screen = tuple(int(v) for v in replay["screen"])
+        jumps, spawns = replay["jumps"], replay["spawns"]
+    except (KeyError, TypeError, ValueError):
+        return False, "malformed replay"
+
+    if type(seed) is not int or type(frames) is not int or not 0 < frames <= MAX_FRAMES:
+        return False, "bad seed or frame count"
+    if len(screen) != 3 or min(screen) <= 0:
+        return False, "bad screen"
+    if not check_inputs(jumps, frames) or not check_inputs(spawns, frames):
+        return False, "bad input log"
+
+    simulation = get_simulation(screen)
+    simulation.reset(seed)
+    simulation_score = simulation.play(jumps, spawns, frames)
+
+    if simulation.alive or simulation.frame != frames:
+        return False, f"run ends at frame {simulation.frame}, replay says {frames}"
+    if simulation_score != score:
+        return False, f"replay scores {simulation_score}, submitted {score}"
+    return True, "ok"
+
+
+def verify_submission(submission):
+    """verify one {"name", "score", "replay"} submission"""
+    if not isinstance(submission, dict) or "replay" not in submission: return False, "no replay"
+    score = submission.get("score")
+    if type(score) is not int or score < 0: return False, "bad score"
+    return verify_replay(submission["replay"], score)
+
+
+def init_worker():
+    from simulation import init_headless
+    init_headless()
+
+
+def verify_batch(submissions, workers=None, chunksize=32):
+    """verify many submissions on a process pool -- results in same order"""
+    if len(submissions) < chunksize or workers == 1:
+        init_worker()
+        return [verify_submission(submission) for submission in submissions]
+
+    # spawn -- forking a process that already runs SDL is not safe
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker) as pool:
+        return list(pool.map(verify_submission, submissions, chunksize=chunksize))
+
+
+class VerifyQueue:
+    """submissions re-played off the frame thread -- on a one process pool started at the first submit.
+    submit() returns at once, finished() hands back (submission, accepted, reason) of those done, in submit order"""
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.pool = None
+        self.pending = []  # (submission, future) in submit order
+
+    def start(self, wait=False):
+        """pool up & its worker spawned -- the first check doesn't pay for the spawn"""
+        if self.pool is None: # spawn -- forking a process that already runs SDL is not safe
+            context = multiprocessing.get_context("spawn")
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=init_worker)
+        ready = self.pool.submit(verify_submission, None)
+        if wait: ready.result()
+
+    def submit(self, submission):
+        if self.pool is None: self.start()
+        self.pending.append((submission, self.pool.submit(verify_submission, submission)))
+
+    def finished(self, wait=False):
+        """results of finished submissions -- wait blocks until every pending one is done"""
+        results = []
+        while self.pending and (wait or self.pending[0][1].done()):
+            submission, future = self.pending.pop(0)
+            try: accepted, reason = future.result()
+            except Exception as e: accepted, reason = False, f"verifier failed: {e!r}" # worker died -- not saved
+            results.append((submission, accepted, reason))
+        return results
+
+    def close(self):
+        if self.pool is not None: self.pool.shutdown()
+        self.pool = None
+
+
+def read_submissions(path):
+    submissions = []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line: continue
+            try: submissions.append(json.loads(line))
+            except ValueError: submissions.append(None) # rejected as malformed
+    return submissions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="verify leaderboard submissions by re-playing them")
+    parser.add_argument("queue", nargs="*", help="submission files -- one JSON object per line")
+    parser.add_argument("--leaderboard", help="merge accepted submissions into this leaderboard file")
+    parser.add_argument("--audit", help="re-verify entries of this leaderboard file & drop the ones that fail")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    from score_system import rank_scores
+
+    submissions = []
+    for path in args.queue: submissions.extend(read_submissions(path))
+
+    start = time.perf_counter()
+    results = verify_batch(submissions, args.workers)
+    accepted = [s for s, (ok, _) in zip(submissions, results) if ok]
+    for i, (ok, reason) in enumerate(results):
+        if not ok: print(f"rejected #{i}: {reason}")
+    if submissions:
+        elapsed = time.perf_counter() - start
+        print(f"{len(accepted)}/{len(submissions)} accepted in {elapsed:.2f}s ({len(submissions) / elapsed:.0f}/s)")
+
+    if args.leaderboard and accepted:
+        leaderboard = {"scores": []}
+        if os.path.exists(args.leaderboard):
+            with open(args.leaderboard, 'r') as file: leaderboard = json.load(file)
+        entries = [{"name": s.get("name") or "Player", "score": s["score"], "replay": s["replay"]} for s in accepted]
+        leaderboard["scores"] = rank_scores(leaderboard.get("scores", []) + entries)
+        with open(args.leaderboard, 'w') as file: json.dump(leaderboard, file)
+
+    if args.audit:
+        with open(args.audit, 'r') as file: leaderboard = json.load(file)
+        scores = leaderboard.get("scores", [])
+        results = verify_batch(scores, args.workers)
+        kept = [entry for entry, (ok, _) in zip(scores, results) if ok] # no replay -- nothing to check, dropped
+        leaderboard["scores"] = rank_scores(kept, len(scores))
+        print(f"audit: kept {len(kept)}/{len(scores)} leaderboard entries")
+        with open(args.audit, 'w') as file: json.dump(leaderboard, file)
+
+
+if __name__ == "__main__":
+    main()
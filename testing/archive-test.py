@@ -0,0 +1,138 @@
+import unittest
+import sys
+import os
+import time
+import random
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from archive import Archive, compact, pack_run, unpack_run, HEADER
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+def random_replay(rng):
+    frames = rng.randrange(100, 5000)
+    jumps = sorted(rng.sample(range(frames), rng.randrange(0, min(frames, 200))))
+    spawns = list(range(0, frames, 104))
+    return {"seed": rng.getrandbits(32), "screen": [480, 720, 683], "frames": frames,
+            "score": int(rng.expovariate(1 / 12)), "jumps": jumps, "spawns": spawns}
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "runs.archive")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_runs_read_back_across_pages(self):
+        rng = random.Random(1)
+        replays = [random_replay(rng) for _ in range(50)]
+        replays[3]["jumps"] = [0, 70000, 70001] # a delta too wide for 2 bytes
+        replays[3]["frames"] = 70002
+        with Archive(self.path, page_entries=8) as archive: # 7 pages
+            ids = [archive.append(replay) for replay in replays]
+        self.assertEqual(ids, list(range(50)))
+        self.assertEqual(unpack_run(pack_run(replays[3])), replays[3])
+
+        with Archive(self.path) as archive:
+            self.assertEqual(len(archive), 50)
+            self.assertEqual(len(archive.pages), 7)
+            for i in rng.sample(range(50), 50): self.assertEqual(archive[i], replays[i])
+            self.assertEqual(archive.find(17), 17)
+            with self.assertRaises(IndexError): archive[50]
+            with self.assertRaises(KeyError): archive.find(50)
+
+    def test_top_matches_a_sort(self):
+        rng = random.Random(2)
+        with Archive(self.path, page_entries=64) as archive:
+            for i in range(1000):
+                archive.append_packed(b"", int(rng.expovariate(1 / 12)), timestamp=1000 + i)
+            entries = [archive.entry(i) for i in range(len(archive))]
+            for n in (1, 10, 100, 2000):
+                expected = sorted(range(1000), key=lambda i: (-entries[i][1], i))[:n]
+                self.assertEqual(archive.top(n), expected)
+
+            recent = sorted(range(500, 1000), key=lambda i: (-entries[i][1], i))[:20]
+            self.assertEqual(archive.top(20, since=1500), recent)
+
+            # deleted runs make room for the next ones down
+            best = archive.top(5)
+            for index in best[:2]: archive.delete(index)
+            self.assertEqual(archive.top(5), best[2:] + archive.top(7)[3:5])
+            self.assertNotIn(best[0], archive.top(1000))
+
+    def test_appends_after_reopen_and_torn_appends_left_out(self):
+        rng = random.Random(3)
+        replays = [random_replay(rng) for _ in range(5)]
+        with Archive(self.path, page_entries=4) as archive:
+            for replay in replays[:3]: archive.append(replay)
+
+        # crash between writing a run's data & counting it -- left out, the next append takes its slot
+        with open(self.path, 'ab') as file: file.write(b"\x01" * 300)
+        with Archive(self.path) as archive:
+            self.assertEqual(len(archive), 3)
+            for replay in replays[3:]: archive.append(replay)
+            self.assertEqual([archive[i] for i in range(5)], replays)
+        with open(self.path, 'rb') as file: self.assertEqual(HEADER.unpack(file.read(HEADER.size))[1], 5)
+
+    def test_compact_keeps_ids_and_drops_runs(self):
+        rng = random.Random(4)
+        replays = [random_replay(rng) for _ in range(40)]
+        with Archive(self.path, page_entries=16) as archive:
+            for i, replay in enumerate(replays): archive.append(replay, timestamp=i)
+            for index in (0, 5, 6): archive.delete(index)
+            best = [archive.entry(index)[0] for index in archive.top(10)]
+        size = os.path.getsize(self.path)
+
+        self.assertEqual(compact(self.path), 37)
+        self.assertLess(os.path.getsize(self.path), size)
+        with Archive(self.path) as archive:
+            self.assertEqual([archive.entry(i)[0] for i in range(3)], [1, 2, 3])
+            self.assertEqual(archive[archive.find(20)], replays[20])
+            self.assertEqual(archive.entry(archive.find(20))[2], 20)
+            self.assertEqual(archive.append(replays[0]), 40) # ids keep going up
+
+        compact(self.path, keep_top=10)
+        with Archive(self.path) as archive:
+            self.assertEqual(sorted(archive.entry(i)[0] for i in range(len(archive))), sorted(best))
+            self.assertEqual([archive.entry(index)[0] for index in archive.top(10)], best)
+
+    def test_game_archives_finished_runs(self):
+        settings = make_settings((480, 720, 683))
+        settings.archive_file = self.path
+        game = Game(settings)
+        game.in_start_menu = False
+        game.restart_game()
+        while game.game_active: game.update() # no jumps -- falls to the floor
+        game.archive.close()
+
+        with Archive(self.path) as archive:
+            self.assertEqual(len(archive), 1)
+            self.assertEqual(archive[0], game.score_system.replay)
+
+    def test_top_from_index_alone_is_quick(self):
+        with Archive(self.path) as archive:
+            rng = random.Random(5)
+            for _ in range(200000): archive.append_packed(b"", int(rng.expovariate(1 / 12)), timestamp=0)
+            start = time.perf_counter()
+            ranked = archive.top(10)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(len(ranked), 10)
+            self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
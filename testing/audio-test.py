@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+import audio
+from settings import Settings
+from audio import AudioManager, FLAP, SCORE, HIT
+
+audio.pre_init()
+pg.init()
+
+
+class TestAudioManager(unittest.TestCase):
+    # pooled channels under the dummy audio driver
+    def setUp(self):
+        self.settings = Settings()
+        self.settings.audio_channels = 2
+        self.audio = AudioManager(self.settings)
+
+    def tearDown(self):
+        self.audio.stop()
+
+    def test_sounds_decoded_at_startup(self):
+        self.assertTrue(self.audio.enabled)
+        self.assertEqual(len(self.audio.sounds), len(audio.SOUND_NAMES))
+        self.assertEqual(len(self.audio.channels), 2)
+        self.assertEqual(pg.mixer.get_init()[0], audio.FREQUENCY)
+
+    def test_voice_stealing(self):
+        first = self.audio.play(HIT)
+        second = self.audio.play(SCORE)
+        self.assertNotEqual(first, second)
+
+        # pool full -- higher priority hit steals the score voice, flap can't steal anything
+        self.assertEqual(self.audio.play(HIT), second)
+        self.assertEqual(self.audio.play(FLAP), -1)
+
+    def test_flap_cooldown(self):
+        self.audio.stop()
+        self.assertGreaterEqual(self.audio.play(FLAP), 0)
+        self.assertEqual(self.audio.play(FLAP), -1) # space held -- no retrigger every frame
+
+    def test_disabled(self):
+        self.settings.sound_enabled = False
+        self.assertEqual(AudioManager(self.settings).play(FLAP), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
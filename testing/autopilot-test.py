@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_game, fly
+from autopilot import Autopilot, rect_round
+
+init_headless()
+pg.font.init()
+
+SCREENS = ((480, 720, 683), (600, 683, 683), (720, 1200, 683))
+
+
+class TestModel(unittest.TestCase):
+    def test_rect_rounding(self):
+        rect = pg.Rect(0, 0, 1, 1)
+        for value in (2.5, -2.5, 95.999999, 0.49, -0.51, 7.0):
+            rect.centery = value # how bird & pipes get moved
+            self.assertEqual(rect_round(value), rect.centery, value)
+
+    def test_steps_like_the_game(self):
+        rng = random.Random(5)
+        for screen in SCREENS:
+            game = make_game(screen, seed=3)
+            autopilot = Autopilot(game.settings)
+            fly(game, 150) # game's own input path -- some pipes on screen
+            while game.game_active:
+                autopilot.sync(game)
+                jump = rng.random() < 0.08
+                predicted = autopilot.step(game.run_frame, game.bird.rect.centery, game.bird.velocity, jump)
+                if jump: game.bird.jump()
+                game.update()
+                if predicted is None:
+                    self.assertFalse(game.game_active, screen)
+                else:
+                    self.assertTrue(game.game_active, screen)
+                    self.assertEqual(predicted, (game.bird.rect.centery, game.bird.velocity), screen)
+
+
+class TestAutopilot(unittest.TestCase):
+    def test_flies_every_screen(self):
+        for screen in SCREENS:
+            game = make_game(screen, seed=11)
+            autopilot = game.controller = Autopilot(game.settings)
+            fly(game, 4000)
+            self.assertTrue(game.game_active, screen)
+            self.assertGreater(game.score_system.score, 35)
+            self.assertLess(autopilot.searches, 10) # plan carried from frame to frame, not searched over
+            self.assertEqual(autopilot.timeouts, 0)
+
+    def test_budget_cuts_search_short(self):
+        game = make_game(SCREENS[0], seed=3)
+        autopilot = game.controller = Autopilot(game.settings, budget=0)
+        fly(game, 100)
+        self.assertGreater(autopilot.timeouts, 0)
+        self.assertEqual(len(autopilot.times), 100)
+        self.assertLess(sorted(autopilot.times)[50], 1.0) # stops after a handful of nodes
+
+    def test_out_of_time_keeps_the_plan(self):
+        game = make_game(SCREENS[0], seed=3)
+        autopilot = game.controller = Autopilot(game.settings)
+        fly(game, 200)
+        searches, timeouts = autopilot.searches, autopilot.timeouts
+        autopilot.budget, autopilot.horizon = 0, 2 * autopilot.horizon # far end needs more than the budget allows
+        fly(game, 100)
+        self.assertTrue(game.game_active)
+        self.assertGreater(autopilot.timeouts, timeouts)
+        self.assertEqual(autopilot.searches, searches) # timeouts extend the plan as far as they got, no replanning
+        self.assertGreater(len(autopilot.plan), 100)
+
+    def test_new_run_plans_afresh(self):
+        game = make_game(SCREENS[0], seed=3)
+        autopilot = game.controller = Autopilot(game.settings)
+        fly(game, 300)
+        searches = autopilot.searches
+        game.restart_game()
+        fly(game, 300)
+        self.assertTrue(game.game_active)
+        self.assertEqual(autopilot.start, game.run_frame - 1)
+        self.assertGreater(autopilot.searches, searches)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_game, fly, hold_middle
+from blitaudit import BlitAudit, surface_issues
+
+init_headless()
+pg.font.init()
+
+SCREEN = (480, 720, 683)
+
+
+def play(game, frames):
+    """bird holds mid screen between a few pipes -- every frame drawn"""
+    fly(game, frames, hold_middle, draw=True)
+
+
+class TestBlitAudit(unittest.TestCase):
+    def test_surface_issues(self):
+        display = pg.display.get_surface()
+        self.assertEqual(surface_issues(pg.Surface((8, 8)).convert(), display), [])
+        self.assertEqual(surface_issues(pg.Surface((8, 8)).convert_alpha(), display), ["opaque per-pixel alpha"])
+
+        see_through = pg.Surface((8, 8), pg.SRCALPHA).convert_alpha()
+        see_through.fill((0, 0, 0, 0), (0, 0, 4, 8))
+        self.assertEqual(surface_issues(see_through, display), []) # alpha doing its job
+
+        keyed = see_through.copy()
+        keyed.set_colorkey((255, 255, 255))
+        self.assertIn("colorkey & alpha", surface_issues(keyed, display))
+        self.assertIn("not display format", surface_issues(pg.Surface((8, 8), 0, 16), display))
+
+    def test_ops_credited_to_their_code(self):
+        game = make_game(SCREEN, seed=3)
+        audit = BlitAudit(game)
+        try: play(game, 300)
+        finally: audit.close()
+
+        self.assertEqual(audit.frames, 300)
+        backdrop = audit.ops[("parallax.py:Parallax.describe", "image")]
+        self.assertEqual(backdrop[:2], [300, 300 * 480 * 720]) # one full screen blit a frame
+        floor = audit.ops[("parallax.py:Layer.describe", "image")]
+        self.assertEqual(floor[1], 300 * 480 * (720 - 648)) # two slices, a screen wide together -- bottom clipped
+        birds = audit.ops[("bird.py:Bird.describe", "sprite")][0]
+        self.assertGreater(birds, 100)
+        self.assertIn(("game.py:Game.draw_game_ui", "ui"), audit.ops)
+
+        # full quality rotates the bird every time it's drawn -- credited to the bird's op
+        rotations = audit.transforms[("rotozoom", "governor.py:rotate", "bird.py:Bird.describe")]
+        self.assertEqual(rotations[0], birds)
+        self.assertIn(("pipes.py:PipeManager.describe", (104, 640), ("colorkey & alpha",)), audit.flagged)
+
+        report = "\n".join(audit.report())
+        self.assertIn("Bird.describe", report)
+        self.assertIn("colorkey & alpha", report)
+
+    def test_same_frame_and_hooks_removed(self):
+        plain, audited = make_game(SCREEN, seed=3), make_game(SCREEN, seed=3)
+        audit = BlitAudit(audited)
+        play(plain, 150)
+        play(audited, 150)
+        audit.close()
+        self.assertEqual(pg.image.tobytes(audited.backend.frame(), "RGB"), pg.image.tobytes(plain.backend.frame(), "RGB"))
+
+        self.assertFalse(hasattr(pg.transform.rotozoom, "__wrapped__"))
+        self.assertNotIn("draw", vars(audited.backend))
+
+
+if __name__ == "__main__":
+    unittest.main()
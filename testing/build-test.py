@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import tempfile
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+import resources
+import build
+import audio
+
+
+class TestPack(unittest.TestCase):
+    def setUp(self):
+        pg.init()
+        pg.display.set_mode((1, 1), pg.HIDDEN)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, resources.PACK)
+        self.images = build.asset_names("img", build.IMAGE_TYPES)
+        resources.write_pack(self.path, self.images, [], audio.default_samples())
+        with open(self.path, 'rb') as file: self.packed = resources.read_pack(file.read())
+
+    def tearDown(self):
+        resources._pack = None
+        self.tmpdir.cleanup()
+
+    def test_packed_images_match_files(self):
+        self.assertIn("img/pipe.png", self.images)
+        self.assertIn("img/bird-sprites/bird-midflap.png", self.images)
+        from_files = {name: resources.image(name) for name in self.images}
+
+        resources._pack = self.packed
+        for name in self.images:
+            image = resources.image(name)
+            self.assertEqual(image.get_masks(), from_files[name].get_masks(), name) # display format -- no convert
+            self.assertEqual(pg.image.tobytes(image, "RGBA"), pg.image.tobytes(from_files[name], "RGBA"), name)
+
+    def test_packed_samples(self):
+        resources._pack = self.packed
+        self.assertEqual(resources.samples("flap"), audio.default_samples()["flap"])
+        self.assertIsNone(resources.asset_file("sounds/flap.wav"))
+
+
+class TestZipapp(unittest.TestCase):
+    def test_runs_from_any_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = os.path.join(tmpdir, "flappy.pyz")
+            # own process -- build sets a display mode & quits pygame
+            subprocess.run([sys.executable, "code/build.py", "--out", target], check=True, capture_output=True, timeout=120)
+
+            elsewhere = os.path.join(tmpdir, "elsewhere")
+            os.makedirs(elsewhere)
+            result = subprocess.run(
+                [sys.executable, target, "--headless", "--bot", "--frames", "120", "--uncapped", "--size", "small"],
+                cwd=elsewhere, capture_output=True, text=True, timeout=120
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertTrue(os.path.isdir(os.path.join(tmpdir, "data"))) # next to the .pyz, not in cwd
+            self.assertEqual(os.listdir(elsewhere), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import io
+import time
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from capture import FrameCapture, read_frames, slot_bytes
+
+pg.init()
+screen = pg.display.set_mode((120, 80))
+
+
+class SlowFile(io.BytesIO):
+    # disk that takes 20ms per write
+    def write(self, data):
+        time.sleep(0.02)
+        return super().write(data)
+
+
+class TestFrameCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "frames.cap")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frames_read_back(self):
+        for compress in (0, 1):
+            capture = FrameCapture(self.path, slot_bytes([(120, 80)], screen), slots=64, compress=compress).start()
+            for i in range(10):
+                screen.fill((i * 20, 100, 255 - i * 20))
+                self.assertTrue(capture.capture(screen, i / 80))
+            capture.close()
+
+            frames = list(read_frames(self.path))
+            self.assertEqual([index for index, _, _ in frames], list(range(10)))
+            index, timestamp, surface = frames[3]
+            self.assertEqual(timestamp, 3 / 80)
+            self.assertEqual(surface.get_size(), (120, 80))
+            self.assertEqual(surface.get_at((5, 5))[:3], (60, 100, 195))
+
+    def test_slow_disk_drops_frames_instead_of_stalling(self):
+        capture = FrameCapture(SlowFile(), slot_bytes([(120, 80)], screen), slots=4).start()
+        slowest = 0
+        for i in range(100):
+            start = time.perf_counter()
+            capture.capture(screen)
+            slowest = max(slowest, time.perf_counter() - start)
+        capture.close()
+
+        self.assertLess(slowest, 0.015) # never waits for the 20ms writes
+        self.assertGreater(capture.dropped, 0)
+        self.assertEqual(capture.written + capture.dropped, 100)
+        self.assertEqual(capture.report(), f"capture: {capture.written} frames written, {capture.dropped} dropped of 100")
+
+    def test_slots_fit_sdl_pitch(self):
+        for size in ((121, 80), (3, 7), (720, 1200)): # odd widths -- rows padded however SDL pads them
+            frame = pg.Surface(size, 0, screen)
+            self.assertGreaterEqual(slot_bytes([size], screen), frame.get_pitch() * size[1])
+            capture = FrameCapture(io.BytesIO(), slot_bytes([size], screen), slots=2).start()
+            self.assertTrue(capture.capture(frame))
+            capture.close()
+
+        capture = FrameCapture(io.BytesIO(), slot_bytes([(60, 40)], screen), slots=2).start()
+        try:
+            with self.assertRaises(ValueError): capture.capture(screen) # doesn't fit -- never dropped silently
+        finally:
+            capture.close()
+        self.assertEqual(capture.dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
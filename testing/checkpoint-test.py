@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_game, fly, flap_through_gaps
+from checkpoint import read_checkpoint, restore, MAGIC
+from verifier import verify_replay
+import main
+
+init_headless()
+pg.font.init()
+
+SPAWN_EVERY = 90
+
+
+SCREEN = (480, 720, 683)
+
+
+def play(game, until, crash_after=None):
+    """timer free run up to run frame `until` -- spawns & jumps depend only on run frame & bird, so a resumed run
+    goes on the same way"""
+    def jump(game): # gap following
+        return (crash_after is None or game.run_frame < crash_after) and flap_through_gaps(game)
+    fly(game, until - game.run_frame, jump, SPAWN_EVERY)
+
+
+def state(game):
+    return (
+        game.run_frame, tuple(game.bird.rect), game.bird.velocity, game.score_system.score,
+        [tuple(pipe) for pipe in game.pipe_manager.pipes], len(game.pipe_manager.passed_pipes),
+        game.recorder.jumps, game.recorder.spawns, game.floor_pos
+    )
+
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "session.ckpt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def crashed_run(self, frames):
+        """game that checkpointed a run for `frames` updates & 'crashed' -- writer flushed"""
+        game = make_game(SCREEN, checkpoint_file=self.path, seed=9)
+        play(game, frames)
+        self.assertTrue(game.game_active)
+        game.checkpoints.close()
+        return game
+
+    def test_resumed_run_goes_on_like_uninterrupted_one(self):
+        first = self.crashed_run(1000)
+        snapshot = read_checkpoint(self.path)
+        self.assertEqual(snapshot.run_frame, 1000) # every 40 updates
+        self.assertGreater(snapshot.score, 0)
+
+        second = make_game(SCREEN, False, checkpoint_file=os.path.join(self.tmpdir.name, "other.ckpt"), seed=9)
+        restore(second, snapshot)
+        self.assertTrue(second.game_active and second.game_paused)
+        self.assertEqual(state(second), state(first))
+
+        second.game_paused = False
+        play(first, 1600)
+        play(second, 1600)
+        self.assertEqual(state(second), state(first))
+
+    def test_resumed_run_verifies(self):
+        self.crashed_run(600)
+        game = make_game(SCREEN, False, checkpoint_file=os.path.join(self.tmpdir.name, "other.ckpt"), seed=9)
+        restore(game, read_checkpoint(self.path))
+        game.game_paused = False
+        play(game, 5000, crash_after=800)
+        self.assertFalse(game.game_active)
+        self.assertTrue(verify_replay(game.score_system.replay, game.score_system.score)[0])
+        game.checkpoints.close()
+        self.assertIsNone(read_checkpoint(game.settings.checkpoint_file)) # finished run -- nothing to resume
+
+    def test_records_are_incremental(self):
+        game = self.crashed_run(400)
+        with open(self.path, 'rb') as file: data = file.read()
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertEqual(game.checkpoints.saved, 10)
+        # every record holds only its own jumps -- file is far smaller than 10 copies of the log
+        self.assertLess(len(data), 10 * (100 + 4 * len(game.recorder.jumps)))
+
+    def test_damaged_tail_falls_back(self):
+        self.crashed_run(400)
+        with open(self.path, 'rb') as file: data = file.read()
+
+        with open(self.path, 'ab') as file: file.write(data[len(MAGIC):len(MAGIC) + 30]) # torn write
+        self.assertEqual(read_checkpoint(self.path).run_frame, 400)
+
+        damaged = bytearray(data)
+        damaged[-3] ^= 0xFF # last record's payload -- crc catches it
+        with open(self.path, 'wb') as file: file.write(damaged)
+        snapshot = read_checkpoint(self.path)
+        self.assertEqual(snapshot.run_frame, 360)
+
+        with open(self.path, 'wb') as file: file.write(b"junk")
+        self.assertIsNone(read_checkpoint(self.path))
+        self.assertIsNone(read_checkpoint(os.path.join(self.tmpdir.name, "missing.ckpt")))
+
+    def test_new_run_starts_file_over(self):
+        game = make_game(SCREEN, checkpoint_file=self.path, seed=9)
+        play(game, 400)
+        game.restart_game()
+        play(game, 80)
+        game.checkpoints.close()
+        self.assertEqual(read_checkpoint(self.path).run_frame, 80)
+        self.assertEqual(game.checkpoints.saved, 12)
+
+    def test_main_resumes(self):
+        self.crashed_run(400)
+        argv = ["--headless", "--size", "small", "--checkpoint", self.path]
+        game, _ = main.make_game(main.parse_args(argv + ["--no-resume"]))
+        self.assertTrue(game.in_start_menu)
+        game.checkpoints.close()
+
+        game, _ = main.make_game(main.parse_args(argv))
+        self.assertTrue(game.game_active and game.game_paused) # pause menu -- Resume or Main Menu
+        self.assertEqual(game.run_frame, 400)
+        game.return_to_menu() # dropped
+        game.checkpoints.close()
+        self.assertIsNone(read_checkpoint(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
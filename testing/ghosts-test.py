@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import Simulation, init_headless, make_settings, bot_replay
+from ghosts import GhostLayer, read_replays, synthetic_replays
+
+init_headless()
+
+
+class CountingSurface(pg.Surface):
+    def __init__(self, size):
+        super().__init__(size)
+        self.blit_calls = 0
+        self.blits_calls = 0
+
+    def blit(self, *args, **kwargs):
+        self.blit_calls += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, *args, **kwargs):
+        self.blits_calls += 1
+        return super().blits(*args, **kwargs)
+
+
+class TestGhostLayer(unittest.TestCase):
+    def setUp(self):
+        self.settings = make_settings((600, 683, 683))
+        self.simulation = Simulation(self.settings)
+        self.layer = GhostLayer(self.settings, self.simulation.bird)
+        self.screen = CountingSurface((self.settings.width, self.settings.height))
+
+    def test_ghost_follows_replay(self):
+        for replay in (bot_replay(self.simulation, 3, 3000), bot_replay(self.simulation, 4, 3000, spam=0.15, spawn_every=0)):
+            self.layer.start([replay])
+            ghost = self.layer.ghosts[0]
+
+            # step same run again & compare bird position after every update
+            self.simulation.reset(replay["seed"])
+            jumps, spawns = set(replay["jumps"]), set(replay["spawns"])
+            for frame in range(replay["frames"]):
+                self.simulation.step(frame in jumps, frame in spawns)
+                self.layer.draw(self.screen, frame + 1)
+                self.assertEqual(ghost.stretch.y(frame + 1 - ghost.start), self.simulation.bird.rect.centery)
+
+            self.layer.draw(self.screen, replay["frames"] + 1) # crashed -- culled
+            self.assertEqual(self.layer.ghosts, [])
+
+    def test_one_blits_call(self):
+        self.layer.start(synthetic_replays(self.settings, 200, 300))
+        for frame in range(300): self.layer.draw(self.screen, frame)
+        self.assertEqual(self.screen.blits_calls, 300)
+        self.assertEqual(self.screen.blit_calls, 0)
+        self.assertGreater(len(self.layer.batch), 0)
+
+    def test_read_replays(self):
+        replays = synthetic_replays(self.settings, 3, 50)
+        for score, replay in enumerate(replays): replay["score"] = score
+        other_size = dict(replays[0], screen=[480, 546, 683])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            leaderboard = os.path.join(tmp, "leaderboard.json")
+            with open(leaderboard, 'w') as file:
+                json.dump({"scores": [{"name": "a", "score": r["score"], "replay": r} for r in replays] + [{"name": "b", "score": 9}]}, file)
+            submissions = os.path.join(tmp, "submissions.jsonl")
+            with open(submissions, 'w') as file:
+                for replay in replays + [other_size]: file.write(json.dumps({"score": replay["score"], "replay": replay}) + "\n")
+
+            self.assertEqual([r["score"] for r in read_replays(leaderboard)], [2, 1, 0])
+            self.layer.start(read_replays(submissions), limit=2)
+            self.assertEqual(len(self.layer.ghosts), 2)
+            self.layer.start(read_replays(submissions))
+            self.assertEqual(len(self.layer.ghosts), 3) # other screen size skipped
+
+            # parsed once per change of the file -- not at every run start
+            loaded = self.layer.load(leaderboard)
+            self.assertIs(self.layer.load(leaderboard), loaded)
+            with open(leaderboard, 'w') as file: json.dump({"scores": [{"name": "c", "score": 5, "replay": replays[0]}]}, file)
+            self.assertEqual(len(self.layer.load(leaderboard)), 1)
+            self.assertEqual(self.layer.load(os.path.join(tmp, "gone.json")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+import golden
+
+
+def noise(size, seed):
+    """deterministic busy image -- diagonal colour bands"""
+    surface = pg.Surface(size)
+    for x in range(0, size[0], 4):
+        pg.draw.line(surface, ((x * 7 + seed) % 256, (x * 3) % 256, (x * 11) % 256), (x, 0), (x + size[1], size[1]), 4)
+    return surface
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self):
+        pg.init()
+        self.frame = noise((120, 90), 0)
+
+    def test_identical_frames(self):
+        self.assertEqual(golden.differing_pixels(self.frame, self.frame.copy()), 0)
+        self.assertEqual(golden.hash_distance(golden.average_hash(self.frame), golden.average_hash(self.frame.copy())), 0)
+
+    def test_small_change_within_tolerance(self):
+        other = self.frame.copy()
+        other.fill((5, 5, 5), special_flags=pg.BLEND_RGB_ADD)
+        self.assertEqual(golden.differing_pixels(self.frame, other, tolerance=8), 0)
+        self.assertGreater(golden.differing_pixels(self.frame, other, tolerance=2), 120 * 90 // 2)
+
+    def test_changed_region_counted(self):
+        other = self.frame.copy()
+        other.fill((255, 0, 255), pg.Rect(10, 10, 20, 5))
+        self.assertEqual(golden.differing_pixels(self.frame, other), 100)
+        self.assertEqual(golden.differing_pixels(other, self.frame), 100) # both directions of the difference
+
+    def test_size_mismatch_is_all_pixels(self):
+        self.assertEqual(golden.differing_pixels(self.frame, pg.Surface((60, 90))), 120 * 90)
+
+    def test_hash_sees_layout_change(self):
+        other = self.frame.copy()
+        other.fill((255, 255, 255), pg.Rect(0, 0, 60, 90))
+        self.assertGreater(golden.hash_distance(golden.average_hash(self.frame), golden.average_hash(other)), 6)
+
+
+class TestGolden(unittest.TestCase):
+    def test_frames_match_goldens(self):
+        results, frames = golden.check(out=None)
+        self.assertEqual([name for name, *_ in results], list(golden.CHECKPOINTS))
+        for name, distance, pixels, ok in results:
+            self.assertTrue(ok, f"{name}: hash distance {distance}, pixels off {pixels} -- python code/golden.py for diffs")
+        self.assertGreater(frames, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
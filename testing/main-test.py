@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+import main
+
+
+def bot_run(argv, frames):
+    game, bot = main.make_game(main.parse_args(argv))
+    game.settings.ghost_count = 0
+    game.run(frames)
+    return game, bot
+
+
+class TestRunner(unittest.TestCase):
+    def test_seeded_headless_runs_repeat(self):
+        argv = ["--headless", "--bot", "--seed", "11", "--uncapped", "--size", "small"] # medium follows display height
+        first, bot = bot_run(argv, 1500)
+        second, _ = bot_run(argv, 1500)
+
+        self.assertGreater(bot.runs, 0)
+        self.assertGreater(first.score_system.score, 0)
+        for game in (first, second): game.recorder.finish(game.run_frame)
+        self.assertEqual(first.recorder.to_dict(first.score_system.score), second.recorder.to_dict(second.score_system.score))
+
+    def test_options_reach_settings(self):
+        game, bot = main.make_game(main.parse_args(["--headless", "--size", "small", "--fps", "60", "--seed", "4"]))
+        self.assertEqual((game.settings.width, game.settings.height), (480, 720))
+        self.assertEqual(game.settings.FPS, 60)
+        self.assertEqual(game.settings.seed, 4)
+        self.assertIsNone(bot)
+        self.assertIsNotNone(game.on_frame) # headless -- frame counted timers
+        self.assertIsNone(game.governor) # opt in
+        game, _ = main.make_game(main.parse_args(["--headless", "--size", "small", "--adaptive-quality"]))
+        self.assertIsNotNone(game.governor)
+
+    def test_bounded_bench_run(self):
+        # own process -- main quits pygame at the end
+        result = subprocess.run(
+            [sys.executable, "code/main.py", "--headless", "--bot", "--frames", "200", "--uncapped", "--bench"],
+            capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("bench: 200 frames", result.stdout)
+
+    def test_bench_report(self):
+        log = [(1.0, 12.5)] * 98 + [(20.0, 25.0), (30.0, 37.5)]
+        lines = main.bench_report(log, 80)
+        self.assertTrue(lines[0].startswith("bench: 100 frames in 1.29s"))
+        self.assertIn("max  30.000", lines[1])
+        self.assertIn("2 frames (2.00%)", lines[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import tracemalloc
+import urllib.request
+import urllib.error
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from metrics import GameMetrics, Histogram, MetricsServer
+
+
+class TestMetrics(unittest.TestCase):
+    # metric types & exposition format
+    def setUp(self):
+        self.metrics = GameMetrics()
+
+    def test_histogram_buckets_cumulative(self):
+        histogram = Histogram("h", "test", (1, 5))
+        for value in (0.5, 1, 3, 10): histogram.observe(value)
+        lines = histogram.render()
+        self.assertIn('h_bucket{le="1"} 2', lines)
+        self.assertIn('h_bucket{le="5"} 3', lines)
+        self.assertIn('h_bucket{le="+Inf"} 4', lines)
+        self.assertIn("h_count 4", lines)
+
+    def test_dropped_frames(self):
+        self.metrics.record_frame(12, 80)  # on time
+        self.metrics.record_frame(38, 80)  # ~3 frame budgets -> 2 dropped
+        self.assertEqual(self.metrics.dropped_frames.value[0], 2)
+
+    def test_hot_path_does_not_grow_memory(self):
+        self.metrics.record_frame(12, 80)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(10000):
+            self.metrics.record_frame(12 + i % 30, 80)
+            self.metrics.pipes_alive.set(i % 8)
+        growth = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        self.assertLess(growth, 1024)
+
+
+class TestMetricsServer(unittest.TestCase):
+    # scrape endpoint like Prometheus would
+    def setUp(self):
+        self.metrics = GameMetrics()
+        self.server = MetricsServer(self.metrics, port=0).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_scrape(self):
+        self.metrics.runs_started.inc()
+        self.metrics.score.observe(7)
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.server.port}/metrics") as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+            body = response.read().decode()
+        self.assertIn("flappy_runs_started_total 1", body)
+        self.assertIn('flappy_run_score_bucket{le="10"} 1', body)
+        self.assertIn("# TYPE flappy_frame_time_seconds histogram", body)
+
+    def test_unknown_path(self):
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{self.server.port}/other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from pacing import Pacer, JITTER_BIN
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+def pacer(mode, fps=200, uncapped=False):
+    settings = make_settings((480, 720, 683))
+    settings.pacing, settings.FPS, settings.uncapped = mode, fps, uncapped
+    return Pacer(settings)
+
+
+def intervals(pacer, frames, work=0.0):
+    """ms between returns of wait -- `work` seconds of busy frame before each"""
+    times = []
+    for _ in range(frames):
+        end = time.perf_counter() + work
+        while time.perf_counter() < end: pass
+        pacer.wait()
+        times.append(time.perf_counter())
+    return [(b - a) * 1000 for a, b in zip(times, times[1:])]
+
+
+class TestPacing(unittest.TestCase):
+    def test_hybrid_holds_the_interval(self):
+        paced = pacer("hybrid")
+        values = sorted(intervals(paced, 120, work=0.001))
+        self.assertAlmostEqual(sum(values) / len(values), 5.0, delta=0.25) # 200 fps -- no whole ms rounding
+        self.assertLess(abs(values[len(values) // 2] - 5.0), 0.5)
+        self.assertEqual(paced.frames, 119)
+
+    def test_late_frame_made_up_then_schedule_restarts(self):
+        paced = pacer("hybrid", fps=100)
+        intervals(paced, 5)
+        stalled = time.perf_counter() + 0.004 # 4 ms over in a 10 ms frame -- next wait is shorter
+        paced.wait()
+        start = time.perf_counter()
+        while time.perf_counter() < stalled + 0.010: pass # frame work overruns by 4 ms
+        paced.wait()
+        self.assertLess(time.perf_counter() - start, 0.0135)
+
+        time.sleep(0.05) # five frames behind -- no burst of frames to catch up
+        paced.wait()
+        values = intervals(paced, 4)
+        self.assertGreater(min(values), 8.0)
+
+    def test_uncapped_never_waits(self):
+        paced = pacer("busy", fps=10, uncapped=True)
+        start = time.perf_counter()
+        intervals(paced, 50)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertIn("(uncapped)", paced.report())
+
+        paced = pacer("busy", fps=10, uncapped=True) # raw intervals counted -- not their distance from a budget nobody waits for
+        now = 0.0
+        for _ in range(20):
+            paced.record(now)
+            now += 0.0003
+        self.assertLessEqual(paced.percentile(0.5), 0.35)
+        self.assertIn("frame ms", paced.report())
+
+    def test_jitter_percentiles(self):
+        paced = pacer("tick", fps=100)
+        now = 0.0
+        paced.record(now)
+        for i in range(100):
+            now += 0.010 + (0.003025 if i % 10 == 0 else 0.000125) # 10 % of frames 3 ms late -- mid bin values
+            paced.record(now)
+        self.assertEqual(paced.frames, 100)
+        self.assertAlmostEqual(paced.percentile(0.5), 3 * JITTER_BIN, delta=1e-9) # upper edge of 0.125's bin
+        self.assertAlmostEqual(paced.percentile(0.95), 61 * JITTER_BIN, delta=1e-9)
+        self.assertIn("p99 3.05", paced.report())
+
+    def test_modes_checked_and_vsync_falls_back(self):
+        with self.assertRaises(ValueError): pacer("sleepy")
+        self.assertEqual(Pacer(make_settings((480, 720, 683))).mode, "tick") # spinning is opted into
+
+        settings = make_settings((480, 720, 683))
+        settings.pacing = "vsync"
+        game = Game(settings)
+        self.assertEqual(game.pacer.vsync, game.backend.vsync)
+        game.resize_game("large")
+        self.assertEqual(game.pacer.vsync, game.backend.vsync)
+        self.assertEqual(game.screen.get_size(), (720, 1200))
+
+        game.pacer.vsync = False # display without vsync -- hybrid waits instead
+        start = time.perf_counter()
+        for _ in range(9): game.pacer.wait()
+        self.assertGreater(time.perf_counter() - start, 8 / settings.FPS)
+
+
+if __name__ == "__main__":
+    unittest.main()
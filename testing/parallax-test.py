@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from backends import Scene, IMAGE
+from parallax import Parallax
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+def stripes(size, seed):
+    """tile with a different colour every column -- any misplaced slice shows"""
+    surface = pg.Surface(size)
+    for x in range(size[0]): pg.draw.line(surface, ((x * 5 + seed) % 256, (x * 11) % 256, seed), (x, 0), (x, size[1]))
+    return surface
+
+
+def render(parallax, size):
+    scene = Scene()
+    parallax.describe(scene)
+    screen = pg.Surface(size)
+    for _, surface, pos, area in scene.ops: screen.blit(surface, pos, area)
+    return screen, scene.ops
+
+
+class TestParallax(unittest.TestCase):
+    def test_slices_wrap_around(self):
+        size = (200, 60)
+        parallax = Parallax(size)
+        tile = stripes((70, 20), 9)
+        layer = parallax.add(tile, 30, 13.0) # 3 tiles in the strip, wraps every 210 px
+        self.assertEqual(layer.strip.get_width(), 210)
+        for frame in range(1, 40):
+            parallax.update()
+            screen, ops = render(parallax, size)
+            self.assertLessEqual(len(ops), 3) # backdrop & two slices
+            offset = frame * 13 % 210
+            for x in (0, 1, 69, 70, 137, 199):
+                self.assertEqual(screen.get_at((x, 35)), tile.get_at(((x + offset) % 70, 5)), (frame, x))
+
+    def test_sub_pixel_speeds_keep_moving(self):
+        parallax = Parallax((100, 10))
+        layer = parallax.add(stripes((100, 10), 0), 0, 0.8)
+        for _ in range(5): parallax.update()
+        self.assertAlmostEqual(layer.offset, 4.0, delta=0.01) # speed kept in 1/256 px
+        for _ in range(120): parallax.update()
+        self.assertEqual(layer.position, 125 * layer.step % layer.period) # wraps without drifting
+
+    def test_static_layers_composited_once(self):
+        size = (120, 80)
+        parallax = Parallax(size)
+        sky, hills = stripes(size, 1), pg.Surface((120, 30), pg.SRCALPHA)
+        hills.fill((0, 200, 0, 255), (0, 10, 120, 20))
+        parallax.add(sky)
+        parallax.add(hills, 50)
+        parallax.add(stripes((120, 10), 2), 70, 1.0)
+        screen, ops = render(parallax, size)
+        self.assertEqual(len(ops), 2) # backdrop, floor strip -- one slice at offset 0
+        backdrop = parallax.backdrop
+        self.assertEqual(screen.get_at((5, 55)), sky.get_at((5, 55))) # see-through top of hills
+        self.assertEqual(screen.get_at((5, 65)), (0, 200, 0, 255))
+
+        for _ in range(10): parallax.update()
+        _, ops = render(parallax, size)
+        self.assertIs(ops[0][1], backdrop)
+        self.assertEqual(len(ops), 3)
+
+    def test_floor_scrolls_at_every_size(self):
+        for screen, per_frame in (((480, 720, 683), 0.8), ((600, 683, 683), 1.0), ((720, 1200, 683), 1.2)):
+            settings = make_settings(screen)
+            game = Game(settings)
+            for _ in range(50): game.update() # start menu -- floor still moves
+            self.assertAlmostEqual(game.floor_layer.offset, 50 * per_frame, delta=0.1)
+            self.assertEqual(game.floor_pos, -int(game.floor_layer.offset))
+            game.floor_pos = -7 # render.py puts it back at 0 for every replay
+            self.assertEqual(game.floor_layer.offset, 7.0)
+            self.assertEqual(game.floor_pos, -7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import io
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from governor import QualityGovernor, LEVEL_NAMES, QUANTIZED_ROTATION, NO_SHADOWS, OPAQUE_OVERLAYS, ROTATION_STEP
+from metrics import game_metrics
+from bird import Bird
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+class CountingSurface(pg.Surface):
+    def __init__(self, size):
+        super().__init__(size)
+        self.blit_calls = 0
+
+    def blit(self, *args, **kwargs):
+        self.blit_calls += 1
+        return super().blit(*args, **kwargs)
+
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        self.settings = make_settings((600, 683, 683))
+        self.governor = QualityGovernor(self.settings, window=10, calm=3)
+        self.budget = 1000 / self.settings.FPS
+
+    def feed(self, work_ms, windows=1):
+        for _ in range(10 * windows): self.governor.record(work_ms)
+
+    def test_steps_down_once_per_late_window(self):
+        stdout, sys.stdout = sys.stdout, io.StringIO()
+        try: self.feed(self.budget * 2)
+        finally: stdout, sys.stdout = sys.stdout, stdout
+        self.assertEqual(self.settings.quality, 1)
+        self.assertEqual(game_metrics.quality_level.value[0], 1) # level changes go to the gauge, not stdout
+        self.assertEqual(stdout.getvalue(), "")
+        self.feed(self.budget * 2, windows=10)
+        self.assertEqual(self.settings.quality, len(LEVEL_NAMES) - 1) # never past last level
+
+    def test_one_late_frame_is_tolerated(self):
+        for _ in range(9): self.governor.record(1)
+        self.governor.record(self.budget * 3)
+        self.assertEqual(self.settings.quality, 0)
+
+    def test_steps_up_only_after_calm_windows(self):
+        self.feed(self.budget * 2, windows=2)
+        self.assertEqual(self.settings.quality, 2)
+
+        self.feed(1, windows=2)
+        self.assertEqual(self.settings.quality, 2)
+        self.feed(1)
+        self.assertEqual(self.settings.quality, 1)
+
+        # frames that fit but leave no headroom -- level stays, calm count starts over
+        self.feed(1, windows=2)
+        self.feed(self.budget * 0.8)
+        self.feed(1, windows=2)
+        self.assertEqual(self.settings.quality, 1)
+        self.feed(1)
+        self.assertEqual(self.settings.quality, 0)
+
+
+class TestQualityLevels(unittest.TestCase):
+    def setUp(self):
+        self.settings = make_settings((600, 683, 683))
+
+    def test_quantized_rotation_is_cached(self):
+        bird = Bird(self.settings)
+        bird.velocity = 3.1
+        self.assertFalse(bird.rotations)
+
+        self.settings.quality = QUANTIZED_ROTATION
+        sprite = bird.rotate_bird()
+        bird.velocity = 3.4 # same angle step
+        self.assertIs(bird.rotate_bird(), sprite)
+        self.assertEqual(list(bird.rotations), [(bird.image, round(-3.1 * 3 / ROTATION_STEP) * ROTATION_STEP)])
+
+    def test_levels_draw_less(self):
+        game = Game(self.settings)
+        game.in_start_menu = False
+        game.restart_game()
+        game.game_paused = True
+        for i in range(30): game.score_system.add_score_message(100, 100 + i)
+
+        blits, corners = [], []
+        for level in range(len(LEVEL_NAMES)):
+            self.settings.quality = level
+            game.screen = game.backend.screen = CountingSurface(game.screen.get_size())
+            game.draw()
+            blits.append(game.screen.blit_calls)
+            corners.append(sum(game.screen.get_at((2, self.settings.height // 2))[:3]))
+
+        # shadows are one blit per score message
+        self.assertEqual(blits[QUANTIZED_ROTATION], blits[0])
+        self.assertEqual(blits[QUANTIZED_ROTATION] - blits[NO_SHADOWS], 30)
+
+        # pause box still drawn, but screen around it isn't dimmed any more
+        self.assertEqual(blits[OPAQUE_OVERLAYS], blits[NO_SHADOWS])
+        self.assertEqual(corners[NO_SHADOWS], corners[0])
+        self.assertGreater(corners[OPAQUE_OVERLAYS], corners[NO_SHADOWS])
+
+    def test_game_over_screen_at_every_level(self):
+        game = Game(self.settings)
+        game.in_start_menu = False
+        game.game_active = False
+        for level in range(len(LEVEL_NAMES)):
+            self.settings.quality = level
+            game.draw()
+
+
+if __name__ == "__main__":
+    unittest.main()
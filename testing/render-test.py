@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import filecmp
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import Simulation, init_headless, make_settings, bot_replay
+from capture import read_frames
+from render import render_replays, make_jobs
+
+init_headless()
+
+
+class TestRender(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.replay = bot_replay(Simulation(make_settings((480, 546, 683))), 0, 200)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def out(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_chunks_stitch_to_same_frames(self):
+        whole = render_replays([self.replay], self.out("whole"), "raw", chunk=1000, workers=1)
+        chunked = render_replays([self.replay], self.out("chunked"), "raw", chunk=64, workers=1)
+        self.assertEqual(whole, chunked)
+        self.assertEqual(whole, self.replay["frames"])
+        self.assertTrue(filecmp.cmp(self.out("whole/run_000.cap"), self.out("chunked/run_000.cap"), shallow=False))
+
+        indexes = [index for index, _, _ in read_frames(self.out("chunked/run_000.cap"))]
+        self.assertEqual(indexes, list(range(self.replay["frames"])))
+
+    def test_chunks_resume_from_checkpoints(self):
+        scratch = set(name for name in os.listdir(tempfile.gettempdir()) if name.startswith("render-"))
+        jobs = make_jobs([self.replay], "x", "raw", 7)
+        self.assertEqual([job[6] for job in jobs[:3]], [None] * 3) # no plan -- chunks play from frame 0
+
+        # one frame chunks -- every frame resumed from its own checkpoint, none played twice
+        render_replays([self.replay], self.out("whole"), "raw", chunk=1000, workers=1)
+        render_replays([self.replay], self.out("single"), "raw", chunk=1, workers=1)
+        self.assertTrue(filecmp.cmp(self.out("whole/run_000.cap"), self.out("single/run_000.cap"), shallow=False))
+        self.assertEqual(scratch, set(name for name in os.listdir(tempfile.gettempdir()) if name.startswith("render-")))
+
+    def test_process_pool_matches_serial(self):
+        replays = [self.replay, dict(self.replay, seed=1)]
+        render_replays(replays, self.out("serial"), "raw", chunk=50, workers=1)
+        render_replays(replays, self.out("pool"), "raw", chunk=50, workers=2)
+        for run in ("run_000.cap", "run_001.cap"):
+            self.assertTrue(filecmp.cmp(self.out("serial/" + run), self.out("pool/" + run), shallow=False))
+
+    def test_png_frames_numbered(self):
+        replay = dict(self.replay, frames=12)
+        self.assertEqual(len(make_jobs([replay], "x", "png", 5)), 3)
+        render_replays([replay], self.out("png"), "png", chunk=5, workers=1)
+        self.assertEqual(sorted(os.listdir(self.out("png/run_000"))), [f"frame_{i:06d}.png" for i in range(12)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import time
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from settings import Settings
+from game import Game
+from score_system import ScoreSystem
+from simulation import flap_through_gaps
+from verifier import verify_replay, verify_submission, verify_batch
+
+pg.init()
+
+
+def record_run(seed, max_frames=3000):
+    """play one run with the real Game loop -- returns (score, replay)"""
+    settings = Settings()
+    settings.seed = seed
+    settings.sound_enabled = False
+    game = Game(settings)
+    pg.time.set_timer(settings.SPAWNPIPE, 0)
+    pg.time.set_timer(settings.BIRDFLAP, 0)
+
+    clock = [0.0]
+    game.now = lambda: clock[0]
+    game.controller = flap_through_gaps
+    game.start_countdown()
+    clock[0] = 10
+    game.step()
+
+    for frame in range(max_frames):
+        if frame % 104 == 0: pg.event.post(pg.event.Event(settings.SPAWNPIPE))
+        if frame == max_frames // 2: game.controller = lambda game: False # crash on purpose
+        game.step()
+        if not game.game_active: break
+    return game.score_system.score, game.score_system.replay
+
+
+class TestReplayVerification(unittest.TestCase):
+    # runs recorded from the real game must verify, tampered ones must not
+    @classmethod
+    def setUpClass(cls):
+        cls.score, cls.replay = record_run(seed=7)
+
+    def test_recorded_run_verifies(self):
+        self.assertIsNotNone(self.replay)
+        self.assertGreater(self.score, 0)
+        self.assertEqual(verify_replay(self.replay, self.score), (True, "ok"))
+
+    def test_fake_score_rejected(self):
+        accepted, reason = verify_replay(self.replay, self.score + 1)
+        self.assertFalse(accepted)
+
+    def test_tampered_inputs_rejected(self):
+        replay = copy.deepcopy(self.replay)
+        replay["jumps"] = replay["jumps"][: len(replay["jumps"]) // 2]
+        self.assertFalse(verify_replay(replay, self.score)[0])
+
+        replay = copy.deepcopy(self.replay)
+        replay["seed"] += 1
+        self.assertFalse(verify_replay(replay, self.score)[0])
+
+    def test_malformed_submissions(self):
+        self.assertFalse(verify_submission({"name": "x", "score": 3})[0])
+        self.assertFalse(verify_submission({"name": "x", "score": 3, "replay": {"seed": 1}})[0])
+        self.assertFalse(verify_submission(None)[0])
+
+    def test_batch_on_process_pool(self):
+        good = {"name": "a", "score": self.score, "replay": self.replay}
+        bad = {"name": "b", "score": self.score + 5, "replay": self.replay}
+        results = verify_batch([good, bad] * 8, workers=2, chunksize=4)
+        self.assertEqual([ok for ok, _ in results], [True, False] * 8)
+
+
+class TestSubmit(unittest.TestCase):
+    # name entry queues the run -- re-played on a worker process, saved only once the scores match
+    @classmethod
+    def setUpClass(cls):
+        cls.score, cls.replay = record_run(seed=7)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.score_system = ScoreSystem(Settings())
+        self.score_system.leaderboard_file = os.path.join(self.tmpdir.name, "leaderboard.json")
+
+    def tearDown(self):
+        self.score_system.verifier.close()
+        self.tmpdir.cleanup()
+
+    def submit(self, score, replay):
+        self.score_system.score, self.score_system.replay = score, replay
+        self.score_system.update_high_score()
+        self.score_system.name_input.set_text("ada")
+        self.assertTrue(self.score_system.submit_score())
+        self.assertFalse(self.score_system.show_name_input)
+        self.assertIsNotNone(self.score_system.submit_note) # shown on game over instead of the input box
+
+    def settled(self):
+        """saved scores once the queue is through -- checked frame by frame like Game.step does"""
+        end = time.monotonic() + 60
+        while self.score_system.verifier.pending and time.monotonic() < end:
+            self.score_system.check_submissions()
+            time.sleep(0.01)
+        self.assertIsNone(self.score_system.note_for) # verdict took the "checking" note's place
+        return self.score_system.get_top_scores()
+
+    def test_saved_once_replay_verifies(self):
+        self.submit(self.score, self.replay)
+        self.assertEqual(self.score_system.get_top_scores(), []) # nothing ranked before the check
+        self.assertEqual(self.settled(), [{"name": "ada", "score": self.score, "replay": self.replay}])
+
+    def test_mismatch_never_saved(self):
+        self.submit(self.score + 1, self.replay)
+        self.assertEqual(self.settled(), [])
+
+    def test_no_replay_not_saved(self):
+        self.submit(5, None) # e.g. resized mid run
+        self.assertEqual(self.score_system.verifier.pending, [])
+        self.assertEqual(self.score_system.get_top_scores(), [])
+
+    def test_queue_finished_at_exit(self):
+        self.submit(self.score, self.replay)
+        self.score_system.finish_submissions()
+        self.assertEqual([entry["score"] for entry in self.score_system.get_top_scores()], [self.score])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import io
+import random
+import tempfile
+from collections import Counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings, PIPE, FLOOR, CEILING
+from runlog import RunLog, RunTable, counts, select, percentiles, report, read_explained, BLOCK_HEADER
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+def random_runs(count, seed=0):
+    rng = random.Random(seed)
+    runs = []
+    for _ in range(count):
+        width, height = rng.choice(((480, 720), (600, 683), (720, 1200)))
+        score = int(rng.expovariate(1 / 12))
+        runs.append((score, score * 104 + rng.randrange(300), rng.choice((PIPE, PIPE, FLOOR, CEILING)),
+                     rng.randrange(-width // 2, width // 2), rng.randrange(height), width, height, rng.choice((7, 99))))
+    return runs
+
+
+class TestRunLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "runs.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_game_logs_finished_runs(self):
+        settings = make_settings((480, 720, 683))
+        settings.run_log_file = self.path
+        game = Game(settings)
+        for _ in range(2):
+            game.in_start_menu = False
+            game.restart_game()
+            while game.game_active: game.update() # no jumps -- falls to the floor
+        game.run_log.close()
+
+        with RunTable(self.path) as table:
+            self.assertEqual(table.runs, 2)
+            row = [table.views[name][0][1] for name in ("score", "frames", "cause", "x", "y", "width", "height", "settings")]
+        self.assertEqual(row[:3], [0, game.run_frame, FLOOR])
+        self.assertEqual(row[4:7], [game.bird.rect.centery, 480, 720])
+        knobs = read_explained(self.path)[str(row[7])]
+        self.assertEqual(knobs["gravity"], settings.gravity)
+        self.assertEqual(knobs["pipe_heights"], [0.6, 0.5, 0.7])
+
+    def test_counts_match_rows_across_blocks_and_reopens(self):
+        runs = random_runs(5000)
+        log = RunLog(self.path, capacity=700)
+        log.extend(runs[:1234])
+        for run in runs[1234:1300]: log.append(run)
+        log.close()
+        RunLog(self.path, capacity=700).extend(runs[1300:]) # carries on in the last block
+
+        with RunTable(self.path) as table:
+            self.assertEqual(table.runs, 5000)
+            self.assertEqual(table.blocks, 8)
+            self.assertEqual(counts(table, None, "score"), Counter(run[0] for run in runs))
+            self.assertEqual(counts(table, None, "width", "height"), Counter((run[5], run[6]) for run in runs))
+            self.assertEqual(counts(table, None, "x", "y", "width", "height", bins={"x": 8, "y": 16}),
+                             Counter((run[3] // 8 * 8, run[4] // 16 * 16, run[5], run[6]) for run in runs))
+
+            masks = select(table, settings=99, screen=(480, 720), cause=PIPE)
+            chosen = [run for run in runs if run[7] == 99 and run[5:7] == (480, 720) and run[2] == PIPE]
+            self.assertEqual(sum(map(sum, masks)), len(chosen))
+            self.assertEqual(counts(table, masks, "frames"), Counter(run[1] for run in chosen))
+
+    def test_unfinished_append_left_out(self):
+        log = RunLog(self.path, capacity=100)
+        log.extend(random_runs(10))
+        log.close()
+        with open(self.path, 'r+b') as file: # crash after the values went in but before the count did
+            file.seek(8 + BLOCK_HEADER + 10 * 4)
+            file.write((12345).to_bytes(4, "little"))
+        with RunTable(self.path) as table:
+            self.assertEqual(table.runs, 10)
+            self.assertNotIn(12345, counts(table, None, "score"))
+        log = RunLog(self.path, capacity=100)
+        log.append(random_runs(1, seed=3)[0]) # written over
+        with RunTable(self.path) as table: self.assertEqual(table.runs, 11)
+
+    def test_percentiles(self):
+        self.assertEqual(percentiles(Counter({1: 50, 2: 40, 10: 9, 99: 1})), [2, 10, 99]) # like values[int(n * q)] sorted
+        self.assertEqual(percentiles(Counter({5: 1})), [5, 5, 5])
+
+    def test_report(self):
+        RunLog(self.path).extend(random_runs(3000))
+        out = io.StringIO()
+        report(self.path, cause=FLOOR, out=out)
+        text = out.getvalue()
+        self.assertIn("runs of 3,000", text)
+        self.assertIn("deaths  floor 100.0%", text)
+        self.assertIn("death heatmap", text)
+        self.assertEqual(len([line for line in text.splitlines() if line.startswith("  |")]), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
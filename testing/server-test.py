@@ -0,0 +1,160 @@
+import unittest
+import sys
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+import urllib.request
+import urllib.error
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from server import ScoreIndex, LeaderboardServer
+from sync import LeaderboardSync
+import loadgen
+
+
+class Running:
+    """LeaderboardServer on a loop in a background thread"""
+    def __init__(self, **options):
+        self.loop = asyncio.new_event_loop()
+        self.server = LeaderboardServer(port=0, **options)
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.call(self.server.start())
+        self.url = f"http://127.0.0.1:{self.server.port}"
+
+    def call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(30)
+
+    def stop(self):
+        self.call(self.server.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def post(self, payload):
+        request = urllib.request.Request(self.url + "/scores", json.dumps(payload).encode(), method="POST")
+        with urllib.request.urlopen(request) as response: return json.load(response)
+
+    def get(self, path):
+        with urllib.request.urlopen(self.url + path) as response: return json.load(response)
+
+
+class TestIndex(unittest.TestCase):
+    def test_ranks_and_top_match_sorting(self):
+        rng = random.Random(2)
+        index = ScoreIndex(keep=20)
+        entries = []
+        for i in range(3000):
+            score = rng.randrange(5000) if i % 100 == 0 else rng.randrange(60) # tree grows past its first 1024
+            entries.append((f"p{i}", score))
+            higher = sum(1 for _, other in entries if other > score)
+            self.assertEqual(index.add(f"p{i}", score), higher + 1)
+
+        ranked = sorted(entries, key=lambda entry: -entry[1]) # stable -- earlier of equal scores first
+        self.assertEqual(index.best(20), [{"name": name, "score": score} for name, score in ranked[:20]])
+        for score in (0, 30, 59, 4999, 10 ** 6):
+            self.assertEqual(index.rank(score), 1 + sum(1 for _, other in entries if other > score))
+
+    def test_version_moves_only_with_top(self):
+        index = ScoreIndex(keep=3)
+        for score in (50, 40, 30): index.add("a", score)
+        version = index.version
+        index.add("b", 30) # ties the last -- later arrival, stays out
+        index.add("b", 1)
+        self.assertEqual(index.version, version)
+        index.add("c", 45)
+        self.assertEqual(index.version, version + 1)
+        self.assertEqual([entry["score"] for entry in index.best(5)], [50, 45, 40])
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmpdir.name, "global.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_submissions_ranks_and_bad_input(self):
+        running = Running()
+        try:
+            self.assertEqual(running.post({"name": "solo", "score": 9}), {"accepted": 1, "ranks": [1]}) # add_score's shape
+            self.assertEqual(running.post({"scores": [{"name": "a", "score": 12}, {"name": "  ", "score": 3}]})["ranks"], [1, 3])
+            self.assertEqual(running.get("/top?n=2")["scores"], [{"name": "a", "score": 12}, {"name": "solo", "score": 9}])
+            self.assertEqual(running.get("/rank?score=10"), {"rank": 2, "total": 3})
+            self.assertEqual(running.get("/top?n=5")["scores"][-1]["name"], "Player")
+
+            for bad in ({"name": "x", "score": -1}, {"name": "x", "score": 1.5}, {"name": 3, "score": 1}, [1, 2],
+                        {"scores": 5}, {"scores": None}):
+                with self.assertRaises(urllib.error.HTTPError) as caught: running.post(bad)
+                self.assertEqual(caught.exception.code, 400)
+            with self.assertRaises(urllib.error.HTTPError) as caught: running.get("/nowhere")
+            self.assertEqual(caught.exception.code, 404)
+            self.assertEqual(running.get("/stats")["entries"], 3) # nothing half added
+        finally:
+            running.stop()
+
+    def test_sync_client_against_server(self):
+        running = Running()
+        client = LeaderboardSync(running.url, top=3, interval=0.05, retry=0.05).start()
+        try:
+            for score in (5, 50, 20, 1): client.submit({"name": f"s{score}", "score": score})
+            end = time.monotonic() + 5
+            board = None
+            while board != [50, 20, 5] and time.monotonic() < end:
+                scores = client.poll()
+                if scores is not None: board = [entry["score"] for entry in scores]
+                time.sleep(0.01)
+            self.assertEqual(board, [50, 20, 5])
+            time.sleep(0.2)
+            self.assertGreater(client.not_modified, 0) # unchanged board -- ETag hits
+            self.assertEqual(running.server.connections, 1)
+        finally:
+            client.close()
+            running.stop()
+
+    def lines(self):
+        with open(self.log, 'r') as file: return file.read().splitlines()
+
+    def test_log_appended_and_loaded(self):
+        running = Running(log=self.log, interval=0.05)
+        try:
+            running.post({"scores": [{"name": "a", "score": 4}, {"name": "b", "score": 8}]})
+            end = time.monotonic() + 5
+            while not os.path.exists(self.log) and time.monotonic() < end: time.sleep(0.01)
+            first = self.lines()
+            self.assertEqual(first, ['["a", 4]', '["b", 8]'])
+            running.post({"name": "c", "score": 6})
+        finally:
+            running.stop() # last one appended on stop
+        self.assertEqual(self.lines(), first + ['["c", 6]']) # appended -- earlier lines untouched
+
+        restarted = LeaderboardServer(log=self.log)
+        self.assertEqual(restarted.index.best(3), [{"name": "b", "score": 8}, {"name": "c", "score": 6}, {"name": "a", "score": 4}])
+
+        # a torn last append is left out & compacted away
+        with open(self.log, 'a') as file: file.write('["d", ')
+        self.assertEqual(len(LeaderboardServer(log=self.log).index), 3)
+        self.assertEqual(self.lines(), first + ['["c", 6]'])
+
+        # a cabinet's leaderboard.json seeds a new server -- replays & all, compacted into lines
+        with open(self.log, 'w') as file: json.dump({"scores": [{"name": "old", "score": 30, "replay": {}}]}, file)
+        self.assertEqual(LeaderboardServer(log=self.log).index.best(1), [{"name": "old", "score": 30}])
+        self.assertEqual(self.lines(), ['["old", 30]'])
+
+    def test_load_generator(self):
+        running = Running()
+        try:
+            args = argparse.Namespace(submissions=4000, connections=4, pipeline=8, batch=1, reads=50, top=10, seed=1)
+            asyncio.run(loadgen.run("127.0.0.1", running.server.port, args))
+            self.assertEqual(running.get("/stats")["entries"], 4000)
+        finally:
+            running.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
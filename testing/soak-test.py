@@ -0,0 +1,26 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from soak import SoakHarness, SCENES
+
+
+class TestSoakHarness(unittest.TestCase):
+    # short soak -- scripted sessions must reach every scene & stay flat
+    def test_short_soak(self):
+        harness = SoakHarness(4000, interval=499, warmup=500)
+        failures = harness.run()
+
+        for scene in SCENES: self.assertGreater(harness.scenes[scene].frames, 0, scene)
+        self.assertGreater(harness.script.sessions, 0)
+        self.assertEqual(failures, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
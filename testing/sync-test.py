@@ -0,0 +1,227 @@
+import unittest
+import sys
+import os
+import json
+import time
+import socket
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from sync import LeaderboardSync
+from game import Game
+
+init_headless()
+pg.font.init()
+
+
+class StandIn:
+    """local leaderboard server speaking sync.py's protocol -- counts connections, POSTs & 304s"""
+    def __init__(self, port=0):
+        self.scores = []
+        self.posts = []  # entries per POST
+        self.connections = 0
+        self.sockets = []
+        self.not_modified = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive
+
+            def setup(self):
+                stand_in.connections += 1
+                stand_in.sockets.append(self.request)
+                super().setup()
+
+            def do_POST(self):
+                entries = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["scores"]
+                stand_in.posts.append(len(entries))
+                stand_in.scores.extend(entries)
+                self.reply(200, {"accepted": len(entries)})
+
+            def do_GET(self):
+                etag = f'"{len(stand_in.scores)}"'
+                if self.headers.get("If-None-Match") == etag:
+                    stand_in.not_modified += 1
+                    self.reply(304)
+                    return
+                top = sorted(stand_in.scores, key=lambda x: x["score"], reverse=True)[:int(self.path.split("n=")[1])]
+                self.reply(200, {"scores": top}, etag)
+
+            def reply(self, status, payload=None, etag=None):
+                body = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                if etag: self.send_header("ETag", etag)
+                if status != 304: self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.handle_error = lambda request, address: None # client hanging up mid read is expected
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def drop_connections(self):
+        """like a server closing idle keep-alive connections"""
+        for sock in self.sockets:
+            try: sock.shutdown(socket.SHUT_RDWR)
+            except OSError: pass # client hung up first
+        self.sockets = []
+
+    def stop(self):
+        self.drop_connections()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end: return False
+        time.sleep(0.01)
+    return True
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool = os.path.join(self.tmpdir.name, "outbox.json")
+        self.clients, self.servers = [], []
+
+    def tearDown(self):
+        for client in self.clients: client.close()
+        for server in self.servers: server.stop()
+        self.tmpdir.cleanup()
+
+    def server(self, port=0):
+        server = StandIn(port)
+        self.servers.append(server)
+        return server
+
+    def client(self, port, **options):
+        client = LeaderboardSync(f"http://127.0.0.1:{port}", self.spool, retry=0.05, **options).start()
+        self.clients.append(client)
+        return client
+
+    def test_burst_goes_out_batched_on_one_connection(self):
+        server = self.server()
+        client = self.client(server.port, batch=16)
+        self.assertTrue(wait_for(lambda: client.fetches == 1))
+
+        start = time.perf_counter()
+        for i in range(40): client.submit({"name": f"p{i}", "score": i, "replay": {"jumps": []}})
+        self.assertLess(time.perf_counter() - start, 0.05) # never waits on the network
+
+        self.assertTrue(wait_for(lambda: len(server.scores) == 40))
+        self.assertEqual(server.scores[0], {"name": "p0", "score": 0}) # leaderboard entry shape, no replay
+        self.assertLessEqual(len(server.posts), 4)
+        self.assertEqual(max(server.posts), 16)
+        self.assertEqual(server.connections, 1) # kept alive
+
+    def test_top_scores_fetched_with_etag(self):
+        server = self.server()
+        server.scores = [{"name": "a", "score": 5}, {"name": "b", "score": 9}]
+        client = self.client(server.port, top=1, interval=0.05)
+        self.assertTrue(wait_for(lambda: client.poll() == [{"name": "b", "score": 9}]))
+        self.assertTrue(wait_for(lambda: server.not_modified >= 3)) # unchanged board -- 304s, nothing for poll
+        self.assertIsNone(client.poll())
+
+        client.submit({"name": "c", "score": 12})
+        self.assertTrue(wait_for(lambda: client.updates))
+        self.assertEqual(client.poll(), [{"name": "c", "score": 12}])
+        self.assertEqual(server.connections, 1)
+
+    def test_offline_scores_wait_and_survive_restart(self):
+        port = free_port()
+        client = self.client(port)
+        client.submit({"name": "offline", "score": 3})
+        self.assertTrue(wait_for(lambda: client.failures >= 2))
+        self.assertFalse(client.online)
+        client.close()
+        with open(self.spool, 'r') as file: self.assertEqual(json.load(file), [{"name": "offline", "score": 3}])
+
+        # next start -- spooled score goes out once the server is up
+        client = self.client(port)
+        client.submit({"name": "later", "score": 4})
+        self.assertTrue(wait_for(lambda: client.failures >= 1))
+        server = self.server(port)
+        self.assertTrue(wait_for(lambda: len(server.scores) == 2))
+        self.assertEqual([entry["name"] for entry in server.scores], ["offline", "later"])
+        self.assertTrue(wait_for(lambda: not os.path.exists(self.spool)))
+
+    def test_close_never_races_the_loop_on_the_spool(self):
+        client = self.client(free_port())
+        client.submit({"name": "offline", "score": 3})
+        self.assertTrue(wait_for(lambda: client.failures >= 1))
+        writers, write_spool = [], client.write_spool
+        def slow_write():
+            writers.append(threading.current_thread().name)
+            time.sleep(0.3)
+            write_spool()
+        client.write_spool = slow_write
+
+        thread = client.thread
+        client.close(timeout=0.05) # loop thread still writing on its way out
+        self.assertTrue(thread.is_alive())
+        thread.join()
+        self.assertEqual(set(writers), {"leaderboard-sync"}) # game thread left the spool alone
+        with open(self.spool, 'r') as file: self.assertEqual(json.load(file), [{"name": "offline", "score": 3}])
+
+    def test_dropped_keep_alive_is_redialed(self):
+        server = self.server()
+        client = self.client(server.port)
+        self.assertTrue(wait_for(lambda: client.fetches == 1))
+        server.drop_connections()
+        client.submit({"name": "x", "score": 1})
+        self.assertTrue(wait_for(lambda: server.scores == [{"name": "x", "score": 1}]))
+        self.assertEqual(server.connections, 2)
+        self.assertEqual(client.failures, 0) # redialed within the same exchange
+
+
+class TestGame(unittest.TestCase):
+    def test_game_shows_global_board_and_submits(self):
+        server = StandIn()
+        server.scores = [{"name": "far away", "score": 77}]
+        settings = make_settings((480, 720, 683))
+        settings.leaderboard_url = f"http://127.0.0.1:{server.port}"
+        game = Game(settings)
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                game.score_system.leaderboard_file = os.path.join(tmpdir, "leaderboard.json")
+                game.toggle_leaderboard()
+                self.assertTrue(wait_for(lambda: game.poll_leaderboard() or game.global_scores))
+                self.assertEqual(game.leaderboard_panel.entries, server.scores) # open panel updated in place
+
+                replay = {"seed": 1, "frames": 10, "screen": [480, 720, 683], "jumps": [], "spawns": []}
+                game.score_system.settle({"name": "cheat", "score": 99, "replay": replay}, False, "replay scores 0")
+                game.score_system.add_score("local", 50) # saved here only -- never checked, never sent
+                game.score_system.settle({"name": "here", "score": 12, "replay": replay}, True, "ok")
+                self.assertTrue(wait_for(lambda: len(server.scores) == 2))
+                self.assertTrue(wait_for(lambda: game.poll_leaderboard() or len(game.global_scores) == 2))
+                self.assertEqual([entry["name"] for entry in game.get_leaderboard_scores()], ["far away", "here"])
+        finally:
+            game.leaderboard_sync.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import random
+import json
+import tempfile
+from array import array
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import init_headless, make_settings
+from game import Game
+import trainer
+
+init_headless()
+pg.font.init()
+
+
+def small_trainer(workers=1):
+    return trainer.Trainer(population=10, courses=1, max_frames=300, seed=4, workers=workers, batch=3)
+
+
+class TestPlayer(unittest.TestCase):
+    def test_network_size_checked(self):
+        with self.assertRaises(ValueError): trainer.NeuralPlayer([0.0] * (trainer.WEIGHTS - 1))
+
+    def test_bundled_player_flies_unseen_courses(self):
+        player = trainer.NeuralPlayer.load()
+        rng = random.Random(12345)
+        for screen in trainer.SCREENS:
+            frames, score = trainer.run_course(player.weights, screen, rng.getrandbits(32), 5000)
+            self.assertEqual(frames, 5000, screen)
+            self.assertGreater(score, 40)
+
+    def test_player_as_game_controller(self):
+        settings = make_settings((480, 720, 683))
+        game = Game(settings)
+        game.controller = trainer.NeuralPlayer.load()
+        game.in_start_menu = False
+        game.restart_game()
+        for frame in range(2000): # game's own input & update path, pipes on a frame count
+            if frame % 104 == 0: game.pipe_manager.spawn_pipe()
+            if game.wants_jump(): game.bird.jump()
+            game.update()
+        self.assertTrue(game.game_active)
+        self.assertGreater(game.score_system.score, 15)
+
+
+class TestTrainer(unittest.TestCase):
+    def test_resumed_training_matches_uninterrupted(self):
+        straight = small_trainer()
+        for _ in range(3): straight.step()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trainer.json")
+            first = small_trainer()
+            for _ in range(2): first.step()
+            first.save(path)
+
+            resumed = small_trainer()
+            resumed.load(path)
+            resumed.step()
+        self.assertEqual(resumed.generation, 3)
+        self.assertEqual(resumed.population, straight.population)
+        self.assertEqual(resumed.best, straight.best)
+
+    def test_trained_player_promoted_only_when_asked(self):
+        best = small_trainer()
+        best.step()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trained, bundled = os.path.join(tmpdir, "player.json"), os.path.join(tmpdir, "assets", "player.json")
+            with open(trained, 'w') as file: json.dump({"weights": [0.0]}, file)
+            with self.assertRaises(ValueError): trainer.promote(trained, bundled) # not a network -- nothing copied
+            self.assertFalse(os.path.exists(bundled))
+
+            trainer.save_player(best.best, trained)
+            trainer.promote(trained, bundled)
+            self.assertEqual(trainer.NeuralPlayer.load(bundled).weights, trainer.NeuralPlayer.load(trained).weights)
+
+    def test_pool_scores_like_one_process(self):
+        local, pooled = small_trainer(), small_trainer(workers=2)
+        try:
+            self.assertEqual(pooled.step(), local.step())
+        finally:
+            pooled.close()
+
+    def test_fitness_rewards_pipes(self):
+        player = trainer.NeuralPlayer.load()
+        genome = player.weights.tobytes()
+        falling = array('d', [0.0] * trainer.WEIGHTS).tobytes() # never jumps
+        courses = [(trainer.SCREENS[0], 1)]
+        (good, passed, frames), (bad, none, short) = trainer.evaluate_batch(([genome, falling], courses, 1000))
+        self.assertEqual(frames, 1000)
+        self.assertEqual(good, frames + trainer.SCORE_BONUS * passed)
+        self.assertEqual(none, 0)
+        self.assertLess(bad, good)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from simulation import Simulation, init_headless, make_settings, bot_replay
+from trajectory import AnalyticSimulation, Trajectory
+
+init_headless()
+
+SCREENS = ((600, 683, 683), (480, 546, 683), (720, 819, 683))
+
+
+class TestTrajectory(unittest.TestCase):
+    def test_offsets_match_bird(self):
+        settings = make_settings(SCREENS[0])
+        simulation = Simulation(settings)
+        bird = simulation.bird
+        bird.jump()
+        trajectory = Trajectory(bird.velocity, settings.gravity)
+        y0 = bird.rect.centery
+        for k in range(1, 120):
+            bird.update()
+            trajectory.extend(k)
+            self.assertEqual(bird.rect.centery - y0, trajectory.offsets[k])
+
+        # apex is the top of the jump
+        top = min(range(120), key=lambda k: (trajectory.offsets[k], -k))
+        self.assertEqual(trajectory.apex, top)
+
+
+class TestAnalyticSimulation(unittest.TestCase):
+    # same score, frame & alive as stepping every frame
+    def assertSameResult(self, simulation, analytic, seed, jumps, spawns, frames):
+        simulation.reset(seed)
+        simulation.play(jumps, spawns, frames)
+        analytic.reset(seed)
+        analytic.play(jumps, spawns, frames)
+        self.assertEqual(
+            (analytic.score, analytic.frame, analytic.alive),
+            (simulation.score, simulation.frame, simulation.alive)
+        )
+
+    def test_bot_runs(self):
+        rng = random.Random(1)
+        for screen in SCREENS:
+            settings = make_settings(screen)
+            simulation, analytic = Simulation(settings), AnalyticSimulation(settings)
+            self.assertTrue(analytic.exact)
+            for seed in range(6):
+                replay = bot_replay(simulation, seed, 6000, spam=(0, 0.05, 0.3)[seed % 3], rng=rng, spawn_at=3)
+                jumps, spawns = replay["jumps"], replay["spawns"]
+                for frames in (simulation.frame, simulation.frame // 2 + 1, simulation.frame + 40):
+                    self.assertSameResult(simulation, analytic, seed, jumps, spawns, frames)
+
+    def test_random_input_logs(self):
+        rng = random.Random(2)
+        settings = make_settings(SCREENS[0])
+        simulation, analytic = Simulation(settings), AnalyticSimulation(settings)
+        for seed in range(200):
+            frames = rng.randint(1, 3000)
+            period = rng.choice((20, 30, 104))
+            spawns = sorted(rng.sample(range(frames), min(frames, frames // period + 1)))
+            if seed % 10 == 0: spawns = sorted(spawns + spawns[:2]) # several spawns on one frame -- stepped
+            jumps = sorted(rng.sample(range(frames), rng.randint(0, frames // 8)))
+            self.assertSameResult(simulation, analytic, seed, jumps, spawns, frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
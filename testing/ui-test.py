@@ -0,0 +1,145 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+# add code dir to path
+sys.path.insert(0, os.path.abspath('code'))
+
+from settings import Settings
+from interface import Button, Widget, NameInput
+from leaderboard import LeaderboardPanel
+from simulation import make_settings
+from game import Game
+
+pg.init()
+
+
+def mouse(event_type, pos):
+    if event_type == pg.MOUSEMOTION: return pg.event.Event(event_type, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+    return pg.event.Event(event_type, pos=pos, button=1)
+
+
+class TestButton(unittest.TestCase):
+    # test event driven buttons
+    def setUp(self):
+        self.button = Button(10, 10, 'Play', 100, 50)
+
+    def test_click_needs_press_and_release_inside(self):
+        self.assertIsNone(self.button.handle_event(mouse(pg.MOUSEBUTTONDOWN, (20, 20))))
+        self.assertIs(self.button.handle_event(mouse(pg.MOUSEBUTTONUP, (25, 25))), self.button)
+
+        # released outside -> no click
+        self.button.handle_event(mouse(pg.MOUSEBUTTONDOWN, (20, 20)))
+        self.assertIsNone(self.button.handle_event(mouse(pg.MOUSEBUTTONUP, (500, 500))))
+
+    def test_visual_states(self):
+        self.assertEqual(self.button.state(), "normal")
+        self.button.handle_event(mouse(pg.MOUSEMOTION, (20, 20)))
+        self.assertEqual(self.button.state(), "hover")
+        self.button.handle_event(mouse(pg.MOUSEBUTTONDOWN, (20, 20)))
+        self.assertEqual(self.button.state(), "pressed")
+
+    def test_hidden_button_tracks_hover_but_ignores_clicks(self):
+        self.button.visible = False
+        self.button.handle_event(mouse(pg.MOUSEMOTION, (20, 20)))
+        self.assertTrue(self.button.hovered)
+        self.button.handle_event(mouse(pg.MOUSEBUTTONDOWN, (20, 20)))
+        self.assertIsNone(self.button.handle_event(mouse(pg.MOUSEBUTTONUP, (20, 20))))
+
+    def test_tree_dispatch_topmost_first(self):
+        under = Button(10, 10, 'Under', 100, 50)
+        root = Widget()
+        root.add(under, self.button)
+        root.handle_event(mouse(pg.MOUSEBUTTONDOWN, (20, 20)))
+        self.assertIs(root.handle_event(mouse(pg.MOUSEBUTTONUP, (20, 20))), self.button)
+
+
+class TestNameInput(unittest.TestCase):
+    # drawing & hit testing share one layout
+    def setUp(self):
+        self.settings = Settings()
+        self.name_input = NameInput(self.settings)
+
+    def test_click_box_activates(self):
+        self.name_input.handle_event(mouse(pg.MOUSEBUTTONDOWN, self.name_input.rect.center))
+        self.assertTrue(self.name_input.active)
+        self.name_input.handle_event(mouse(pg.MOUSEBUTTONDOWN, (0, 0)))
+        self.assertFalse(self.name_input.active)
+
+    def test_typing_and_submit(self):
+        self.name_input.active = True
+        for char in "abc":
+            self.name_input.handle_event(pg.event.Event(pg.KEYDOWN, key=ord(char), unicode=char))
+        self.assertEqual(self.name_input.text, "abc")
+
+        submit = self.name_input.submit_button.rect.center
+        self.name_input.handle_event(mouse(pg.MOUSEBUTTONDOWN, submit))
+        self.assertIs(self.name_input.handle_event(mouse(pg.MOUSEBUTTONUP, submit)), self.name_input)
+
+    def test_cursor_blinks_by_frame(self):
+        self.name_input.active = True
+        screen = pg.Surface((self.settings.width, self.settings.height))
+        cursor = (self.name_input.rect.x + 10 + self.name_input.text_surface.get_width(), self.name_input.rect.centery)
+        shown = []
+        for _ in range(self.settings.FPS):
+            screen.fill((0, 0, 0))
+            self.name_input.draw(screen)
+            shown.append(screen.get_at(cursor)[:3] == (255, 255, 255))
+        half = self.settings.FPS // 2
+        self.assertEqual(shown, [True] * half + [False] * half)
+
+
+class TestLeaderboardPanel(unittest.TestCase):
+    # cached rows & scrolling
+    def setUp(self):
+        self.settings = Settings()
+        self.panel = LeaderboardPanel(self.settings)
+        self.scores = [{"name": f"P{i}", "score": 500 - i} for i in range(500)]
+        self.panel.set_scores(self.scores)
+
+    def test_only_changed_rows_rerendered(self):
+        rows = list(self.panel.rows)
+        scores = [dict(entry) for entry in self.scores]
+        scores[-1] = {"name": "new", "score": 1}
+        self.panel.set_scores(scores)
+        self.assertTrue(all(a is b for a, b in zip(rows[:-1], self.panel.rows[:-1])))
+        self.assertIsNot(rows[-1], self.panel.rows[-1])
+
+    def test_scroll_clamped(self):
+        self.panel.scroll_by(-100)
+        self.assertEqual(self.panel.scroll, 0)
+        self.panel.scroll_by(10 ** 6)
+        self.assertEqual(self.panel.scroll, 500 * self.panel.row_step - self.panel.viewport.height)
+
+        screen = pg.Surface((self.settings.width, self.settings.height))
+        self.panel.draw(screen) # only visible rows blitted, clip restored
+        self.assertEqual(screen.get_clip(), screen.get_rect())
+
+
+class TestGameLeaderboard(unittest.TestCase):
+    def test_whole_board_reaches_panel(self):
+        settings = make_settings((480, 720, 683))
+        settings.leaderboard_size = 30
+        game = Game(settings)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            game.score_system.leaderboard_file = os.path.join(tmpdir, "leaderboard.json")
+            with open(game.score_system.leaderboard_file, 'w') as file:
+                json.dump({"scores": [{"name": f"p{i}", "score": 100 - i} for i in range(40)]}, file)
+            game.toggle_leaderboard()
+            self.assertEqual(len(game.leaderboard_panel.rows), 30) # more than fit -- panel scrolls
+            self.assertGreater(30 * game.leaderboard_panel.row_step, game.leaderboard_panel.viewport.height)
+
+            game.score_system.add_score("new", 1000)
+            with open(game.score_system.leaderboard_file, 'r') as file: scores = json.load(file)["scores"]
+            self.assertEqual((len(scores), scores[0]["name"]), (30, "new")) # file trimmed to leaderboard_size
+
+
+if __name__ == "__main__":
+    unittest.main()